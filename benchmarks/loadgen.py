@@ -0,0 +1,230 @@
+import sys
+import os
+import asyncio
+import argparse
+import json
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+DEFAULT_TRACE = os.path.join(project_root, "benchmarks", "traces", "sample.jsonl")
+
+# A trace is JSON lines, one request each, in arrival order:
+#   {"t": 0.25, "method": "call_tool", "name": "battle_simulate", "arguments": {...}}
+#   {"t": 0.30, "method": "read_resource", "uri": "pokemon://type-chart"}
+# "t" (seconds since the first request) is optional; the MCP wire form
+# {"method": "tools/call", "params": {"name": ..., "arguments": ...}} / "resources/read" is accepted too.
+
+
+def load_trace(path: str) -> List[Dict[str, Any]]:
+    requests = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            entry = json.loads(line)
+            params = entry.get("params", entry)
+            method = entry.get("method")
+            if method in ("call_tool", "tools/call"):
+                request = {"method": "call_tool", "name": params["name"], "arguments": params.get("arguments", {})}
+            elif method in ("read_resource", "resources/read"):
+                request = {"method": "read_resource", "uri": params["uri"]}
+            else:
+                raise ValueError(f"{path}:{line_no}: unsupported method {method!r}")
+            request["t"] = float(entry.get("t", 0.0))
+            requests.append(request)
+    if not requests:
+        raise ValueError(f"{path}: no requests")
+    return requests
+
+
+def request_label(request: Dict[str, Any]) -> str:
+    """Reporting key: tool name, or the resource URI without its last path segment / query"""
+    if request["method"] == "call_tool":
+        return request["name"]
+    uri = request["uri"].split("?", 1)[0]
+    scheme, _, path = uri.partition("://")
+    head = path.split("/", 1)[0]
+    return f"resource:{scheme}://{head}"
+
+
+def percentile(samples: List[float], q: float) -> float:
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def summarize(samples_ms: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    samples = sorted(samples_ms)
+    total = len(samples)
+    return {
+        "requests": total,
+        "errors": errors,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "throughput_rps": round(total / elapsed, 1) if elapsed > 0 else None,
+        "p50_ms": round(percentile(samples, 0.50), 3) if total else None,
+        "p95_ms": round(percentile(samples, 0.95), 3) if total else None,
+        "p99_ms": round(percentile(samples, 0.99), 3) if total else None,
+        "max_ms": round(samples[-1], 3) if total else None
+    }
+
+
+def is_error(request: Dict[str, Any], result) -> bool:
+    """Tools report failures as {"error": ...} payloads, not protocol errors"""
+    if request["method"] == "call_tool":
+        if result.isError:
+            return True
+        payload = result.structuredContent
+        if payload is None and result.content:
+            try:
+                payload = json.loads(result.content[0].text)
+            except (ValueError, AttributeError):
+                return False
+        return isinstance(payload, dict) and "error" in payload
+    try:
+        payload = json.loads(result.contents[0].text)
+    except (ValueError, AttributeError, IndexError):
+        return False
+    return isinstance(payload, dict) and "error" in payload
+
+
+@asynccontextmanager
+async def in_process_session():
+    """Client session wired to src.server.app through in-memory streams"""
+    from mcp.shared.memory import create_connected_server_and_client_session
+    from src.server import app
+    from src.utils.data_service import data_service
+
+    await data_service.startup()
+    try:
+        async with create_connected_server_and_client_session(app) as session:
+            yield session
+    finally:
+        await data_service.shutdown()
+
+
+@asynccontextmanager
+async def stdio_session(command: Optional[List[str]] = None):
+    """Client session to a server subprocess over the stdio transport"""
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    command = command or [sys.executable, "-m", "src.server"]
+    params = StdioServerParameters(command=command[0], args=command[1:], cwd=project_root,
+                                   env=dict(os.environ, PYTHONPATH=project_root))
+    async with stdio_client(params) as (read_stream, write_stream):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            yield session
+
+
+async def replay(session, trace: List[Dict[str, Any]], concurrency: int = 8, rate: Optional[float] = None,
+                 speed: Optional[float] = None, repeat: int = 1, seed: Optional[int] = None) -> Dict[str, Any]:
+    """Replay `trace` against `session` and report latency and errors per tool
+
+    Arrivals are open-loop: with `rate`, Poisson arrivals at that many requests
+    per second; with `speed`, the trace's own "t" offsets divided by speed;
+    with neither, every request is due at once and only `concurrency` limits the
+    pace (closed-loop). Latency is measured from the scheduled arrival, so time
+    spent waiting for a free slot counts against the server, not the generator.
+    """
+    rng = random.Random(seed)
+    requests = [request for _ in range(repeat) for request in trace]
+    # A repeat starts one average inter-arrival gap after the previous pass ends
+    pass_span = trace[-1]["t"] * len(trace) / (len(trace) - 1) if len(trace) > 1 else 0.0
+    offsets = []
+    clock = 0.0
+    for i, request in enumerate(requests):
+        if rate:
+            clock += rng.expovariate(rate) if i else 0.0
+        elif speed:
+            clock = (request["t"] + (i // len(trace)) * pass_span) / speed
+        offsets.append(clock)
+
+    slots = asyncio.Semaphore(concurrency)
+    samples: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    failures: Dict[str, str] = {}
+    start = time.perf_counter()
+
+    async def send(request: Dict[str, Any], due: float):
+        delay = start + due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        label = request_label(request)
+        async with slots:
+            try:
+                if request["method"] == "call_tool":
+                    result = await session.call_tool(request["name"], request["arguments"])
+                else:
+                    result = await session.read_resource(request["uri"])
+                failed = is_error(request, result)
+            except Exception as e:
+                failed = True
+                failures.setdefault(label, str(e))
+        samples.setdefault(label, []).append((time.perf_counter() - start - due) * 1000)
+        if failed:
+            errors[label] = errors.get(label, 0) + 1
+
+    await asyncio.gather(*(send(request, due) for request, due in zip(requests, offsets)))
+    elapsed = time.perf_counter() - start
+
+    all_samples = [ms for values in samples.values() for ms in values]
+    report = {
+        "requests": len(requests),
+        "elapsed_seconds": round(elapsed, 3),
+        "concurrency": concurrency,
+        "arrival": f"poisson {rate}/s" if rate else (f"trace x{speed}" if speed else "closed-loop"),
+        "overall": summarize(all_samples, sum(errors.values()), elapsed),
+        "per_tool": {label: summarize(values, errors.get(label, 0), elapsed)
+                     for label, values in sorted(samples.items())}
+    }
+    if failures:
+        report["first_failure"] = failures
+    return report
+
+
+async def run(args) -> Dict[str, Any]:
+    trace = load_trace(args.trace)
+    session_factory = stdio_session(args.command) if args.transport == "stdio" else in_process_session()
+    async with session_factory as session:
+        for request in trace[:args.warmup]:
+            # Load species and build the type chart before anything is timed
+            if request["method"] == "call_tool":
+                await session.call_tool(request["name"], request["arguments"])
+            else:
+                await session.read_resource(request["uri"])
+        report = await replay(session, trace, concurrency=args.concurrency, rate=args.rate,
+                              speed=args.speed, repeat=args.repeat, seed=args.seed)
+    return {"trace": os.path.relpath(args.trace, project_root), "transport": args.transport, **report}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a JSON-lines trace of MCP requests against the server")
+    parser.add_argument("trace", nargs="?", default=DEFAULT_TRACE, help="Trace file (default: benchmarks/traces/sample.jsonl)")
+    parser.add_argument("--transport", choices=("in-process", "stdio"), default="in-process",
+                        help="Call the app through in-memory streams, or spawn `python -m src.server` over stdio")
+    parser.add_argument("--command", nargs="+", help="Server command for the stdio transport")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight at once")
+    arrival = parser.add_mutually_exclusive_group()
+    arrival.add_argument("--rate", type=float, help="Poisson arrivals at this many requests per second")
+    arrival.add_argument("--speed", type=float, help="Follow the trace's timestamps, sped up by this factor")
+    parser.add_argument("--repeat", type=int, default=1, help="Times the trace is replayed back to back")
+    parser.add_argument("--warmup", type=int, default=0, help="Untimed requests from the head of the trace sent first")
+    parser.add_argument("--seed", type=int, help="Seed for Poisson arrivals")
+    parser.add_argument("--output", help="JSON-lines file the report is appended to")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"time": time.strftime("%Y-%m-%dT%H:%M:%S%z"), **report}) + "\n")
+
+
+if __name__ == "__main__":
+    main()
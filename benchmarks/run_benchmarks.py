@@ -0,0 +1,213 @@
+import sys
+import os
+import asyncio
+import argparse
+import json
+import platform
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+os.chdir(project_root)
+
+from src.utils.cache_mirror import CacheMirrorServer
+from src.utils.data_loader import PokemonDataLoader
+from src.utils.memory_cache import LRUCache
+from src.utils.battle_mechanics import BattleSimulator
+from src.utils.monte_carlo import MonteCarloBattleSimulator
+from src.utils.snapshot import SNAPSHOT_ENV, build_snapshot
+
+DEFAULT_OUTPUT = "benchmarks/results.jsonl"
+PAIRINGS = [("pikachu", "charizard"), ("lugia", "raichu"), ("ditto", "onix"), ("gengar", "mewtwo")]
+
+# Runs in a fresh interpreter: import src.server, start the data service, answer one call
+STARTUP_PROBE = """
+import asyncio, json, time
+start = time.perf_counter()
+import src.server as server
+imported = time.perf_counter()
+
+async def first_response():
+    await server.data_service.startup()
+    ready = time.perf_counter()
+    await server.call_tool("battle_simulate", {"pokemon1": "pikachu", "pokemon2": "charizard", "log_level": "none"})
+    return ready
+
+ready = asyncio.run(first_response())
+done = time.perf_counter()
+print(json.dumps({"import_ms": (imported - start) * 1000, "startup_ms": (ready - imported) * 1000,
+                  "first_response_ms": (done - start) * 1000}))
+"""
+
+
+def latency_summary(samples_ms):
+    samples = sorted(samples_ms)
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))]
+    return {
+        "n": len(samples),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "p50_ms": round(pick(0.50), 3),
+        "p99_ms": round(pick(0.99), 3),
+        "max_ms": round(samples[-1], 3)
+    }
+
+
+async def timed(coro_factory, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await coro_factory()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+async def bench_loader(mirror: CacheMirrorServer, species):
+    """Cold (HTTP from the local mirror), warm-disk and warm-memory fetch_pokemon_data latency"""
+    cache_dir = tempfile.mkdtemp(prefix="pokemon-bench-")
+    try:
+        def make_loader():
+            loader = PokemonDataLoader(store_path=os.path.join(cache_dir, "none.bin"),
+                                       memory_cache=LRUCache(), cache_dir=cache_dir)
+            loader.base_url = mirror.base_url
+            return loader
+
+        results = {}
+        loader = make_loader()
+        for phase in ("cold", "warm_disk"):
+            if phase == "warm_disk":
+                await loader.close()
+                loader = make_loader()
+            samples = []
+            for name in species:
+                start = time.perf_counter()
+                await loader.fetch_pokemon_data(name)
+                samples.append((time.perf_counter() - start) * 1000)
+            results[phase] = latency_summary(samples)
+
+        samples = []
+        for _ in range(20):
+            for name in species:
+                start = time.perf_counter()
+                await loader.fetch_pokemon_data(name)
+                samples.append((time.perf_counter() - start) * 1000)
+        results["warm_memory"] = latency_summary(samples)
+
+        start = time.perf_counter()
+        await make_loader().load_type_effectiveness()
+        results["type_chart_warm_disk_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        await loader.close()
+        return results
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+async def bench_battles(loader: PokemonDataLoader, battles: int):
+    """Scalar BattleSimulator throughput per log level, plus the batch engine"""
+    pairs = [(await loader.fetch_pokemon_data(a), await loader.fetch_pokemon_data(b)) for a, b in PAIRINGS]
+    results = {}
+    for log_level in ("full", "none"):
+        sim = BattleSimulator()
+        start = time.perf_counter()
+        for i in range(battles):
+            p1, p2 = pairs[i % len(pairs)]
+            await sim.simulate_battle(p1, p2, log_level=log_level, seed=i)
+        results[f"battles_per_sec_{log_level}"] = round(battles / (time.perf_counter() - start), 1)
+
+    monte_carlo = MonteCarloBattleSimulator()
+    start = time.perf_counter()
+    monte_carlo.simulate(pairs[0][0], pairs[0][1], 100_000, seed=0)
+    results["monte_carlo_100k_seconds"] = round(time.perf_counter() - start, 4)
+    return results
+
+
+async def bench_call_tool(mirror: CacheMirrorServer, repeat: int):
+    """End-to-end latency of the MCP call_tool / read_resource handlers, in process"""
+    from src import server
+    from src.utils.data_service import data_service
+    data_service.loader.base_url = mirror.base_url
+
+    calls = {
+        "pokemon_details": lambda: server.call_tool("pokemon_details", {"pokemon_name": "pikachu"}),
+        "battle_simulate": lambda: server.call_tool("battle_simulate", {"pokemon1": "pikachu", "pokemon2": "charizard"}),
+        "battle_simulate_log_none": lambda: server.call_tool(
+            "battle_simulate", {"pokemon1": "pikachu", "pokemon2": "charizard", "log_level": "none"}),
+        "read_resource_pokemon": lambda: server.read_resource("pokemon://pokemon/charizard"),
+        "read_resource_type_chart": lambda: server.read_resource("pokemon://type-chart"),
+    }
+    results = {}
+    for name, call in calls.items():
+        await call()  # warm-up
+        results[name] = latency_summary(await timed(call, repeat))
+    return results
+
+
+async def bench_startup(runs: int):
+    """Import time and time to first battle_simulate response of a new server process, with and without a snapshot"""
+    workdir = tempfile.mkdtemp(prefix="pokemon-bench-")
+    try:
+        snapshot_path = os.path.join(workdir, "snapshot.pkl")
+        loader = PokemonDataLoader(memory_cache=LRUCache())
+        await build_snapshot(loader, snapshot_path)
+        await loader.close()
+
+        results = {}
+        for label, path in (("no_snapshot", os.path.join(workdir, "missing.pkl")), ("snapshot", snapshot_path)):
+            env = dict(os.environ, **{SNAPSHOT_ENV: path})
+            env.pop("POKEMON_PREWARM", None)
+            samples = []
+            for _ in range(runs):
+                out = subprocess.run([sys.executable, "-c", STARTUP_PROBE], cwd=project_root, env=env,
+                                     capture_output=True, text=True, check=True).stdout
+                samples.append(json.loads(out.strip().splitlines()[-1]))
+            results[label] = {key: round(statistics.median(s[key] for s in samples), 1) for key in samples[0]}
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+async def run(args):
+    species = args.species or sorted({name for pair in PAIRINGS for name in pair})
+    with CacheMirrorServer(["data/cache/"]) as mirror:
+        results = {"loader": await bench_loader(mirror, species)}
+        loader = PokemonDataLoader(memory_cache=LRUCache())
+        loader.base_url = mirror.base_url
+        results["battle"] = await bench_battles(loader, args.battles)
+        await loader.close()
+        results["call_tool"] = await bench_call_tool(mirror, args.repeat)
+    results["startup"] = await bench_startup(args.startup_runs)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the loader, battle engine and MCP tools")
+    parser.add_argument("species", nargs="*", help="Species for the loader benchmark (default: benchmark pairings)")
+    parser.add_argument("--battles", type=int, default=2000, help="Scalar battles per log level")
+    parser.add_argument("--repeat", type=int, default=200, help="Calls per tool for latency percentiles")
+    parser.add_argument("--startup-runs", type=int, default=5, help="Fresh server processes per startup variant")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="JSON-lines file the run is appended to")
+    args = parser.parse_args()
+
+    record = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": asyncio.run(run(args))
+    }
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+    print(json.dumps(record, indent=2))
@@ -0,0 +1,40 @@
+import sys
+import os
+import asyncio
+import argparse
+import json
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, project_root)
+
+from src.utils.data_loader import PokemonDataLoader
+from src.utils.tournament import TournamentRunner, DEFAULT_TOURNAMENT_PATH
+
+
+async def run(args):
+    loader = PokemonDataLoader()
+    try:
+        runner = TournamentRunner(loader, path=args.output, n_battles=args.battles, workers=args.workers)
+        return await runner.run(species=args.species, force=args.force)
+    finally:
+        await loader.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Round-robin win-rate matrix for every cached species")
+    parser.add_argument("species", nargs="*", help="Species to include (default: every cached species)")
+    parser.add_argument("--battles", type=int, default=2000, help="Battles per pairing")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--output", default=DEFAULT_TOURNAMENT_PATH, help="Where to persist the matrix")
+    parser.add_argument("--force", action="store_true", help="Recompute every pairing")
+    args = parser.parse_args()
+
+    tournament = asyncio.run(run(args))
+    print(json.dumps({
+        "species": len(tournament["species"]),
+        "computed_pairs": tournament["computed_pairs"],
+        "recomputed_species": tournament["recomputed_species"],
+        "elapsed_seconds": tournament["elapsed_seconds"],
+        "output": args.output
+    }, indent=2))
@@ -1,34 +1,177 @@
+import atexit
+import contextvars
+import copy
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import os
+import queue
+import random
 
 # Ensure logs directory exists
 LOG_DIR = "logs"
 os.makedirs(LOG_DIR, exist_ok=True)
 LOG_FILE = os.path.join(LOG_DIR, "pokemon.log")
 
-# Always use the same logger name
-logger = logging.getLogger("pokemon_app")
-logger.setLevel(logging.DEBUG)
+# Logging is configured here only; every module logs through `logger` (or a child of it)
+# and the MCP SDK / httpx loggers go through the same pipeline via the root logger.
+#   POKEMON_LOG_LEVELS="pokemon_app=DEBUG,httpx=WARNING"   per-logger levels
+#   POKEMON_LOG_SAMPLING="pokemon_app=0.1"                  keep this share of records below WARNING
+#   POKEMON_LOG_CONSOLE="WARNING"                          stderr threshold (file gets everything)
+LOG_LEVELS_ENV = "POKEMON_LOG_LEVELS"
+LOG_SAMPLING_ENV = "POKEMON_LOG_SAMPLING"
+LOG_CONSOLE_ENV = "POKEMON_LOG_CONSOLE"
+DEFAULT_LEVELS = {"pokemon_app": "INFO", "mcp": "INFO", "httpx": "WARNING", "httpcore": "WARNING"}
+# Records waiting for the writer thread; past this they are dropped and counted, never blocking the loop
+QUEUE_SIZE = 10000
+
+# Id of the MCP request being handled, attached to every record logged while serving it
+request_id_var: contextvars.ContextVar = contextvars.ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else came in through `extra=` and is emitted as a field
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+
+def _parse_pairs(value: str) -> dict:
+    pairs = {}
+    for item in (value or "").split(","):
+        name, sep, setting = item.partition("=")
+        if sep and name.strip():
+            pairs[name.strip()] = setting.strip()
+    return pairs
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, source, request id and `extra` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "source": f"{record.filename}:{record.lineno}",
+        }
+        if getattr(record, "request_id", None) is not None:
+            entry["request_id"] = record.request_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _RequestContextFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of a logger's records below WARNING; warnings and errors always pass"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or random.random() < self.rate
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """Hands records to the writer thread; drops them when the queue is full instead of blocking"""
 
-# Avoid duplicate handlers if re-imported
-if not logger.handlers:
-    formatter = logging.Formatter(
-        "%(asctime)s - %(levelname)s - %(filename)s:%(lineno)s - %(message)s"
-    )
+    dropped = 0
 
-    rotating_handler = RotatingFileHandler(
-        LOG_FILE,
-        maxBytes=100 * 1024 * 1024,  # 100 MB
-        backupCount=5
-    )
-    rotating_handler.setFormatter(formatter)
-    rotating_handler.setLevel(logging.DEBUG)
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message and traceback now; formatting itself happens on the writer thread
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
 
-    logger.addHandler(rotating_handler)
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _DroppingQueueHandler.dropped += 1
+
+
+def dropped_records() -> int:
+    """Records discarded because the writer thread fell QUEUE_SIZE records behind"""
+    return _DroppingQueueHandler.dropped
+
+
+def worker_log_file(pid: int) -> str:
+    """Log file of a forked worker process"""
+    return os.path.join(LOG_DIR, f"pokemon.{pid}.log")
+
+
+def configure_logging(log_file: str = LOG_FILE, rotate: bool = True) -> QueueListener:
+    """Route all logging through one bounded queue drained by a background writer thread"""
+    levels = {**DEFAULT_LEVELS, **_parse_pairs(os.environ.get(LOG_LEVELS_ENV, ""))}
+    for name, level in levels.items():
+        logging.getLogger(name).setLevel(level.upper())
+    for name, rate in _parse_pairs(os.environ.get(LOG_SAMPLING_ENV, "")).items():
+        sampled = logging.getLogger(name)
+        for existing in [f for f in sampled.filters if isinstance(f, SamplingFilter)]:
+            sampled.removeFilter(existing)
+        try:
+            sampled.addFilter(SamplingFilter(float(rate)))
+        except ValueError:
+            pass
+
+    if rotate:
+        file_handler = RotatingFileHandler(
+            log_file,
+            maxBytes=100 * 1024 * 1024,  # 100 MB
+            backupCount=5
+        )
+    else:
+        # Created on the first record, so workers that never log leave no file behind
+        file_handler = logging.FileHandler(log_file, delay=True)
+    file_handler.setFormatter(JsonFormatter())
 
-    # Optional console logs too
     console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
-    console_handler.setLevel(logging.DEBUG)
-    logger.addHandler(console_handler)
+    console_handler.setFormatter(logging.Formatter(
+        "%(asctime)s - %(levelname)s - %(name)s - %(filename)s:%(lineno)s - %(message)s"
+    ))
+    console_handler.setLevel(os.environ.get(LOG_CONSOLE_ENV, "WARNING").upper())
+
+    queue_handler = _DroppingQueueHandler(queue.Queue(QUEUE_SIZE))
+    queue_handler.addFilter(_RequestContextFilter())
+    root = logging.getLogger()
+    root.addHandler(queue_handler)
+    root.setLevel(logging.WARNING)
+
+    listener = QueueListener(queue_handler.queue, file_handler, console_handler, respect_handler_level=True)
+    listener.start()
+    # Flush whatever is still queued when the process exits
+    atexit.register(listener.stop)
+    return listener
+
+
+def _restart_after_fork():
+    # A forked worker (battle batch pool) inherits the queue but not the writer thread draining it.
+    # It writes its own file without rotation: two processes rotating pokemon.log would lose records.
+    global log_listener
+    root = logging.getLogger()
+    for handler in [h for h in root.handlers if isinstance(h, _DroppingQueueHandler)]:
+        root.removeHandler(handler)
+    log_listener = configure_logging(worker_log_file(os.getpid()), rotate=False)
+
+
+# Always use the same logger name
+logger = logging.getLogger("pokemon_app")
+
+# Avoid a second pipeline if re-imported
+if not any(isinstance(h, _DroppingQueueHandler) for h in logging.getLogger().handlers):
+    log_listener = configure_logging()
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_restart_after_fork)
@@ -37,3 +37,4 @@ class BattleResult:
     total_turns: int
     pokemon1_final_hp: int
     pokemon2_final_hp: int
+    seed: Optional[int] = None
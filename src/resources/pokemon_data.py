@@ -1,21 +1,52 @@
 from mcp.types import Resource, TextResourceContents
-import json
+import asyncio
 from typing import List
-from src.utils.data_loader import PokemonDataLoader
-from src.logger_file import logger
+from src.models import Pokemon
+from src.utils.data_service import PokemonDataService
+from src.utils.metrics import metrics
+from src.utils.response_cache import encode, response_cache
+from src.utils.scheduler import scheduler
+from src.utils.search_index import SearchQuery
+from src.logger_file import dropped_records, logger
 import urllib.parse
 
 # logger.info("in pokemon data file")
+def pokemon_payload(pokemon: Pokemon) -> dict:
+    """Public view of a Pokemon, shared by pokemon://pokemon/{name} and the pokemon_details tool"""
+    return {
+        "id": pokemon.id,
+        "name": pokemon.name,
+        "types": pokemon.types,
+        "stats": {
+            "hp": pokemon.stats.hp,
+            "attack": pokemon.stats.attack,
+            "defense": pokemon.stats.defense,
+            "special_attack": pokemon.stats.special_attack,
+            "special_defense": pokemon.stats.special_defense,
+            "speed": pokemon.stats.speed,
+            "total": (pokemon.stats.hp + pokemon.stats.attack +
+                      pokemon.stats.defense + pokemon.stats.special_attack +
+                      pokemon.stats.special_defense + pokemon.stats.speed)
+        },
+        "abilities": pokemon.abilities,
+        "moves": [{"name": move.name, "type": move.type, "power": move.power} for move in pokemon.moves],
+        "height": pokemon.height,
+        "weight": pokemon.weight
+    }
+
+
 class PokemonDataResource:
-    def __init__(self, data_loader: PokemonDataLoader):
-        self.data_loader = data_loader
+    def __init__(self, data_service: PokemonDataService):
+        self.data_service = data_service
 
     def list_resources(self) -> List[Resource]:
         return [
             Resource(
                 uri="pokemon://search",
                 name="Pokemon Search",
-                description="Search for available Pokemon. Returns list of Pokemon names you can query.",
+                description="Search the cached Pokemon: without parameters lists every name; filter with "
+                            "?name= (prefix, fuzzy fallback), type=, min_/max_ of hp, attack, defense, "
+                            "special_attack, special_defense, speed or total, sort= (- for descending) and limit=",
                 mimeType="application/json"
             ),
             Resource(
@@ -29,6 +60,18 @@ class PokemonDataResource:
                 name="Type Effectiveness Chart",
                 description="Get the complete Pokemon type effectiveness chart",
                 mimeType="application/json"
+            ),
+            Resource(
+                uri="pokemon://tournament",
+                name="Round-Robin Tournament",
+                description="Win-rate matrix of every cached Pokemon against every other (built by run_tournament.py)",
+                mimeType="application/json"
+            ),
+            Resource(
+                uri="pokemon://metrics",
+                name="Server Metrics",
+                description="Cache hit/miss counters and latency histograms per stage (disk, HTTP, simulation, serialization), plus scheduler queues",
+                mimeType="application/json"
             )
         ]
 
@@ -36,68 +79,85 @@ class PokemonDataResource:
         try:
             uri_str = str(uri)
             decoded_uri = urllib.parse.unquote(uri_str)
+            # Data this response is built from; None for responses that are never cached
+            depends_on = None
 
             # logger.info(f"Original URI: {uri_str}")
             # logger.info(f"Decoded URI: {decoded_uri}")
 
-            if decoded_uri == "pokemon://search":
+            if decoded_uri.split("?", 1)[0] == "pokemon://search":
                 logger.info("pokemon search")
-            # Return list of searchable Pokemon
-                pokemon_list = [
-                    "pikachu", "charizard", "blastoise", "venusaur", "alakazam", 
-                    "machamp", "gengar", "dragonite", "mewtwo", "mew"
-                ]
-                text = json.dumps({
-                    "available_pokemon": pokemon_list,
-                    "usage": "Use pokemon://pokemon/{name} to get specific Pokemon data",
-                    "examples": [
-                        "pokemon://pokemon/pikachu",
-                        "pokemon://pokemon/charizard"
-                    ]
-                }, indent=2)
+                index = await self.data_service.search_index()
+                params = urllib.parse.parse_qs(urllib.parse.urlsplit(uri_str).query)
+                depends_on = ["species-index"]
+                if params:
+                    try:
+                        payload = index.search(SearchQuery.from_params(params))
+                    except ValueError as e:
+                        payload = {"error": f"Invalid search: {e}"}
+                else:
+                    # Every species available offline
+                    payload = {
+                        "available_pokemon": index.names(),
+                        "usage": "Use pokemon://pokemon/{name} to get specific Pokemon data, or filter with "
+                                 "pokemon://search?name=&type=&min_<stat>=&max_<stat>=&sort=&limit=",
+                        "examples": [
+                            "pokemon://pokemon/pikachu",
+                            "pokemon://search?type=fire&min_speed=100",
+                            "pokemon://search?name=pik",
+                            "pokemon://search?type=psychic&sort=-special_attack&limit=5"
+                        ]
+                    }
 
             elif decoded_uri.startswith("pokemon://pokemon/"):
                 logger.info("non-dynamic pokemon details")
                 # logger.info("in function 1")
                 pokemon_name = decoded_uri.split("/")[-1].lower()
-                pokemon = await self.data_loader.fetch_pokemon_data(pokemon_name)
+                pokemon = await self.data_service.fetch_pokemon(pokemon_name)
                 
-                # Convert to JSON
-                pokemon_dict = {
-                    "id": pokemon.id,
-                    "name": pokemon.name,
-                    "types": pokemon.types,
-                    "stats": {
-                        "hp": pokemon.stats.hp,
-                        "attack": pokemon.stats.attack,
-                        "defense": pokemon.stats.defense,
-                        "special_attack": pokemon.stats.special_attack,
-                        "special_defense": pokemon.stats.special_defense,
-                        "speed": pokemon.stats.speed,
-                        "total": (pokemon.stats.hp + pokemon.stats.attack + 
-                                pokemon.stats.defense + pokemon.stats.special_attack + 
-                                pokemon.stats.special_defense + pokemon.stats.speed)
-                    },
-                    "abilities": pokemon.abilities,
-                    "moves": [{"name": move.name, "type": move.type, "power": move.power} 
-                             for move in pokemon.moves],
-                    "height": pokemon.height,
-                    "weight": pokemon.weight
-                }
-                
-                text = json.dumps(pokemon_dict, indent=2)
+                payload = pokemon_payload(pokemon)
+                depends_on = [f"pokemon:{pokemon.name.lower()}"]
                 # logger.info(f"content: {content}")
                 
             elif decoded_uri == "pokemon://type-chart":
                 logger.info("Effectiveness chart")
                 # logger.info("in function 2")
                 # Get type effectiveness chart
-                type_chart = await self.data_loader.load_type_effectiveness()
-                text = json.dumps(type_chart, indent=2)
+                payload = await self.data_service.type_chart()
+                depends_on = ["type-chart"]
                 
+            elif decoded_uri == "pokemon://tournament":
+                logger.info("Tournament matrix")
+                # Imported on first use; the tournament module pulls in the NumPy engine
+                from src.utils.tournament import load_tournament
+                tournament = await asyncio.to_thread(load_tournament)
+                if tournament is None:
+                    tournament = {"error": "No tournament results yet. Run `python run_tournament.py` to build them."}
+                payload = tournament
+
+            elif decoded_uri == "pokemon://metrics":
+                memory_cache = self.data_service.loader.memory_cache
+                payload = {
+                    **metrics.snapshot(),
+                    "memory_cache": {
+                        "size": len(memory_cache),
+                        "hits": memory_cache.hits,
+                        "misses": memory_cache.misses,
+                        "evictions": memory_cache.evictions
+                    },
+                    "response_cache": response_cache.stats(),
+                    "scheduler": scheduler.snapshot(),
+                    "log_records_dropped": dropped_records()
+                }
+
             else:
                 # logger.info("in function 3")
-                text = json.dumps({"error": f"Invalid URI format {decoded_uri}"})
+                payload = {"error": f"Invalid URI format {decoded_uri}"}
+
+            with metrics.timer("serialize.resource"):
+                text = encode(payload)
+            if depends_on is not None and "error" not in payload:
+                response_cache.put(("resource", uri_str), text, depends_on)
             # return TextResourceContents(
             #     uri=uri_str,
             #     mimeType="application/json",
@@ -107,9 +167,5 @@ class PokemonDataResource:
         
         except Exception as e:
             logger.error(f"error in get_poekomon resource:{e}",exc_info=True)
-            uri_str = str(uri) if hasattr(uri, '__str__') else uri
-            return [TextResourceContents(
-                uri=uri_str,
-                mimeType="application/json",
-                text=json.dumps({"error": f"Failed to fetch resource: {str(e)}"})
-            )]
+            # Same shape as the success path: the server wraps the returned text
+            return encode({"error": f"Failed to fetch resource: {str(e)}"})
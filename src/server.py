@@ -1,57 +1,67 @@
 import asyncio
 import sys
 import os
-import logging
+import time
 
 from typing import Dict
-import asyncio
-import sys
-import os
-# from logger_file import logger
 import json
 
-logger = logging.basicConfig(
-    filename='mcp_server.log',
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-
 # Fix import path
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
-from mcp.types import Resource, Tool, TextResourceContents
+from mcp.types import Resource, Tool, TextContent
 
-from src.utils.data_loader import PokemonDataLoader
+from src.logger_file import logger, request_id_var
+from src.utils.data_service import data_service
+from src.utils.response_cache import encode, response_cache
+from src.utils.scheduler import scheduler
+from src.utils.metrics import dump_interval_from_env, metrics
 from src.resources.pokemon_data import PokemonDataResource
-from src.tools import battle_simulator, pokemon_data_tool
+from src.tools import battle_simulator, pokemon_data_tool, monte_carlo_tool, damage_calc_tool, battle_odds_tool, battle_batch_tool, best_counters_tool
 
 # Initialize MCP server
 app = Server("pokemon-battle-server")
+
+# Tools whose responses are cached, with the data each response depends on
+CACHED_TOOLS = {
+    "pokemon_details": lambda result: [f"pokemon:{result['name'].lower()}"],
+}
+# Tools that draw a fresh random battle unless given a seed; unseeded calls must not share a result
+RANDOM_TOOLS = {"battle_simulate", "battle_monte_carlo", "battle_odds"}
 # logger.info("Server started.")
 
-data_loader = PokemonDataLoader()
-pokemon_resource = PokemonDataResource(data_loader)
+pokemon_resource = PokemonDataResource(data_service)
 
 @app.list_resources()
 async def list_resources() -> list[Resource]:
     return pokemon_resource.list_resources()
 
+def _bind_request_id():
+    """Tag log records written while serving this request with its MCP request id"""
+    try:
+        return request_id_var.set(str(app.request_context.request_id))
+    except LookupError:
+        return None
+
 @app.read_resource()
-async def read_resource(uri: str) -> list[TextResourceContents]:
+async def read_resource(uri: str):
+    _bind_request_id()
     try:
         """Read Pokemon data resource"""
-        result = await pokemon_resource.get_pokemon_resource(uri)
+        with metrics.timer("resource.read"):
+            cached = response_cache.get(("resource", str(uri)))
+            if cached is not None:
+                return cached
+            result = await scheduler.run("resource", str(uri), lambda: pokemon_resource.get_pokemon_resource(uri))
         return result
     
     except Exception as e:
-        return TextResourceContents(
-            uri=uri,
-            mimeType="text/plain",
-            text=f"Error: {e}"
-        )
+        # Overloaded or past its deadline: same error shape as a failed resource lookup
+        logger.warning(f"Resource read failed for {uri}: {e}")
+        return encode({"error": str(e)})
 
 @app.list_tools()
 async def list_tools():
@@ -69,6 +79,19 @@ async def list_tools():
                     "pokemon2": {
                         "type": "string", 
                         "description": "Name of the second Pokemon (e.g., 'charizard')"
+                    },
+                    "log_level": {
+                        "type": "string",
+                        "enum": ["none", "summary", "full"],
+                        "description": "How much of the battle log to return (default 'full')"
+                    },
+                    "stream": {
+                        "type": "boolean",
+                        "description": "Send each turn as a progress notification while the battle runs"
+                    },
+                    "seed": {
+                        "type": "integer",
+                        "description": "Seed of a previous battle to replay it exactly (returned in battle_result)"
                     }
                 },
                 "required": ["pokemon1", "pokemon2"]
@@ -88,44 +111,278 @@ async def list_tools():
                 "required":["pokemon_name"]
 
             }
+        ),
+        Tool(
+            name="battle_monte_carlo",
+            description="Simulate many battles between two Pokemons. Returns win probability, turn-count histogram and final HP distributions.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "pokemon1": {
+                        "type": "string",
+                        "description": "Name of the first Pokemon (e.g., 'pikachu')"
+                    },
+                    "pokemon2": {
+                        "type": "string",
+                        "description": "Name of the second Pokemon (e.g., 'charizard')"
+                    },
+                    "n_battles": {
+                        "type": "integer",
+                        "description": "Number of battles to simulate (default 10000)",
+                        "minimum": 1,
+                        "maximum": monte_carlo_tool.MAX_BATTLES
+                    },
+                    "seed": {
+                        "type": "integer",
+                        "description": "Optional random seed for reproducible results"
+                    }
+                },
+                "required": ["pokemon1", "pokemon2"]
+            }
+        ),
+        Tool(
+            name="damage_calc",
+            description="Exact damage range of an attacker's moves against a defender: min/max, full damage distribution over rolls and critical hits, and the probability of a KO after each hit.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "attacker": {
+                        "type": "string",
+                        "description": "Name of the attacking Pokemon (e.g., 'pikachu')"
+                    },
+                    "defender": {
+                        "type": "string",
+                        "description": "Name of the defending Pokemon (e.g., 'onix')"
+                    },
+                    "move": {
+                        "type": "string",
+                        "description": "Only report this move (default: all of the attacker's moves)"
+                    }
+                },
+                "required": ["attacker", "defender"]
+            }
+        ),
+        Tool(
+            name="battle_odds",
+            description="Exact win probabilities, draw probability and expected turns of a battle between two Pokemons, solved without simulation. Wins and draws (equal HP at the turn limit) are separate outcomes. Solves take up to about a second; pairings above 2,000,000 (status, HP) states fall back to sampling 20,000 battles.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "pokemon1": {
+                        "type": "string",
+                        "description": "Name of the first Pokemon (e.g., 'pikachu')"
+                    },
+                    "pokemon2": {
+                        "type": "string",
+                        "description": "Name of the second Pokemon (e.g., 'charizard')"
+                    },
+                    "seed": {
+                        "type": "integer",
+                        "description": "Random seed used only if the pairing falls back to sampling"
+                    }
+                },
+                "required": ["pokemon1", "pokemon2"]
+            }
+        ),
+        Tool(
+            name="best_counters",
+            description="Rank every cached Pokemon by its estimated chance of beating the opponent (damage formula, STAB, speed order and turns-to-KO, scored in one batched pass). Check a shortlisted pairing with battle_odds.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "opponent": {
+                        "type": "string",
+                        "description": "Name of the Pokemon to counter (e.g., 'mewtwo')"
+                    },
+                    "top_k": {
+                        "type": "integer",
+                        "description": "Number of counters to return (default 10, max 100)",
+                        "minimum": 1,
+                        "maximum": 100
+                    }
+                },
+                "required": ["opponent"]
+            }
+        ),
+        Tool(
+            name="battle_simulate_batch",
+            description="Simulate many independent Pokemon battles in parallel worker processes. Returns each battle's winner, turns, final HP and replay seed, in input order.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "pairings": {
+                        "type": "array",
+                        "description": "Battles to play",
+                        "minItems": 1,
+                        "maxItems": battle_batch_tool.MAX_PAIRINGS,
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "pokemon1": {"type": "string"},
+                                "pokemon2": {"type": "string"},
+                                "seed": {"type": "integer"}
+                            },
+                            "required": ["pokemon1", "pokemon2"]
+                        }
+                    },
+                    "log_level": {
+                        "type": "string",
+                        "enum": ["none", "summary", "full"],
+                        "description": "How much of each battle log to return (default 'none')"
+                    },
+                    "stream": {
+                        "type": "boolean",
+                        "description": "Send finished battles as progress notifications while the batch runs"
+                    }
+                },
+                "required": ["pairings"]
+            }
         )
     ]
 
+def _turn_streamer(total: int = None):
+    """Progress-notification callback for the current request, or None if the client sent no progress token"""
+    try:
+        ctx = app.request_context
+    except LookupError:
+        return None
+    progress_token = ctx.meta.progressToken if ctx.meta else None
+    if progress_token is None:
+        return None
+
+    async def send_turn(turn: int, turn_log: list):
+        await ctx.session.send_progress_notification(
+            progress_token,
+            progress=turn,
+            total=total,
+            message="\n".join(turn_log),
+            related_request_id=str(ctx.request_id)
+        )
+    return send_turn
+
 @app.call_tool()
 async def call_tool(name: str, arguments: Dict):
     """Execute tool calls"""
+    _bind_request_id()
+    started = time.perf_counter()
     try:
         # logger.info(f"DEBUG: Calling tool {name} with arguments: {arguments}")
 
-        if name == "battle_simulate":
-            result =  await battle_simulator.simulate_battle(
-                arguments["pokemon1"],
-                arguments["pokemon2"]
-            )
-            # logger.info(f"DEBUG: Battle result type: {type(result)}")
-
-            if not isinstance(result, dict):
-                # logger.warning(f"Unexpected result type: {type(result)}")
-                return {"error": f"Unexpected result type: {type(result)}"}
-            return result
-        
-        elif name == "pokemon_details":
-            result = await pokemon_data_tool.get_pokemon_data(arguments.get("pokemon_name"))
-            return result
-        
-        else:
-            raise ValueError(f"Unknown tool: {name}")
+        cache_key = ("tool", name, json.dumps(arguments, sort_keys=True)) if name in CACHED_TOOLS else None
+        if cache_key is not None:
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            generation = response_cache.generation
+
+        with metrics.timer(f"tool.{name}"):
+            result = await scheduler.run(name, arguments, lambda: _run_tool(name, arguments),
+                                         coalesce=_shareable(name, arguments))
+        logger.info(f"Tool {name} finished", extra={"tool": name, "status": "error" if "error" in result else "ok",
+                                                    "duration_ms": round((time.perf_counter() - started) * 1000, 3)})
+        # The SDK would serialize a dict result itself; doing it here measures it and lets it be cached
+        with metrics.timer("serialize.tool"):
+            response = [TextContent(type="text", text=encode(result))], result
+        if cache_key is not None and "error" not in result:
+            response_cache.put(cache_key, response, CACHED_TOOLS[name](result), generation)
+        return response
     except Exception as e:
-        # logger.error(f"Error in call_tool: {e}", exc_info=True)
+        logger.warning(f"Tool {name} failed: {e}", extra={"tool": name, "status": "failed",
+                                                          "duration_ms": round((time.perf_counter() - started) * 1000, 3)})
         return {"error": f"Tool execution failed: {str(e)}"}
 
-async def main():
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options()
+def _shareable(name: str, arguments: Dict) -> bool:
+    """Whether identical in-flight calls may be answered with one result"""
+    # Streaming calls send their own progress notifications
+    if arguments.get("stream"):
+        return False
+    if name in RANDOM_TOOLS:
+        return arguments.get("seed") is not None
+    if name == "battle_simulate_batch":
+        return all(pairing.get("seed") is not None for pairing in arguments.get("pairings", []))
+    return True
+
+async def _run_tool(name: str, arguments: Dict):
+    if name == "battle_simulate":
+        result =  await battle_simulator.simulate_battle(
+            arguments["pokemon1"],
+            arguments["pokemon2"],
+            log_level=arguments.get("log_level", "full"),
+            on_turn=_turn_streamer() if arguments.get("stream") else None,
+            seed=arguments.get("seed")
+        )
+        # logger.info(f"DEBUG: Battle result type: {type(result)}")
+
+        if not isinstance(result, dict):
+            # logger.warning(f"Unexpected result type: {type(result)}")
+            return {"error": f"Unexpected result type: {type(result)}"}
+        return result
+    
+    elif name == "pokemon_details":
+        result = await pokemon_data_tool.get_pokemon_data(arguments.get("pokemon_name"))
+        return result
+
+    elif name == "battle_monte_carlo":
+        result = await monte_carlo_tool.battle_monte_carlo(
+            arguments["pokemon1"],
+            arguments["pokemon2"],
+            arguments.get("n_battles", 10000),
+            arguments.get("seed")
+        )
+        return result
+
+    elif name == "damage_calc":
+        result = await damage_calc_tool.damage_calc(
+            arguments["attacker"],
+            arguments["defender"],
+            arguments.get("move")
+        )
+        return result
+
+    elif name == "battle_odds":
+        result = await battle_odds_tool.battle_odds(
+            arguments["pokemon1"],
+            arguments["pokemon2"],
+            arguments.get("seed")
+        )
+        return result
+
+    elif name == "best_counters":
+        result = await best_counters_tool.best_counters(
+            arguments["opponent"],
+            arguments.get("top_k", 10)
+        )
+        return result
+
+    elif name == "battle_simulate_batch":
+        pairings = arguments["pairings"]
+        result = await battle_batch_tool.simulate_battle_batch(
+            pairings,
+            log_level=arguments.get("log_level", "none"),
+            on_result=_turn_streamer(total=len(pairings)) if arguments.get("stream") else None
         )
+        return result
+    
+    else:
+        raise ValueError(f"Unknown tool: {name}")
+
+async def main():
+    # Warm the shared data service before the transport starts accepting requests
+    await data_service.startup()
+    dump_interval = dump_interval_from_env()
+    dumper = asyncio.ensure_future(metrics.dump_periodically(dump_interval)) if dump_interval else None
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                app.create_initialization_options()
+            )
+    finally:
+        if dumper is not None:
+            dumper.cancel()
+        battle_batch_tool.shutdown_pool(wait=False)
+        await data_service.shutdown()
 
 if __name__ == "__main__":
     asyncio.run(main())
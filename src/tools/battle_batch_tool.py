@@ -0,0 +1,157 @@
+import asyncio
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from src.models import Pokemon
+from src.utils.battle_mechanics import BattleSimulator, TypeEffectiveness
+from src.utils.data_service import data_service
+from src.utils.metrics import metrics
+from src.utils.scheduler import offload
+from src.logger_file import logger
+
+MAX_PAIRINGS = 10_000
+
+# Shared worker pool, started on the first batch and stopped by shutdown_pool()
+battle_pool = None
+pool_workers = 0
+# The TypeEffectiveness the workers were initialized with
+pool_type_chart = None
+
+# Per-worker simulator, built once by _init_worker
+_worker_sim = None
+
+
+def _init_worker(matrix_rows: List[List[float]]):
+    global _worker_sim
+    _worker_sim = BattleSimulator(TypeEffectiveness(matrix_rows=matrix_rows))
+
+
+async def _play_all(chunk: List[Tuple[int, Pokemon, Pokemon, int]], log_level: str) -> List[Tuple[int, Dict[str, Any]]]:
+    results = []
+    for index, pokemon1, pokemon2, seed in chunk:
+        # Every battle owns its RNG and BattleStates, so nothing carries over between them
+        result = await _worker_sim.simulate_battle(pokemon1, pokemon2, log_level=log_level, seed=seed)
+        battle = {
+            "index": index,
+            "pokemon1": pokemon1.name,
+            "pokemon2": pokemon2.name,
+            "battle_result": {
+                "winner": result.winner,
+                "loser": result.loser,
+                "total_turns": result.total_turns,
+                "pokemon1_final_hp": result.pokemon1_final_hp,
+                "pokemon2_final_hp": result.pokemon2_final_hp,
+                "seed": result.seed
+            }
+        }
+        if log_level != "none":
+            battle["battle_log"] = result.battle_log
+        results.append((index, battle))
+    return results
+
+
+def _play_chunk(chunk: List[Tuple[int, Pokemon, Pokemon, int]], log_level: str) -> List[Tuple[int, Dict[str, Any]]]:
+    """Worker entry point: play a chunk of battles, keyed by their position in the batch"""
+    return asyncio.run(_play_all(chunk, log_level))
+
+
+async def get_pool(workers: Optional[int] = None) -> Tuple[ProcessPoolExecutor, int]:
+    global battle_pool, pool_workers, pool_type_chart
+    workers = workers or os.cpu_count() or 1
+    type_chart = await data_service.type_effectiveness()
+    # Workers copy the chart once at startup; a swapped chart (e.g. a snapshot load) needs new ones
+    if battle_pool is None or pool_workers != workers or pool_type_chart is not type_chart:
+        shutdown_pool(wait=False)
+        battle_pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                          initargs=(type_chart.matrix_rows,))
+        pool_workers = workers
+        pool_type_chart = type_chart
+    return battle_pool, pool_workers
+
+
+def shutdown_pool(wait: bool = True):
+    """Stop the worker pool; from inside the event loop pass wait=False so the workers exit in the background"""
+    global battle_pool
+    if battle_pool is not None:
+        pool, battle_pool = battle_pool, None
+        pool.shutdown(wait=wait, cancel_futures=True)
+
+
+async def simulate_battle_batch(pairings: List[Dict[str, Any]], log_level: str = "none",
+                                on_result: Optional[Callable[[int, List[str]], Awaitable[None]]] = None,
+                                workers: Optional[int] = None) -> Dict[str, Any]:
+    """Play many independent battles on a process pool
+
+    pairings: [{"pokemon1": ..., "pokemon2": ..., "seed": optional}]. Battles come
+    back in input order, each with the seed that replays it in battle_simulate.
+    on_result is awaited with the number of finished battles and their summaries
+    as each chunk completes, for streaming.
+    """
+    try:
+        if not 1 <= len(pairings) <= MAX_PAIRINGS:
+            raise ValueError(f"pairings must hold between 1 and {MAX_PAIRINGS} entries")
+        started = time.perf_counter()
+
+        names = {name.lower().strip() for pairing in pairings for name in (pairing["pokemon1"], pairing["pokemon2"])}
+        fetched = await asyncio.gather(*(data_service.fetch_pokemon(name) for name in names), return_exceptions=True)
+        roster = dict(zip(names, fetched))
+
+        battles: List[Optional[Dict[str, Any]]] = [None] * len(pairings)
+        jobs = []
+        for index, pairing in enumerate(pairings):
+            pokemon1 = roster[pairing["pokemon1"].lower().strip()]
+            pokemon2 = roster[pairing["pokemon2"].lower().strip()]
+            failed = next((p for p in (pokemon1, pokemon2) if isinstance(p, Exception)), None)
+            if failed is not None:
+                battles[index] = {"index": index, "pokemon1": pairing["pokemon1"], "pokemon2": pairing["pokemon2"],
+                                  "error": f"Battle simulation failed: {str(failed)}"}
+                continue
+            seed = pairing.get("seed")
+            jobs.append((index, pokemon1, pokemon2, seed if seed is not None else random.getrandbits(32)))
+
+        pool, n_workers = await get_pool(workers)
+        completed = len(pairings) - len(jobs)
+        if jobs:
+            # Several chunks per worker: results stream back sooner and slow chunks balance out
+            chunk_count = min(len(jobs), n_workers * 4)
+            chunks = [jobs[i::chunk_count] for i in range(chunk_count)]
+            pending = [asyncio.ensure_future(offload(_play_chunk, chunk, log_level, executor=pool)) for chunk in chunks]
+            try:
+                for finished in asyncio.as_completed(pending):
+                    results = await finished
+                    for index, battle in results:
+                        battles[index] = battle
+                    completed += len(results)
+                    if on_result is not None:
+                        await on_result(completed, [
+                            f"#{battle['index']} {battle['pokemon1']} vs {battle['pokemon2']}: "
+                            f"{battle['battle_result']['winner']} wins in {battle['battle_result']['total_turns']} turns"
+                            for _, battle in results
+                        ])
+            finally:
+                # Timed out or failed: chunks not yet started in a worker are dropped
+                for chunk_task in pending:
+                    chunk_task.cancel()
+
+        elapsed = time.perf_counter() - started
+        metrics.observe("simulate.batch", elapsed)
+        metrics.incr("simulate.batch.battles", len(jobs))
+        logger.info(f"Battle batch: {len(jobs)} battles on {n_workers} workers in {elapsed:.3f}s")
+        return {
+            "battles": battles,
+            "completed": len(jobs),
+            "failed": len(pairings) - len(jobs),
+            "workers": n_workers,
+            "elapsed_seconds": round(elapsed, 3),
+            "battles_per_second": round(len(jobs) / elapsed, 1) if elapsed > 0 else None
+        }
+
+    except Exception as e:
+        if isinstance(e, BrokenProcessPool):
+            # A worker died; start a fresh pool on the next batch
+            shutdown_pool(wait=False)
+        logger.error(f"Battle batch failed: {e}")
+        return {"error": f"Battle batch failed: {str(e)}"}
@@ -0,0 +1,54 @@
+from typing import Any, Dict, Optional
+from src.utils.data_service import data_service
+from src.utils.metrics import metrics
+from src.utils.scheduler import cancel_event, offload
+from src.logger_file import logger
+
+# Battles sampled when a pairing is too large to solve exactly
+FALLBACK_BATTLES = 20000
+
+odds_solver = None
+fallback_sim = None
+
+async def battle_odds(pokemon1_name: str, pokemon2_name: str, seed: Optional[int] = None) -> Dict[str, Any]:
+    """Exact win/draw probabilities and expected turns of a pairing, sampled if the state space is too large"""
+    global odds_solver, fallback_sim
+
+    try:
+        # Imported on first use: NumPy is the slowest import in the server
+        from src.utils.battle_odds import BattleOddsSolver, StateSpaceTooLarge
+        if odds_solver is None:
+            odds_solver = BattleOddsSolver(await data_service.type_effectiveness())
+
+        pokemon1 = await data_service.fetch_pokemon(pokemon1_name)
+        pokemon2 = await data_service.fetch_pokemon(pokemon2_name)
+
+        try:
+            with metrics.timer("simulate.odds"):
+                result = await offload(odds_solver.solve, pokemon1, pokemon2, cancel=cancel_event())
+        except StateSpaceTooLarge as e:
+            logger.info(f"Battle odds {pokemon1.name} vs {pokemon2.name}: {e}, sampling instead")
+            if fallback_sim is None:
+                from src.utils.monte_carlo import MonteCarloBattleSimulator
+                fallback_sim = MonteCarloBattleSimulator(odds_solver.type_chart)
+            with metrics.timer("simulate.monte_carlo"):
+                result = await offload(fallback_sim.simulate, pokemon1, pokemon2, FALLBACK_BATTLES, seed,
+                                       cancel=cancel_event())
+            # Report draws apart from the wins, as the exact solver does
+            draw_probability = result["draws"] / result["n_battles"]
+            result["win_probability"]["pokemon2"] -= draw_probability
+            result["draw_probability"] = draw_probability
+            result["method"] = "monte_carlo"
+            result["fallback_reason"] = str(e)
+            return result
+
+        logger.info(f"Battle odds {pokemon1.name} vs {pokemon2.name}: solved {result['turns_solved']} turns exactly")
+        return result
+
+    except Exception as e:
+        logger.error(f"Battle odds failed for {pokemon1_name} vs {pokemon2_name}: {e}")
+        return {
+            "error": f"Battle odds failed: {str(e)}",
+            "pokemon1": pokemon1_name,
+            "pokemon2": pokemon2_name
+        }
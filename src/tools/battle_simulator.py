@@ -1,55 +1,91 @@
 
-from src.utils.data_loader import PokemonDataLoader
+from src.utils.data_service import data_service
 from src.utils.battle_mechanics import BattleSimulator
-from typing import Dict, Any
+from src.utils.memory_cache import LRUCache
+from src.utils.metrics import metrics
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from src.logger_file import logger
 
 # Global instances
-data_loader = PokemonDataLoader()
 battle_sim = None
+# Finished battles keyed by (pokemon1, pokemon2, seed, log_level); a seed fully determines a battle
+battle_results = LRUCache(maxsize=1024, ttl=3600.0)
 
-async def simulate_battle(pokemon1_name: str, pokemon2_name: str) -> Dict[str, Any]:
-    """Simulate a battle between two Pokemon"""
+
+def _species_loaded(pokemon):
+    # A rebuilt species may have new stats or moves: its battles have to be replayed
+    name = pokemon.name.lower()
+    battle_results.invalidate_where(lambda key: name in key[:2])
+
+
+data_service.add_species_listener(_species_loaded)
+
+async def simulate_battle(pokemon1_name: str, pokemon2_name: str, log_level: str = "full",
+                          on_turn: Optional[Callable[[int, List[str]], Awaitable[None]]] = None,
+                          seed: Optional[int] = None) -> Dict[str, Any]:
+    """Simulate a battle between two Pokemon
+
+    log_level ("none" / "summary" / "full") controls how much of the battle log is
+    built and returned; on_turn receives each turn's lines as soon as it is played.
+    Passing the seed from an earlier result replays (or re-fetches) that battle.
+    """
     global battle_sim
     
     try:
-        if battle_sim is None:
-            type_effectiveness = await data_loader.load_type_effectiveness()
-            battle_sim = BattleSimulator(type_effectiveness)
+        type_chart = await data_service.type_effectiveness()
+        if battle_sim is None or battle_sim.type_chart is not type_chart:
+            # First call, or a snapshot swapped the type chart: earlier results used the old one
+            if battle_sim is not None:
+                battle_results.invalidate()
+            battle_sim = BattleSimulator(type_chart)
         
-        pokemon1 = await data_loader.fetch_pokemon_data(pokemon1_name)
-        pokemon2 = await data_loader.fetch_pokemon_data(pokemon2_name)
+        pokemon1 = await data_service.fetch_pokemon(pokemon1_name)
+        pokemon2 = await data_service.fetch_pokemon(pokemon2_name)
+
+        # Keyed by species name, not the identifier passed in, so a rebuild of either can drop it
+        cache_key = (pokemon1.name.lower(), pokemon2.name.lower(), seed, log_level)
+        if seed is not None and on_turn is None:
+            cached = battle_results.get(cache_key)
+            if cached is not None:
+                metrics.incr("cache.battle.hit")
+                return dict(cached)
         
-        result = await battle_sim.simulate_battle(pokemon1, pokemon2)
+        with metrics.timer("simulate.battle"):
+            result = await battle_sim.simulate_battle(pokemon1, pokemon2, log_level=log_level,
+                                                      on_turn=on_turn, seed=seed)
         
-        return {
+        response = {
             "battle_result": {
                 "winner": result.winner,
                 "loser": result.loser,
                 "total_turns": result.total_turns,
                 "pokemon1_final_hp": result.pokemon1_final_hp,
-                "pokemon2_final_hp": result.pokemon2_final_hp
+                "pokemon2_final_hp": result.pokemon2_final_hp,
+                "seed": result.seed
+            }
+        }
+        if log_level != "none":
+            response["battle_log"] = result.battle_log
+        response["participants"] = {
+            "pokemon1": {
+                "name": pokemon1.name,
+                "types": pokemon1.types,
+                "total_stats": sum([
+                    pokemon1.stats.hp, pokemon1.stats.attack, pokemon1.stats.defense,
+                    pokemon1.stats.special_attack, pokemon1.stats.special_defense, pokemon1.stats.speed
+                ])
             },
-            "battle_log": result.battle_log,
-            "participants": {
-                "pokemon1": {
-                    "name": pokemon1.name,
-                    "types": pokemon1.types,
-                    "total_stats": sum([
-                        pokemon1.stats.hp, pokemon1.stats.attack, pokemon1.stats.defense,
-                        pokemon1.stats.special_attack, pokemon1.stats.special_defense, pokemon1.stats.speed
-                    ])
-                },
-                "pokemon2": {
-                    "name": pokemon2.name,
-                    "types": pokemon2.types,
-                    "total_stats": sum([
-                        pokemon2.stats.hp, pokemon2.stats.attack, pokemon2.stats.defense,
-                        pokemon2.stats.special_attack, pokemon2.stats.special_defense, pokemon2.stats.speed
-                    ])
-                }
+            "pokemon2": {
+                "name": pokemon2.name,
+                "types": pokemon2.types,
+                "total_stats": sum([
+                    pokemon2.stats.hp, pokemon2.stats.attack, pokemon2.stats.defense,
+                    pokemon2.stats.special_attack, pokemon2.stats.special_defense, pokemon2.stats.speed
+                ])
             }
         }
+        battle_results.put(cache_key[:2] + (result.seed, log_level), response)
+        return dict(response)
         
     except Exception as e:
         return {
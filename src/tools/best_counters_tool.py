@@ -0,0 +1,76 @@
+import asyncio
+import time
+from typing import Any, Dict
+from src.models import Pokemon
+from src.utils.data_service import data_service
+from src.utils.metrics import metrics
+from src.logger_file import logger
+
+MAX_TOP_K = 100
+
+# Every cached species as built by the loader, kept current by a data service listener
+roster_species: Dict[str, Pokemon] = {}
+# RosterMatrix over roster_species; dropped whenever a species is added or rebuilt
+roster_matrix = None
+listening = False
+
+
+def _species_loaded(pokemon: Pokemon):
+    global roster_matrix
+    roster_species[pokemon.name.lower()] = pokemon
+    roster_matrix = None
+
+
+async def _roster():
+    global roster_matrix, listening
+    # Imported on first use: NumPy is the slowest import in the server
+    from src.utils.counters import RosterMatrix
+    if not listening:
+        data_service.add_species_listener(_species_loaded)
+        listening = True
+
+    missing = [name for name in (await data_service.search_index()).names() if name not in roster_species]
+    if missing:
+        fetched = await asyncio.gather(*(data_service.fetch_pokemon(name) for name in missing), return_exceptions=True)
+        for name, pokemon in zip(missing, fetched):
+            if isinstance(pokemon, Exception):
+                logger.warning(f"Leaving {name} out of the counters roster: {pokemon}")
+            else:
+                _species_loaded(pokemon)
+    if roster_matrix is None:
+        with metrics.timer("build.roster"):
+            roster_matrix = RosterMatrix(sorted(roster_species.values(), key=lambda p: p.name))
+    return roster_matrix
+
+
+async def best_counters(opponent_name: str, top_k: int = 10) -> Dict[str, Any]:
+    """The cached species most likely to beat the opponent, scored in one batched pass over the roster"""
+    try:
+        from src.utils.counters import RosterMatrix, rank_counters
+        if not 1 <= top_k <= MAX_TOP_K:
+            raise ValueError(f"top_k must be between 1 and {MAX_TOP_K}")
+
+        opponent = await data_service.fetch_pokemon(opponent_name)
+        roster = await _roster()
+        type_chart = await data_service.type_effectiveness()
+
+        started = time.perf_counter()
+        counters = rank_counters(roster, RosterMatrix([opponent]), type_chart, top_k)
+        elapsed = time.perf_counter() - started
+        metrics.observe("simulate.counters", elapsed)
+
+        logger.info(f"Best counters to {opponent.name}: scored {len(roster)} species in {elapsed * 1000:.2f}ms")
+        return {
+            "opponent": opponent.name,
+            "roster_size": len(roster),
+            "method": "estimate",
+            "counters": counters,
+            "note": "Status effects are not modelled; use battle_odds for exact odds of a shortlisted pairing"
+        }
+
+    except Exception as e:
+        logger.error(f"Best counters failed for {opponent_name}: {e}")
+        return {
+            "error": f"Best counters failed: {str(e)}",
+            "opponent": opponent_name
+        }
@@ -0,0 +1,67 @@
+import time
+from typing import Any, Dict, Optional
+from src.utils.battle_mechanics import PHYSICAL_TYPES, BattleSimulator, BattleState
+from src.utils.damage_range import (damage_distribution, expected_damage, hits_to_guaranteed_ko,
+                                    ko_probability_by_hits)
+from src.utils.data_service import data_service
+from src.utils.metrics import metrics
+from src.logger_file import logger
+
+damage_sim = None
+
+async def damage_calc(attacker_name: str, defender_name: str, move_name: Optional[str] = None) -> Dict[str, Any]:
+    """Exact damage range and hits-to-KO of the attacker's moves against the defender"""
+    global damage_sim
+
+    try:
+        if damage_sim is None:
+            damage_sim = BattleSimulator(await data_service.type_effectiveness())
+
+        attacker = await data_service.fetch_pokemon(attacker_name)
+        defender = await data_service.fetch_pokemon(defender_name)
+
+        # Same per-matchup base damage the battle turn loop uses
+        table = damage_sim.damage_table(BattleState(attacker), BattleState(defender))
+        if move_name is not None:
+            wanted = move_name.lower().strip()
+            table = [row for row in table if row[0].name.lower() == wanted]
+            if not table:
+                raise ValueError(f"{attacker.name} does not know {move_name}")
+
+        hp = defender.stats.hp
+        moves = []
+        started = time.perf_counter()
+        for move, effectiveness, base in table:
+            dist = damage_distribution(base)
+            moves.append({
+                "name": move.name,
+                "type": move.type,
+                "power": move.power,
+                "category": "physical" if move.type.lower() in PHYSICAL_TYPES else "special",
+                "effectiveness": effectiveness,
+                "stab": damage_sim.damage_calc.is_stab(attacker, move),
+                "base_damage": round(base, 3),
+                "min_damage": min(dist),
+                "max_damage": max(dist),
+                "expected_damage": round(expected_damage(dist), 3),
+                "distribution": {str(damage): round(p, 6) for damage, p in dist.items()},
+                "ko_probability_by_hits": [round(p, 6) for p in ko_probability_by_hits(dist, hp)],
+                "hits_to_guaranteed_ko": hits_to_guaranteed_ko(dist, hp)
+            })
+
+        metrics.observe("simulate.damage_calc", time.perf_counter() - started)
+        logger.info(f"Damage calc {attacker.name} -> {defender.name}: {len(moves)} moves")
+        return {
+            "attacker": attacker.name,
+            "defender": defender.name,
+            "defender_hp": hp,
+            "moves": moves
+        }
+
+    except Exception as e:
+        logger.error(f"Damage calculation failed for {attacker_name} vs {defender_name}: {e}")
+        return {
+            "error": f"Damage calculation failed: {str(e)}",
+            "attacker": attacker_name,
+            "defender": defender_name
+        }
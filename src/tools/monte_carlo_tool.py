@@ -0,0 +1,41 @@
+from typing import Any, Dict, Optional
+from src.utils.data_service import data_service
+from src.utils.metrics import metrics
+from src.utils.scheduler import cancel_event, offload
+from src.logger_file import logger
+
+MAX_BATTLES = 1_000_000
+
+monte_carlo_sim = None
+
+async def battle_monte_carlo(pokemon1_name: str, pokemon2_name: str, n_battles: int = 10000,
+                             seed: Optional[int] = None) -> Dict[str, Any]:
+    """Estimate win probability of a pairing from many simulated battles"""
+    global monte_carlo_sim
+
+    try:
+        if not 1 <= n_battles <= MAX_BATTLES:
+            raise ValueError(f"n_battles must be between 1 and {MAX_BATTLES}")
+
+        if monte_carlo_sim is None:
+            # Imported on first use: NumPy is the slowest import in the server
+            from src.utils.monte_carlo import MonteCarloBattleSimulator
+            monte_carlo_sim = MonteCarloBattleSimulator(await data_service.type_effectiveness())
+
+        pokemon1 = await data_service.fetch_pokemon(pokemon1_name)
+        pokemon2 = await data_service.fetch_pokemon(pokemon2_name)
+
+        # NumPy work runs on a thread so the stdio transport keeps serving requests
+        with metrics.timer("simulate.monte_carlo"):
+            result = await offload(monte_carlo_sim.simulate, pokemon1, pokemon2, n_battles, seed,
+                                   cancel=cancel_event())
+        logger.info(f"Monte Carlo {pokemon1.name} vs {pokemon2.name}: {n_battles} battles")
+        return result
+
+    except Exception as e:
+        logger.error(f"Monte Carlo simulation failed for {pokemon1_name} vs {pokemon2_name}: {e}")
+        return {
+            "error": f"Monte Carlo simulation failed: {str(e)}",
+            "pokemon1": pokemon1_name,
+            "pokemon2": pokemon2_name
+        }
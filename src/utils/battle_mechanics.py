@@ -1,11 +1,54 @@
 
 import random
-from typing import Dict, List, Tuple
-from src.models import Pokemon, Move, BattleResult
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from src.models import Pokemon, PokemonStats, Move, BattleResult
 from src.logger_file import logger
 
+# Type names interned to small integer ids (PokeAPI order). NO_TYPE fills the
+# second slot of single-typed Pokemon and stands in for unknown type names;
+# its row and column are neutral (1.0).
+TYPE_NAMES = [
+    "normal", "fighting", "flying", "poison", "ground", "rock", "bug", "ghost", "steel",
+    "fire", "water", "grass", "electric", "psychic", "ice", "dragon", "dark", "fairy"
+]
+TYPE_IDS = {name: i for i, name in enumerate(TYPE_NAMES)}
+NO_TYPE = len(TYPE_NAMES)
+
+# Battle log verbosity accepted by BattleSimulator.simulate_battle
+LOG_LEVELS = ("none", "summary", "full")
+
+# Moves of these types use attack/defense, every other type special attack/defense
+PHYSICAL_TYPES = frozenset(["normal", "fighting", "flying", "ground", "rock", "bug", "ghost", "poison", "steel"])
+STAB_MULTIPLIER = 1.5
+
+# Status bit flags carried in BattleState.status (and the Monte Carlo engine's status arrays)
+BURN = 1
+POISON = 2
+PARALYSIS = 4
+STATUS_FLAGS = (BURN, POISON, PARALYSIS)
+STATUS_NAMES = {BURN: "burn", POISON: "poison", PARALYSIS: "paralysis"}
+
+CRIT_CHANCE = 1 / 16
+# Damage is scaled by a uniform roll in [ROLL_MIN, ROLL_MAX)
+ROLL_MIN = 0.85
+ROLL_MAX = 1.0
+STATUS_CHANCE = 0.1
+FULL_PARALYSIS_CHANCE = 0.25
+
+def type_id(type_name: str) -> int:
+    """Integer id of a type name, NO_TYPE if it is not one of the 18 battle types"""
+    tid = TYPE_IDS.get(type_name)
+    if tid is None:
+        tid = TYPE_IDS.get(type_name.lower(), NO_TYPE)
+    return tid
+
+class BattleCancelled(Exception):
+    """Raised by the batched engines when their cancel flag is set between turns"""
+
+
 class TypeEffectiveness:
-    def __init__(self):
+    def __init__(self, type_chart: Dict[str, Dict[str, List[str]]] = None,
+                 matrix_rows: List[List[float]] = None):
         # Complete 18-type matchup chart for accurate Pokemon battles
         self.effectiveness_chart = {
             "normal":   {"rock": 0.5, "ghost": 0.0, "steel": 0.5},
@@ -29,26 +72,87 @@ class TypeEffectiveness:
             "fairy":    {"fighting": 2.0, "dragon": 2.0, "dark": 2.0, "fire": 0.5, "poison": 0.5, "steel": 0.5}
         }
 
+        # Dense (attacking, defending) matrix built once from the loaded PokeAPI
+        # chart, falling back to the table above for types the chart lacks.
+        # A startup snapshot passes the finished rows in directly.
+        if matrix_rows is None:
+            matrix_rows = [[1.0] * (NO_TYPE + 1) for _ in range(NO_TYPE + 1)]
+            for attacking_type, atk in TYPE_IDS.items():
+                relations = (type_chart or {}).get(attacking_type)
+                if relations:
+                    for key, multiplier in (("no_damage_to", 0.0), ("half_damage_to", 0.5), ("double_damage_to", 2.0)):
+                        for defending_type in relations.get(key, []):
+                            if defending_type in TYPE_IDS:
+                                matrix_rows[atk][TYPE_IDS[defending_type]] = multiplier
+                else:
+                    for defending_type, multiplier in self.effectiveness_chart[attacking_type].items():
+                        matrix_rows[atk][TYPE_IDS[defending_type]] = multiplier
+        self.matrix_rows = matrix_rows
+
+        # Dual-type multipliers as nested lists: _dual[attacking][defending1][defending2]
+        self._dual = [[[m1 * m2 for m2 in row] for m1 in row] for row in matrix_rows]
+        self._matrix = None
+
+    @property
+    def matrix(self):
+        """(attacking, defending) multipliers as a NumPy array, for the vectorized engines"""
+        if self._matrix is None:
+            # NumPy is only needed by the batch engines, so it is not imported at startup
+            import numpy as np
+            self._matrix = np.array(self.matrix_rows, dtype=np.float64)
+        return self._matrix
+
+    @property
+    def dual_matrix(self):
+        """Dual-type multipliers: dual_matrix[attacking, defending1, defending2]"""
+        return self.matrix[:, :, None] * self.matrix[:, None, :]
+
+    @staticmethod
+    def defender_ids(defending_types: List[str]) -> Tuple[int, int]:
+        """Pad a Pokemon's types to the (type1, type2) id pair used to index dual_matrix"""
+        ids = [type_id(t) for t in defending_types[:2]] + [NO_TYPE, NO_TYPE]
+        return ids[0], ids[1]
+
+    def effectiveness_by_id(self, attacking_id: int, defending_ids: Tuple[int, int]) -> float:
+        return self._dual[attacking_id][defending_ids[0]][defending_ids[1]]
+
     def get_effectiveness(self, attacking_type: str, defending_types: List[str]) -> float:
-        multiplier = 1.0
-        attacking_type = attacking_type.lower()
-        
-        for defending_type in defending_types:
-            defending_type = defending_type.lower()
-            type_multiplier = self.effectiveness_chart.get(attacking_type, {}).get(defending_type, 1.0)
-            multiplier *= type_multiplier
-            
+        multiplier = self.effectiveness_by_id(type_id(attacking_type), self.defender_ids(defending_types))
+        for defending_type in defending_types[2:]:
+            multiplier *= self._dual[type_id(attacking_type)][type_id(defending_type)][NO_TYPE]
         return multiplier
 
 class DamageCalculator:
     @staticmethod
-    def calculate_damage(attacker: Pokemon, defender: Pokemon, move: Move, effectiveness: float) -> int:
+    def calculate_damage(attacker: Pokemon, defender: Pokemon, move: Move, effectiveness: float,
+                         rng: random.Random = random) -> int:
         """Calculate damage using official Pokemon damage formula"""
-        level = 50  # Standard competitive battle level
+        base_damage = DamageCalculator.base_damage(attacker, defender, move, effectiveness)
+        return DamageCalculator.roll_damage(base_damage, rng)
+
+    @staticmethod
+    def roll_damage(base_damage: float, rng: random.Random = random) -> int:
+        """Apply the critical hit and random roll to a precomputed base_damage"""
+        # Critical hit calculation (1/16 chance for 2x damage)
+        critical = 2.0 if rng.random() < CRIT_CHANCE else 1.0
+        base_damage *= critical
         
-        physical_types = ["normal", "fighting", "flying", "ground", "rock", "bug", "ghost", "poison", "steel"]
+        # Random factor (85-100% of calculated damage)
+        random_factor = rng.uniform(ROLL_MIN, ROLL_MAX)
+        base_damage *= random_factor
         
-        if move.type.lower() in physical_types:
+        return max(1, int(base_damage))
+
+    @staticmethod
+    def base_damage(attacker: Pokemon, defender: Pokemon, move: Move, effectiveness: float) -> float:
+        """Deterministic part of the damage formula, before the critical hit and random roll.
+
+        Works on a Pokemon (base stats) or a BattleState (effective stats).
+        """
+        level = 50  # Standard competitive battle level
+        move_type = move.type.lower()
+        
+        if move_type in PHYSICAL_TYPES:
             attack_stat = attacker.stats.attack
             defense_stat = defender.stats.defense
         else:
@@ -61,248 +165,259 @@ class DamageCalculator:
         base_damage *= effectiveness
         
         # STAB (Same Type Attack Bonus) - 50% bonus for matching types
-        if move.type.lower() in [t.lower() for t in attacker.types]:
-            base_damage *= 1.5
-            
-        # Critical hit calculation (1/16 chance for 2x damage)
-        critical = 2.0 if random.random() < (1/16) else 1.0
-        base_damage *= critical
-        
-        # Random factor (85-100% of calculated damage)
-        random_factor = random.uniform(0.85, 1.0)
-        base_damage *= random_factor
-        
-        return max(1, int(base_damage))
+        if DamageCalculator.is_stab(attacker, move):
+            base_damage *= STAB_MULTIPLIER
+
+        return base_damage
+
+    @staticmethod
+    def is_stab(attacker: Pokemon, move: Move) -> bool:
+        """Same Type Attack Bonus: the move shares a type with its user"""
+        move_type = move.type.lower()
+        return any(move_type == t.lower() for t in attacker.types)
+
+class BattleState:
+    """One combatant's state for a single battle.
+
+    Effective stats start as a copy of the base stats and are changed once, when
+    a status is inflicted (burn halves attack, paralysis quarters speed), so damage
+    and turn order read them directly. Status is a bit set of BURN/POISON/PARALYSIS.
+    """
+    __slots__ = ("pokemon", "name", "types", "stats", "max_hp", "current_hp", "status", "move_damage")
+
+    def __init__(self, pokemon: Pokemon):
+        self.pokemon = pokemon
+        self.name = pokemon.name
+        self.types = pokemon.types
+        base = pokemon.stats
+        self.stats = PokemonStats(base.hp, base.attack, base.defense, base.special_attack,
+                                  base.special_defense, base.speed)
+        self.max_hp = pokemon.stats.hp
+        self.current_hp = pokemon.stats.hp
+        self.status = 0
+        # (move, effectiveness, base damage) against the current opponent, see BattleSimulator.damage_table
+        self.move_damage: List[Tuple[Move, float, float]] = []
+
+    def has_status(self, flag: int) -> bool:
+        return bool(self.status & flag)
+
+    def inflict(self, flag: int) -> bool:
+        """Add a status and apply its stat modifier; False if it was already present"""
+        if self.status & flag:
+            return False
+        self.status |= flag
+        if flag == BURN:
+            self.stats.attack = max(1, self.stats.attack // 2)
+        elif flag == PARALYSIS:
+            self.stats.speed = max(1, self.stats.speed // 4)
+        return True
 
 class StatusEffectManager:
     """Handles the three required status effects: Burn, Paralysis, and Poison"""
-    def __init__(self):
-        self.turn_counter = 0
-        self.first_attacker_immunity = True
+    def __init__(self, rng: random.Random = None):
+        self.rng = rng or random
     
-    def apply_burn(self, pokemon_data: dict) -> str:
-        """Apply burn status - reduces attack and causes end-of-turn damage"""
-        if not pokemon_data.get("_burned_applied"):
-            # Halve physical attack stat
-            pokemon_data["stats"]["attack"] = max(1, pokemon_data["stats"]["attack"] // 2)
-            pokemon_data["_burned_applied"] = True
-        
-        # End-of-turn burn damage (1/16 of max HP)
-        burn_damage = max(1, pokemon_data["max_hp"] // 16)
-        pokemon_data["current_hp"] = max(0, pokemon_data["current_hp"] - burn_damage)
-        return f"{pokemon_data['name']} is hurt by its burn! (-{burn_damage} HP)"
-
-    def apply_paralysis(self, pokemon_data: dict, is_first_attacker: bool = False) -> str:
-        """Apply paralysis - reduces speed and 25% chance to skip turn"""
-        if self.turn_counter == 0 and is_first_attacker and self.first_attacker_immunity:
-            self.first_attacker_immunity = False  # Use immunity once
-            return None
-        if not pokemon_data.get("_paralyzed_applied"):
-            # Quarter the speed stat
-            pokemon_data["stats"]["speed"] = max(1, pokemon_data["stats"]["speed"] // 4)
-            pokemon_data["_paralyzed_applied"] = True
-        
-        # 25% chance to be fully paralyzed
-        if random.random() < 0.25:
-            return f"{pokemon_data['name']} is fully paralyzed and can't move!"
-        return None
-    
-    def next_turn(self):
-        """Advance to next turn"""
-        self.turn_counter += 1
+    def apply_burn(self, state: BattleState) -> str:
+        """End-of-turn burn damage (1/16 of max HP); the attack drop is applied by BattleState.inflict"""
+        burn_damage = max(1, state.max_hp // 16)
+        state.current_hp = max(0, state.current_hp - burn_damage)
+        return f"{state.name} is hurt by its burn! (-{burn_damage} HP)"
+
+    def is_fully_paralyzed(self, state: BattleState) -> bool:
+        """25% chance that a paralyzed Pokemon loses its turn"""
+        return state.has_status(PARALYSIS) and self.rng.random() < FULL_PARALYSIS_CHANCE
 
-    def apply_poison(self, pokemon_data: dict) -> str:
+    def apply_poison(self, state: BattleState) -> str:
         # Poison damage (1/8 of max HP)
-        poison_damage = max(1, pokemon_data["max_hp"] // 8)
-        pokemon_data["current_hp"] = max(0, pokemon_data["current_hp"] - poison_damage)
-        return f"{pokemon_data['name']} is hurt by poison! (-{poison_damage} HP)"
+        poison_damage = max(1, state.max_hp // 8)
+        state.current_hp = max(0, state.current_hp - poison_damage)
+        return f"{state.name} is hurt by poison! (-{poison_damage} HP)"
 
 class BattleSimulator:
     def __init__(self, type_effectiveness: Dict[str, Dict[str, float]] = None):
-        self.type_chart = TypeEffectiveness()
+        # Accepts a PokeAPI chart, or an already built (shared) TypeEffectiveness
+        if isinstance(type_effectiveness, TypeEffectiveness):
+            self.type_chart = type_effectiveness
+        else:
+            self.type_chart = TypeEffectiveness(type_effectiveness)
         self.damage_calc = DamageCalculator()
-        self.status_manager = StatusEffectManager()
+        # Damage tables only depend on the two Pokemon and the attacker's attack stat,
+        # so repeated battles of a pairing reuse them
+        self._damage_tables: Dict[Tuple[int, int, int], Tuple[Pokemon, Pokemon, List]] = {}
 
-    def determine_turn_order(self, pokemon1: Pokemon, pokemon2: Pokemon) -> Tuple[Pokemon, Pokemon]:
-        """Determine who goes first based on speed stats"""
+    def determine_turn_order(self, pokemon1: BattleState, pokemon2: BattleState,
+                             rng: random.Random = random) -> Tuple[BattleState, BattleState]:
+        """Determine who goes first based on (effective) speed stats"""
         if pokemon1.stats.speed > pokemon2.stats.speed:
             return pokemon1, pokemon2
         elif pokemon2.stats.speed > pokemon1.stats.speed:
             return pokemon2, pokemon1
         else:
             # Speed tie - random determination
-            return (pokemon1, pokemon2) if random.random() < 0.5 else (pokemon2, pokemon1)
-
-    def _convert_to_battle_format(self, pokemon: Pokemon) -> dict:
-        """Convert Pokemon object to battle-ready dictionary format"""
-        return {
-            "name": pokemon.name,
-            "types": pokemon.types,
-            "stats": {
-                "hp": pokemon.stats.hp,
-                "attack": pokemon.stats.attack,
-                "defense": pokemon.stats.defense,
-                "special_attack": pokemon.stats.special_attack,
-                "special_defense": pokemon.stats.special_defense,
-                "speed": pokemon.stats.speed
-            },
-            "moves": [{"name": move.name, "type": move.type, "power": move.power} for move in pokemon.moves],
-            "current_hp": pokemon.stats.hp,
-            "max_hp": pokemon.stats.hp,
-            "status_effects": []
-        }
+            return (pokemon1, pokemon2) if rng.random() < 0.5 else (pokemon2, pokemon1)
 
-    async def simulate_battle(self, pokemon1: Pokemon, pokemon2: Pokemon) -> BattleResult:
-        """Simulate a complete Pokemon battle with detailed mechanics"""
-        # Convert to battle format
-        p1_data = self._convert_to_battle_format(pokemon1)
-        p2_data = self._convert_to_battle_format(pokemon2)
+    def damage_table(self, attacker: BattleState, defender: BattleState) -> List[Tuple[Move, float, float]]:
+        """Effectiveness and pre-roll damage of each move at the attacker's current stats"""
+        key = (id(attacker.pokemon), id(defender.pokemon), attacker.stats.attack)
+        cached = self._damage_tables.get(key)
+        # The cached entry holds both Pokemon, so their ids cannot be reused while it exists
+        if cached is not None and cached[0] is attacker.pokemon and cached[1] is defender.pokemon:
+            return cached[2]
+
+        defender_ids = self.type_chart.defender_ids(defender.types)
+        table = []
+        for move in attacker.pokemon.moves:
+            effectiveness = self.type_chart.effectiveness_by_id(type_id(move.type), defender_ids)
+            table.append((move, effectiveness, self.damage_calc.base_damage(attacker, defender, move, effectiveness)))
+        if len(self._damage_tables) >= 4096:
+            self._damage_tables.clear()
+        self._damage_tables[key] = (attacker.pokemon, defender.pokemon, table)
+        return table
+
+    async def simulate_battle(self, pokemon1: Pokemon, pokemon2: Pokemon, log_level: str = "full",
+                              on_turn: Optional[Callable[[int, List[str]], Awaitable[None]]] = None,
+                              seed: Optional[int] = None) -> BattleResult:
+        """Simulate a complete Pokemon battle with detailed mechanics
+
+        log_level: "full" keeps the turn-by-turn narrative, "summary" only the
+        introduction and the outcome, "none" builds no log at all.
+        on_turn: awaited after every turn with that turn's log lines, for streaming.
+        seed: seeds this battle's own RNG; the same seed replays the same battle.
+        """
+        if log_level not in LOG_LEVELS:
+            raise ValueError(f"log_level must be one of {', '.join(LOG_LEVELS)}")
+        if seed is None:
+            seed = random.getrandbits(32)
+        # Each battle owns its RNG and status state, so battles never affect each other
+        rng = random.Random(seed)
+        status_manager = StatusEffectManager(rng)
+        full_log = log_level == "full"
+        # Per-turn lines are only built when someone reads them
+        narrate = full_log or on_turn is not None
+
+        p1 = BattleState(pokemon1)
+        p2 = BattleState(pokemon2)
+        p1.move_damage = self.damage_table(p1, p2)
+        p2.move_damage = self.damage_table(p2, p1)
         
         battle_log = []
         turn = 1
         max_turns = 100
 
         # Battle introduction
-        battle_log.append(f"🔥 POKEMON BATTLE BEGINS! 🔥")
-        battle_log.append(f"{pokemon1.name} vs {pokemon2.name}")
-        battle_log.append(f"{pokemon1.name}: {p1_data['current_hp']} HP | Types: {', '.join(pokemon1.types)}")
-        battle_log.append(f"{pokemon2.name}: {p2_data['current_hp']} HP | Types: {', '.join(pokemon2.types)}")
-        battle_log.append("")
+        if log_level != "none":
+            battle_log.append(f"🔥 POKEMON BATTLE BEGINS! 🔥")
+            battle_log.append(f"{pokemon1.name} vs {pokemon2.name}")
+            battle_log.append(f"{pokemon1.name}: {p1.current_hp} HP | Types: {', '.join(pokemon1.types)}")
+            battle_log.append(f"{pokemon2.name}: {p2.current_hp} HP | Types: {', '.join(pokemon2.types)}")
+            battle_log.append("")
 
         # Main battle loop
-        while p1_data["current_hp"] > 0 and p2_data["current_hp"] > 0 and turn <= max_turns:
-            battle_log.append(f"--- TURN {turn} ---")
+        while p1.current_hp > 0 and p2.current_hp > 0 and turn <= max_turns:
+            turn_log = [f"--- TURN {turn} ---"] if narrate else None
             
-            # Determine turn order based on speed
-            first, second = self.determine_turn_order(pokemon1, pokemon2)
-            first_data = p1_data if first == pokemon1 else p2_data
-            second_data = p2_data if first == pokemon1 else p1_data
+            # Determine turn order based on effective speed
+            first, second = self.determine_turn_order(p1, p2, rng)
             
-            # First Pokemon's turn
-            if first_data["current_hp"] > 0:
-                # Check for paralysis
-                is_first_attacker = (turn == 1)
-                paralysis_msg = self.status_manager.apply_paralysis(first_data, is_first_attacker)
-                if paralysis_msg and "can't move" in paralysis_msg:
-                    battle_log.append(paralysis_msg)
-                else:
-                    if paralysis_msg:
-                        battle_log.append(f"{first_data['name']} is paralyzed but manages to attack!")
-                    
-                    # Execute attack
-                    second_data, attack_log = self._execute_attack(first_data, second_data, first, second)
-                    battle_log.extend(attack_log)
-            
-            # Second Pokemon's turn (if still alive)
-            if second_data["current_hp"] > 0:
-                # Check for paralysis
-                paralysis_msg = self.status_manager.apply_paralysis(second_data)
-                if paralysis_msg and "can't move" in paralysis_msg:
-                    battle_log.append(paralysis_msg)
-                else:
-                    if paralysis_msg:
-                        battle_log.append(f"{second_data['name']} is paralyzed but manages to attack!")
-                    
-                    # Execute attack
-                    first_data, attack_log = self._execute_attack(second_data, first_data, second, first)
-                    battle_log.extend(attack_log)
-
-            # Apply end-of-turn status effects
+            for attacker, defender in ((first, second), (second, first)):
+                # The second Pokemon only moves if the first one did not knock it out
+                if attacker.current_hp <= 0:
+                    continue
+                if status_manager.is_fully_paralyzed(attacker):
+                    if narrate:
+                        turn_log.append(f"{attacker.name} is fully paralyzed and can't move!")
+                    continue
+                attack_log = self._execute_attack(attacker, defender, rng, narrate)
+                if narrate:
+                    turn_log.extend(attack_log)
+
+            # Apply end-of-turn status effects: burn, then poison
             status_messages = []
+            for flag, apply in ((BURN, status_manager.apply_burn), (POISON, status_manager.apply_poison)):
+                for state in (p1, p2):
+                    if state.status & flag:
+                        status_messages.append(apply(state))
             
-            # Apply burn damage
-            if "burn" in p1_data.get("status_effects", []):
-                burn_msg = self.status_manager.apply_burn(p1_data)
-                status_messages.append(burn_msg)
-            
-            if "burn" in p2_data.get("status_effects", []):
-                burn_msg = self.status_manager.apply_burn(p2_data)
-                status_messages.append(burn_msg)
-            
-            # Apply poison damage
-            if "poison" in p1_data.get("status_effects", []):
-                poison_msg = self.status_manager.apply_poison(p1_data)
-                status_messages.append(poison_msg)
-                
-            if "poison" in p2_data.get("status_effects", []):
-                poison_msg = self.status_manager.apply_poison(p2_data)
-                status_messages.append(poison_msg)
-            
-            battle_log.extend(status_messages)
-            
-            # Turn summary
-            battle_log.append(f"{pokemon1.name}: {p1_data['current_hp']}/{p1_data['max_hp']} HP")
-            battle_log.append(f"{pokemon2.name}: {p2_data['current_hp']}/{p2_data['max_hp']} HP")
-            battle_log.append("")
+            if narrate:
+                turn_log.extend(status_messages)
+
+                # Turn summary
+                turn_log.append(f"{pokemon1.name}: {p1.current_hp}/{p1.max_hp} HP")
+                turn_log.append(f"{pokemon2.name}: {p2.current_hp}/{p2.max_hp} HP")
+                turn_log.append("")
+                if full_log:
+                    battle_log.extend(turn_log)
+                if on_turn is not None:
+                    await on_turn(turn, turn_log)
             
-            self.status_manager.next_turn()
             turn += 1
 
         # Determine battle outcome
-        if p1_data["current_hp"] <= 0:
+        if p1.current_hp <= 0:
             winner, loser = pokemon2.name, pokemon1.name
-            battle_log.append(f"💀 {pokemon1.name} fainted!")
-            battle_log.append(f"🏆 {pokemon2.name} wins the battle!")
-        elif p2_data["current_hp"] <= 0:
+            outcome_log = [f"💀 {pokemon1.name} fainted!", f"🏆 {pokemon2.name} wins the battle!"]
+        elif p2.current_hp <= 0:
             winner, loser = pokemon1.name, pokemon2.name
-            battle_log.append(f"💀 {pokemon2.name} fainted!")
-            battle_log.append(f"🏆 {pokemon1.name} wins the battle!")
+            outcome_log = [f"💀 {pokemon2.name} fainted!", f"🏆 {pokemon1.name} wins the battle!"]
         else:
             # Battle ended due to turn limit
-            if p1_data["current_hp"] > p2_data["current_hp"]:
+            if p1.current_hp > p2.current_hp:
                 winner, loser = pokemon1.name, pokemon2.name
             else:
                 winner, loser = pokemon2.name, pokemon1.name
-            battle_log.append(f"⏰ Battle ended after {turn-1} turns!")
-            battle_log.append(f"🏆 {winner} wins by remaining HP!")
+            outcome_log = [f"⏰ Battle ended after {turn-1} turns!", f"🏆 {winner} wins by remaining HP!"]
+        if log_level != "none":
+            battle_log.extend(outcome_log)
 
         return BattleResult(
             winner=winner,
             loser=loser,
             battle_log=battle_log,
             total_turns=turn-1,
-            pokemon1_final_hp=max(0, p1_data["current_hp"]),
-            pokemon2_final_hp=max(0, p2_data["current_hp"])
+            pokemon1_final_hp=max(0, p1.current_hp),
+            pokemon2_final_hp=max(0, p2.current_hp),
+            seed=seed
         )
 
-    def _execute_attack(self, attacker_data: dict, defender_data: dict, 
-                       attacker: Pokemon, defender: Pokemon) -> Tuple[dict, List[str]]:
-        """Execute a single attack with detailed logging"""
-        if not attacker_data.get('moves') or not attacker.moves:
-            return defender_data, [f"{attacker_data['name']} has no moves to use!"]
+    def _execute_attack(self, attacker: BattleState, defender: BattleState, rng: random.Random = random,
+                        narrate: bool = True) -> List[str]:
+        """Execute a single attack, with detailed logging when `narrate` is set"""
+        if not attacker.move_damage:
+            return [f"{attacker.name} has no moves to use!"] if narrate else []
             
         # Choose a random move
-        move = random.choice(attacker.moves)
-        move_dict = {"name": move.name, "type": move.type, "power": move.power}
-        
-        log = [f"{attacker_data['name']} uses {move.name}!"]
-        
-        # Calculate type effectiveness
-        effectiveness = self.type_chart.get_effectiveness(move.type, defender.types)
+        move, effectiveness, base_damage = rng.choice(attacker.move_damage)
         
-        # Calculate damage
-        damage = self.damage_calc.calculate_damage(attacker, defender, move, effectiveness)
+        log = [f"{attacker.name} uses {move.name}!"] if narrate else []
         
-        # Apply damage
-        defender_data["current_hp"] = max(0, defender_data["current_hp"] - damage)
+        # Roll damage from the precomputed base and apply it
+        damage = self.damage_calc.roll_damage(base_damage, rng)
+        defender.current_hp = max(0, defender.current_hp - damage)
         
         # Add effectiveness messages
         if effectiveness > 1.5:
-            log.append("It's super effective!")
+            if narrate:
+                log.append("It's super effective!")
         elif effectiveness < 0.75:
-            log.append("It's not very effective...")
+            if narrate:
+                log.append("It's not very effective...")
         elif effectiveness == 0.0:
-            log.append("It doesn't affect the opponent!")
+            if narrate:
+                log.append("It doesn't affect the opponent!")
             damage = 0
             
         if damage > 0:
-            log.append(f"⚡ {defender_data['name']} takes {damage} damage!")
+            if narrate:
+                log.append(f"⚡ {defender.name} takes {damage} damage!")
             
             # Random chance to inflict status effects (10% each)
-            if random.random() < 0.1:
-                status_effect = random.choice(["burn", "poison", "paralysis"])
-                if status_effect not in defender_data.get("status_effects", []):
-                    defender_data.setdefault("status_effects", []).append(status_effect)
-                    log.append(f"🔥 {defender_data['name']} is now {status_effect}ed!")
+            if rng.random() < STATUS_CHANCE:
+                flag = rng.choice(STATUS_FLAGS)
+                if defender.inflict(flag):
+                    if flag == BURN:
+                        # Halved attack: the burned Pokemon's moves hit softer from now on
+                        defender.move_damage = self.damage_table(defender, attacker)
+                    if narrate:
+                        log.append(f"🔥 {defender.name} is now {STATUS_NAMES[flag]}ed!")
         
-        return defender_data, log
+        return log
@@ -0,0 +1,231 @@
+import threading
+import numpy as np
+from typing import Any, Dict, List, Optional, Tuple
+from src.models import Pokemon
+from src.utils.battle_mechanics import (BURN, FULL_PARALYSIS_CHANCE, PARALYSIS, POISON, STATUS_CHANCE, STATUS_FLAGS,
+                                        BattleCancelled, BattleState, DamageCalculator, TypeEffectiveness, type_id)
+from src.utils.damage_range import damage_distribution
+
+# Every combination of the BURN/POISON/PARALYSIS bits
+N_STATUS = 8
+# Largest (status1, status2, hp1, hp2) space solved exactly; bigger pairings fall back to sampling
+MAX_STATES = 2_000_000
+# The solver stops once the unresolved probability drops below this; it is reported as pruned_probability
+TOLERANCE = 1e-12
+
+# Attacker statuses without and with BURN, which pick the HP transition matrix
+_BY_BURN = (np.array([s for s in range(N_STATUS) if not s & BURN]), np.array([s for s in range(N_STATUS) if s & BURN]))
+# Probability that an attacker with a given status gets to move
+_ACTS = np.array([1.0 - FULL_PARALYSIS_CHANCE if s & PARALYSIS else 1.0 for s in range(N_STATUS)])
+# Defender status before -> after a hit: _INFLICT[s, t]
+_INFLICT = np.zeros((N_STATUS, N_STATUS))
+for _status in range(N_STATUS):
+    _INFLICT[_status, _status] += 1.0 - STATUS_CHANCE
+    for _flag in STATUS_FLAGS:
+        _INFLICT[_status, _status | _flag] += STATUS_CHANCE / len(STATUS_FLAGS)
+
+
+class StateSpaceTooLarge(Exception):
+    """Raised for pairings whose state space exceeds the solver's max_states"""
+
+
+class _Transitions:
+    """Per-pairing tables: one attack's HP transition matrix per side and burn state, and end-of-turn chip damage"""
+
+    def __init__(self, type_chart: TypeEffectiveness, pokemon: Tuple[Pokemon, Pokemon]):
+        self.max_hp = tuple(p.stats.hp for p in pokemon)
+        # hp[side][side's hp] after one hit from the other side: attack[side][burned] is (H+1, H+1)
+        self.attack: List[Optional[Tuple[np.ndarray, np.ndarray]]] = []
+        for side in (0, 1):
+            if not pokemon[side].moves:
+                self.attack.append(None)
+                continue
+            attacker, defender = BattleState(pokemon[side]), BattleState(pokemon[1 - side])
+            burned = BattleState(pokemon[side])
+            burned.inflict(BURN)
+            self.attack.append(tuple(self._hp_matrix(self._attack_damage(type_chart, state, defender),
+                                                     self.max_hp[1 - side])
+                                     for state in (attacker, burned)))
+
+        # Effective speed by status: order[s1, s2] is the probability that pokemon1 moves first
+        speed = [[max(1, p.stats.speed // 4) if s & PARALYSIS else p.stats.speed for s in range(N_STATUS)]
+                 for p in pokemon]
+        v1 = np.array(speed[0], dtype=np.float64)[:, None]
+        v2 = np.array(speed[1], dtype=np.float64)[None, :]
+        self.order = np.where(v1 > v2, 1.0, np.where(v2 > v1, 0.0, 0.5))
+
+        # End-of-turn burn plus poison damage by status, per side
+        self.chip = [[(max(1, hp // 16) if s & BURN else 0) + (max(1, hp // 8) if s & POISON else 0)
+                      for s in range(N_STATUS)] for hp in self.max_hp]
+
+    @staticmethod
+    def _attack_damage(type_chart: TypeEffectiveness, attacker: BattleState,
+                       defender: BattleState) -> Dict[int, float]:
+        """Damage of one attack over the uniform move choice, crits and rolls"""
+        defender_ids = type_chart.defender_ids(defender.types)
+        moves = attacker.pokemon.moves
+        combined: Dict[int, float] = {}
+        for move in moves:
+            effectiveness = type_chart.effectiveness_by_id(type_id(move.type), defender_ids)
+            base = DamageCalculator.base_damage(attacker, defender, move, effectiveness)
+            for damage, p in damage_distribution(base).items():
+                combined[damage] = combined.get(damage, 0.0) + p / len(moves)
+        return combined
+
+    @staticmethod
+    def _hp_matrix(damage: Dict[int, float], max_hp: int) -> np.ndarray:
+        matrix = np.zeros((max_hp + 1, max_hp + 1), dtype=np.float64)
+        hp = np.arange(max_hp + 1)
+        for dealt, p in damage.items():
+            np.add.at(matrix, (hp, np.maximum(0, hp - dealt)), p)
+        return matrix
+
+
+class BattleOddsSolver:
+    """Exact outcome probabilities of BattleSimulator.simulate_battle for one pairing.
+
+    The battle is a Markov chain over (status1, status2, hp1, hp2). The solver
+    holds that distribution as a dense array and pushes it forward one turn at a
+    time, up to `max_turns`, with the simulator's rules: speed order with 50/50
+    ties, the full-paralysis check, a uniformly chosen move with the exact
+    roll/crit damage distribution, 10% status infliction and end-of-turn burn and
+    poison. Each attack is a product with a precomputed HP transition matrix;
+    those tables are memoized per pairing.
+
+    Battles that reach the turn limit with equal HP are reported as draws, apart
+    from either side's wins, so win1 + win2 + draw + pruned is 1. The simulator
+    names pokemon2 the winner of such a draw.
+    """
+
+    def __init__(self, type_chart: TypeEffectiveness = None, max_turns: int = 100, max_states: int = MAX_STATES,
+                 tolerance: float = TOLERANCE):
+        self.type_chart = type_chart or TypeEffectiveness()
+        self.max_turns = max_turns
+        self.max_states = max_states
+        self.tolerance = tolerance
+        self._transitions: Dict[Tuple[int, int], Tuple[Pokemon, Pokemon, _Transitions]] = {}
+
+    def state_count(self, pokemon1: Pokemon, pokemon2: Pokemon) -> int:
+        return N_STATUS * N_STATUS * (pokemon1.stats.hp + 1) * (pokemon2.stats.hp + 1)
+
+    def transitions(self, pokemon1: Pokemon, pokemon2: Pokemon) -> _Transitions:
+        key = (id(pokemon1), id(pokemon2))
+        cached = self._transitions.get(key)
+        # The cached entry holds both Pokemon, so their ids cannot be reused while it exists
+        if cached is not None and cached[0] is pokemon1 and cached[1] is pokemon2:
+            return cached[2]
+        tables = _Transitions(self.type_chart, (pokemon1, pokemon2))
+        if len(self._transitions) >= 256:
+            self._transitions.clear()
+        self._transitions[key] = (pokemon1, pokemon2, tables)
+        return tables
+
+    def _attack(self, dist: np.ndarray, hp_matrices: Optional[Tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
+        """One attack on dist[attacker status, defender status, attacker hp, defender hp]"""
+        if hp_matrices is None:
+            return dist
+        out = dist * (1.0 - _ACTS)[:, None, None, None]
+        # Only attacker statuses that hold probability (few early on, or after the turn-order split)
+        occupied = dist.reshape(N_STATUS, -1).any(axis=1)
+        for burned, statuses in enumerate(_BY_BURN):
+            statuses = statuses[occupied[statuses]]
+            if not len(statuses):
+                continue
+            block = dist[statuses]
+            hit = (block.reshape(-1, block.shape[-1]) @ hp_matrices[burned]).reshape(block.shape)
+            hit *= _ACTS[statuses, None, None, None]
+            # Every hit deals at least 1 damage, so every hit rolls for a status on the defender
+            out[statuses] += np.matmul(hit.transpose(0, 2, 3, 1), _INFLICT).transpose(0, 3, 1, 2)
+        return out
+
+    @staticmethod
+    def _chip(dist: np.ndarray, chip: List[int]):
+        """End-of-turn damage, in place, on the hp axis of the side indexed first"""
+        for s, amount in enumerate(chip):
+            if not amount:
+                continue
+            block = dist[s]
+            size = block.shape[1]
+            fainted = block[:, :amount + 1].sum(axis=1)
+            if amount + 1 < size:
+                block[:, 1:size - amount] = block[:, amount + 1:]
+            block[:, max(1, size - amount):] = 0.0
+            block[:, 0] = fainted
+
+    def solve(self, pokemon1: Pokemon, pokemon2: Pokemon, cancel: Optional[threading.Event] = None) -> Dict[str, Any]:
+        """Win and draw probabilities and expected turns; raises StateSpaceTooLarge past
+        max_states and BattleCancelled once `cancel` is set"""
+        states = self.state_count(pokemon1, pokemon2)
+        if states > self.max_states:
+            raise StateSpaceTooLarge(f"{states} states (limit {self.max_states})")
+        tables = self.transitions(pokemon1, pokemon2)
+        hp1, hp2 = tables.max_hp
+
+        # dist[status1, status2, hp1, hp2]; swapped() views it from pokemon2's side
+        live = np.zeros((N_STATUS, N_STATUS, hp1 + 1, hp2 + 1), dtype=np.float64)
+        live[0, 0, hp1, hp2] = 1.0
+
+        def swapped(dist: np.ndarray) -> np.ndarray:
+            return dist.transpose(1, 0, 3, 2)
+
+        p1_wins = p2_wins = expected_turns = pruned = 0.0
+        turn = 0
+        while turn < self.max_turns:
+            if cancel is not None and cancel.is_set():
+                raise BattleCancelled(f"{pokemon1.name} vs {pokemon2.name} cancelled after {turn} turns")
+            turn += 1
+
+            # pokemon1 moves first; pokemon2 answers unless it was knocked out
+            first = self._attack(live * tables.order[:, :, None, None], tables.attack[0])
+            knocked_out = first[:, :, :, 0].copy()
+            first[:, :, :, 0] = 0.0
+            first = swapped(self._attack(swapped(first), tables.attack[1]))
+            first[:, :, :, 0] += knocked_out
+
+            # pokemon2 moves first
+            second = swapped(self._attack(swapped(live * (1.0 - tables.order)[:, :, None, None]), tables.attack[1]))
+            knocked_out = second[:, :, 0, :].copy()
+            second[:, :, 0, :] = 0.0
+            second = self._attack(second, tables.attack[0])
+            second[:, :, 0, :] += knocked_out
+
+            # End of turn: burn and poison, then the faint check (pokemon1 fainting loses, even on a double KO)
+            live = np.ascontiguousarray(first + second)
+            self._chip(live, tables.chip[0])
+            self._chip(swapped(live), tables.chip[1])
+            lost = live[:, :, 0, :].sum()
+            live[:, :, 0, :] = 0.0
+            won = live[:, :, :, 0].sum()
+            live[:, :, :, 0] = 0.0
+            p2_wins += lost
+            p1_wins += won
+            expected_turns += (lost + won) * turn
+
+            remaining = live.sum()
+            if remaining < self.tolerance:
+                pruned = remaining
+                break
+
+        # Turn limit: higher HP wins, equal HP is a draw (kept out of both win probabilities)
+        timed_out = draws = 0.0
+        if not pruned:
+            by_hp = live.sum(axis=(0, 1))
+            hp_diff = np.arange(hp1 + 1)[:, None] - np.arange(hp2 + 1)[None, :]
+            timed_out = float(by_hp.sum())
+            draws = float(by_hp[hp_diff == 0].sum())
+            p1_wins += float(by_hp[hp_diff > 0].sum())
+            p2_wins += float(by_hp[hp_diff < 0].sum())
+            expected_turns += timed_out * turn
+
+        return {
+            "pokemon1": pokemon1.name,
+            "pokemon2": pokemon2.name,
+            "method": "exact",
+            "win_probability": {"pokemon1": float(p1_wins), "pokemon2": float(p2_wins)},
+            "turn_limit_probability": timed_out,
+            "draw_probability": draws,
+            "pruned_probability": float(pruned),
+            "expected_turns": float(expected_turns),
+            "turns_solved": turn,
+            "states": states
+        }
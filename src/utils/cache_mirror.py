@@ -0,0 +1,132 @@
+import json
+import os
+import threading
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+from src.utils.cache_records import RECORD_SUFFIX, entry_path, read_entry
+
+API_PREFIX = "/api/v2/"
+
+
+def cache_key_for(endpoint: str) -> Optional[str]:
+    """Map a PokeAPI endpoint to the cache key PokemonDataLoader stores it under"""
+    parts = [p for p in endpoint.strip("/").split("/") if p]
+    if parts == ["type"]:
+        return "all_types"
+    if parts == ["pokemon"]:
+        return "pokemon_list"
+    if len(parts) == 2 and all(".." not in p for p in parts):
+        return f"{parts[0]}_{parts[1]}"
+    return None
+
+
+class CacheMirrorServer:
+    """Serves populated cache directories as a PokeAPI-compatible HTTP endpoint.
+
+    Runs on a background thread; point `PokemonDataLoader.base_url` at `base_url`
+    to fetch from it instead of pokeapi.co.
+    """
+
+    def __init__(self, cache_dirs: List[str], host: str = "127.0.0.1", port: int = 0):
+        self.cache_dirs = cache_dirs
+        mirror = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                mirror._serve(self)
+
+            def log_message(self, format, *args):
+                # Per-request access logs would dominate benchmark output
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def find(self, cache_key: str) -> Optional[str]:
+        for cache_dir in self.cache_dirs:
+            path = entry_path(cache_dir, cache_key)
+            if path is not None:
+                return path
+        return None
+
+    @staticmethod
+    def validators(cachefile: str) -> Tuple[str, str]:
+        """ETag and Last-Modified for a cache file, derived from its size and mtime"""
+        st = os.stat(cachefile)
+        return f'"{st.st_size:x}-{st.st_mtime_ns:x}"', formatdate(st.st_mtime, usegmt=True)
+
+    @staticmethod
+    def _not_modified(request: BaseHTTPRequestHandler, etag: str, cachefile: str) -> bool:
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+        if_modified_since = request.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                return int(os.path.getmtime(cachefile)) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _serve(self, request: BaseHTTPRequestHandler):
+        path = request.path.split("?", 1)[0]
+        cache_key = cache_key_for(path[len(API_PREFIX):]) if path.startswith(API_PREFIX) else None
+        cachefile = self.find(cache_key) if cache_key else None
+        if cachefile is None:
+            body = b'{"detail": "Not found."}'
+            request.send_response(404)
+        else:
+            etag, last_modified = self.validators(cachefile)
+            if self._not_modified(request, etag, cachefile):
+                request.send_response(304)
+                request.send_header("ETag", etag)
+                request.send_header("Last-Modified", last_modified)
+                request.send_header("Content-Length", "0")
+                request.end_headers()
+                return
+            if cachefile.endswith(RECORD_SUFFIX):
+                # Records hold the projected payload, which keeps the PokeAPI shape
+                body = json.dumps(read_entry(cachefile)).encode("utf-8")
+            else:
+                with open(cachefile, "rb") as f:
+                    body = f.read()
+            request.send_response(200)
+            request.send_header("ETag", etag)
+            request.send_header("Last-Modified", last_modified)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("Content-Length", str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+    def start(self) -> "CacheMirrorServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="cache-mirror", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Serve on the calling thread until interrupted (used by the prewarm CLI's mirror mode)"""
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.httpd.server_close()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "CacheMirrorServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,242 @@
+import argparse
+import glob
+import gzip
+import json
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+from src.logger_file import logger
+
+# Bump when a projection changes; records with another version are treated as stale
+SCHEMA_VERSION = 1
+RECORD_SUFFIX = ".json.gz"
+LEGACY_SUFFIX = ".json"
+# Set to "1" to keep the full PokeAPI payload in new records instead of the projection
+FULL_PAYLOAD_ENV = "POKEMON_CACHE_FULL_PAYLOAD"
+# fetch_pokemon_data and the compiled store only ever read the first four moves
+PROJECTED_MOVES = 4
+
+
+def _names(entries: List[Dict[str, Any]], field: str = None) -> List[Dict[str, Any]]:
+    if field is None:
+        return [{"name": e["name"]} for e in entries]
+    return [{field: {"name": e[field]["name"]}} for e in entries]
+
+
+def _project_pokemon(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": data["id"],
+        "name": data["name"],
+        "height": data.get("height", 0),
+        "weight": data.get("weight", 0),
+        "types": _names(data["types"], "type"),
+        "stats": [{"base_stat": s["base_stat"], "stat": {"name": s["stat"]["name"]}} for s in data["stats"]],
+        "abilities": _names(data["abilities"], "ability"),
+        "moves": _names(data["moves"][:PROJECTED_MOVES], "move")
+    }
+
+
+def _project_move(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": data.get("id"),
+        "name": data["name"],
+        "power": data.get("power"),
+        "accuracy": data.get("accuracy"),
+        "pp": data.get("pp"),
+        "type": {"name": data["type"]["name"]}
+    }
+
+
+def _project_type(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": data.get("id"),
+        "name": data["name"],
+        "damage_relations": {relation: _names(entries) for relation, entries in data["damage_relations"].items()}
+    }
+
+
+def _project_index(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {"count": data.get("count"), "results": _names(data["results"])}
+
+
+# Cache key prefix -> projection keeping the PokeAPI shape of the fields we read
+PROJECTIONS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "pokemon_list": _project_index,
+    "all_types": _project_index,
+    "pokemon_": _project_pokemon,
+    "move_": _project_move,
+    "type_": _project_type,
+}
+
+
+def projection_for(cache_key: str) -> Optional[Callable[[Dict[str, Any]], Dict[str, Any]]]:
+    for prefix, projection in PROJECTIONS.items():
+        if cache_key == prefix or (prefix.endswith("_") and cache_key.startswith(prefix)):
+            return projection
+    return None
+
+
+def project(cache_key: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a PokeAPI payload to the fields the loader and resources use"""
+    projection = projection_for(cache_key)
+    if projection is None or not payload:
+        return payload
+    try:
+        return projection(payload)
+    except (KeyError, TypeError) as e:
+        # Unexpected shape: keep everything rather than lose data
+        logger.warning(f"Keeping full payload for {cache_key}: {e}")
+        return payload
+
+
+def cache_key_of(path: str) -> str:
+    name = os.path.basename(path)
+    for suffix in (RECORD_SUFFIX, LEGACY_SUFFIX):
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def encode_record(data: Dict[str, Any], projected: bool = True) -> bytes:
+    record = {"schema": SCHEMA_VERSION, "projected": projected, "data": data}
+    # mtime=0 keeps the bytes (and so the mirror's ETag inputs) stable for equal content
+    return gzip.compress(json.dumps(record, separators=(",", ":")).encode("utf-8"), mtime=0)
+
+
+def decode_record(blob: bytes) -> Dict[str, Any]:
+    try:
+        record = json.loads(gzip.decompress(blob))
+    except (OSError, EOFError) as e:
+        raise ValueError(f"not a gzip record: {e}") from e
+    if not isinstance(record, dict) or record.get("schema") != SCHEMA_VERSION:
+        raise ValueError(f"unsupported record schema {record.get('schema') if isinstance(record, dict) else None}")
+    return record["data"]
+
+
+def read_entry(path: str) -> Dict[str, Any]:
+    """Payload of a record (.json.gz) or legacy (.json) cache file; raises ValueError if corrupt"""
+    with open(path, "rb") as f:
+        blob = f.read()
+    if path.endswith(RECORD_SUFFIX):
+        return decode_record(blob)
+    return json.loads(blob.decode("utf-8"))
+
+
+def _atomic_write(path: str, blob: bytes):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(blob)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_entry(path: str, payload: Dict[str, Any], keep_full: bool = False) -> Dict[str, Any]:
+    """Write a cache file atomically; returns the payload as it will read back.
+
+    `.json.gz` paths get a versioned, projected record; anything else (sidecars,
+    legacy entries) is written as plain indented JSON.
+    """
+    if path.endswith(RECORD_SUFFIX):
+        stored = payload if keep_full else project(cache_key_of(path), payload)
+        _atomic_write(path, encode_record(stored, projected=not keep_full))
+        return stored
+    _atomic_write(path, json.dumps(payload, indent=2).encode("utf-8"))
+    return payload
+
+
+def entry_path(cache_dir: str, cache_key: str) -> Optional[str]:
+    """Existing cache file for a key, preferring the record over a legacy file"""
+    for suffix in (RECORD_SUFFIX, LEGACY_SUFFIX):
+        path = os.path.join(cache_dir, f"{cache_key}{suffix}")
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def cached_keys(cache_dir: str, prefix: str) -> List[str]:
+    """Keys starting with `prefix` present in either format"""
+    keys = set()
+    for suffix in (RECORD_SUFFIX, LEGACY_SUFFIX):
+        keys.update(cache_key_of(path) for path in glob.glob(os.path.join(cache_dir, f"{prefix}*{suffix}")))
+    return sorted(keys)
+
+
+def load_entry(cache_dirs: List[str], cache_key: str) -> Optional[Dict[str, Any]]:
+    """First readable entry for a key across cache directories (earlier wins)"""
+    for cache_dir in cache_dirs:
+        path = entry_path(cache_dir, cache_key)
+        if path is None:
+            continue
+        try:
+            return read_entry(path)
+        except (OSError, ValueError, UnicodeDecodeError) as e:
+            logger.warning(f"Skipping unreadable cache file {path}: {e}")
+    return None
+
+
+def migrate(cache_dir: str, keep_full: bool = False, remove_legacy: bool = True) -> Dict[str, Any]:
+    """Convert every legacy .json entry in a cache directory to a record"""
+    summary = {"cache_dir": cache_dir, "converted": 0, "failed": 0, "bytes_before": 0, "bytes_after": 0,
+               "parse_ms_before": 0.0, "parse_ms_after": 0.0}
+    for path in sorted(glob.glob(os.path.join(cache_dir, f"*{LEGACY_SUFFIX}"))):
+        cache_key = cache_key_of(path)
+        if cache_key.startswith("_"):
+            continue  # sidecar files such as the prewarm validators
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+            start = time.perf_counter()
+            payload = json.loads(raw.decode("utf-8"))
+            summary["parse_ms_before"] += (time.perf_counter() - start) * 1000
+
+            record_path = os.path.join(cache_dir, f"{cache_key}{RECORD_SUFFIX}")
+            write_entry(record_path, payload, keep_full=keep_full)
+            with open(record_path, "rb") as f:
+                blob = f.read()
+            start = time.perf_counter()
+            decode_record(blob)
+            summary["parse_ms_after"] += (time.perf_counter() - start) * 1000
+        except (OSError, ValueError, UnicodeDecodeError) as e:
+            logger.warning(f"Not migrating {path}: {e}")
+            summary["failed"] += 1
+            continue
+
+        summary["converted"] += 1
+        summary["bytes_before"] += len(raw)
+        summary["bytes_after"] += len(blob)
+        if remove_legacy:
+            os.remove(path)
+
+    summary["saved_bytes"] = summary["bytes_before"] - summary["bytes_after"]
+    summary["saved_pct"] = round(100.0 * summary["saved_bytes"] / summary["bytes_before"], 1) if summary["bytes_before"] else 0.0
+    summary["parse_speedup"] = (round(summary["parse_ms_before"] / summary["parse_ms_after"], 1)
+                                if summary["parse_ms_after"] else None)
+    summary["parse_ms_before"] = round(summary["parse_ms_before"], 3)
+    summary["parse_ms_after"] = round(summary["parse_ms_after"], 3)
+    logger.info(f"Migrated cache {cache_dir}: {summary}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert legacy JSON cache entries to compressed, projected records")
+    parser.add_argument("--cache-dir", action="append", dest="cache_dirs",
+                        help="Cache directory to migrate (repeatable). Default: data/cache and src/data/cache")
+    parser.add_argument("--keep-full", action="store_true", help="Store full payloads instead of projections")
+    parser.add_argument("--keep-legacy", action="store_true", help="Leave the original .json files in place")
+    args = parser.parse_args()
+
+    cache_dirs = args.cache_dirs or ["data/cache/", "src/data/cache/"]
+    summaries = [migrate(d, keep_full=args.keep_full, remove_legacy=not args.keep_legacy)
+                 for d in cache_dirs if os.path.isdir(d)]
+    print(json.dumps(summaries, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+import argparse
+import json
+import mmap
+import os
+import struct
+from typing import Dict, List, Optional
+from src.models import Pokemon, PokemonStats, Move
+from src.utils.cache_records import cached_keys, load_entry
+from src.logger_file import logger
+
+# Compiled species/move store.
+#
+# Layout (little-endian):
+#   header   magic, version, section counts and section offsets
+#   strings  (offset, length) index followed by the utf-8 string data
+#   types    one string id per type name
+#   moves    fixed-width move records
+#   species  fixed-width species records referencing strings, types and moves
+STORE_MAGIC = b"PKDX"
+STORE_VERSION = 1
+DEFAULT_STORE_PATH = "data/pokedex.bin"
+
+HEADER = struct.Struct("<4sHHIIIIIIIII")
+STRING_ENTRY = struct.Struct("<II")
+TYPE_ENTRY = struct.Struct("<I")
+MOVE_RECORD = struct.Struct("<IHBxHH")
+SPECIES_RECORD = struct.Struct("<II6HBBBB3I4III")
+
+MAX_ABILITIES = 3
+MAX_MOVES = 4
+NO_TYPE = 0xFF
+
+
+class CompiledStore:
+    """Read-only view of a compiled store file, shared between processes via mmap"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._buf = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        # Cache records written after this are newer than what was compiled
+        self.mtime = os.fstat(self._file.fileno()).st_mtime
+
+        (magic, version, _, n_strings, n_types, n_moves, n_species,
+         self._strings_index_off, self._strings_data_off, self._types_off,
+         self._moves_off, self._species_off) = HEADER.unpack_from(self._buf, 0)
+        if magic != STORE_MAGIC or version != STORE_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a compiled store (version {STORE_VERSION})")
+
+        self.n_strings = n_strings
+        self.n_moves = n_moves
+        self.n_species = n_species
+        self._type_names = [
+            self._string(TYPE_ENTRY.unpack_from(self._buf, self._types_off + i * TYPE_ENTRY.size)[0])
+            for i in range(n_types)
+        ]
+
+        # Name/id -> row, so a lookup is a single record read
+        self._index: Dict[str, int] = {}
+        for row in range(n_species):
+            species_id, name_sid = struct.unpack_from("<II", self._buf, self._species_offset(row))
+            self._index[self._string(name_sid)] = row
+            self._index[str(species_id)] = row
+
+    @classmethod
+    def open(cls, path: str = DEFAULT_STORE_PATH) -> Optional["CompiledStore"]:
+        """Open the store at `path`, or return None if it is missing or unreadable"""
+        if not os.path.exists(path):
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring compiled store {path}: {e}")
+            return None
+
+    def _species_offset(self, row: int) -> int:
+        return self._species_off + row * SPECIES_RECORD.size
+
+    def _string(self, sid: int) -> str:
+        offset, length = STRING_ENTRY.unpack_from(self._buf, self._strings_index_off + sid * STRING_ENTRY.size)
+        start = self._strings_data_off + offset
+        return self._buf[start:start + length].decode("utf-8")
+
+    def _move(self, index: int) -> Move:
+        name_sid, power, type_id, accuracy, pp = MOVE_RECORD.unpack_from(
+            self._buf, self._moves_off + index * MOVE_RECORD.size
+        )
+        return Move(name=self._string(name_sid), power=power, type=self._type_names[type_id],
+                    accuracy=accuracy, pp=pp)
+
+    def species_names(self) -> List[str]:
+        return [name for name in self._index if not name.isdigit()]
+
+    def __contains__(self, pokemon_identifier: str) -> bool:
+        return pokemon_identifier in self._index
+
+    def get_pokemon(self, pokemon_identifier: str) -> Optional[Pokemon]:
+        """Build a Pokemon from its compiled record, or None if it was not compiled"""
+        row = self._index.get(pokemon_identifier)
+        if row is None:
+            return None
+
+        fields = SPECIES_RECORD.unpack_from(self._buf, self._species_offset(row))
+        species_id, name_sid = fields[0], fields[1]
+        hp, attack, defense, special_attack, special_defense, speed = fields[2:8]
+        type1, type2, n_abilities, n_moves = fields[8:12]
+        ability_sids = fields[12:12 + MAX_ABILITIES]
+        move_indexes = fields[15:15 + MAX_MOVES]
+        height, weight = fields[19], fields[20]
+
+        return Pokemon(
+            id=species_id,
+            name=self._string(name_sid),
+            types=[self._type_names[t] for t in (type1, type2) if t != NO_TYPE],
+            stats=PokemonStats(
+                hp=hp,
+                attack=attack,
+                defense=defense,
+                special_attack=special_attack,
+                special_defense=special_defense,
+                speed=speed
+            ),
+            abilities=[self._string(sid) for sid in ability_sids[:n_abilities]],
+            moves=[self._move(i) for i in move_indexes[:n_moves]],
+            height=height,
+            weight=weight
+        )
+
+    def close(self):
+        self._buf.close()
+        self._file.close()
+
+
+class _StringTable:
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.strings: List[str] = []
+
+    def intern(self, value: str) -> int:
+        sid = self.ids.get(value)
+        if sid is None:
+            sid = self.ids[value] = len(self.strings)
+            self.strings.append(value)
+        return sid
+
+
+def compile_store(cache_dirs: List[str], output_path: str = DEFAULT_STORE_PATH) -> Dict[str, int]:
+    """Pack every cached species (and the moves it uses) into a single store file.
+
+    Species whose first four moves are not all cached, or that do not fit the
+    fixed-width record, are skipped so the loader falls back to the JSON cache.
+    """
+    strings = _StringTable()
+    type_ids: Dict[str, int] = {}
+    move_ids: Dict[str, int] = {}
+    moves: List[tuple] = []
+    species: List[tuple] = []
+    seen = set()
+    skipped = 0
+
+    def type_id(type_name: str) -> int:
+        if type_name not in type_ids:
+            type_ids[type_name] = len(type_ids)
+        return type_ids[type_name]
+
+    def move_index(move_name: str) -> Optional[int]:
+        if move_name in move_ids:
+            return move_ids[move_name]
+        details = load_entry(cache_dirs, f"move_{move_name}")
+        if not details:
+            return None
+        # Same defaults as PokemonDataLoader.fetch_pokemon_data
+        moves.append(MOVE_RECORD.pack(
+            strings.intern(details["name"]),
+            details.get("power") or 50,
+            type_id(details["type"]["name"]),
+            details.get("accuracy") or 80,
+            details.get("pp") or 10
+        ))
+        move_ids[move_name] = len(moves) - 1
+        return move_ids[move_name]
+
+    for cache_dir in cache_dirs:
+        for key in cached_keys(cache_dir, "pokemon_"):
+            if key in seen:
+                continue
+            seen.add(key)
+            data = load_entry([cache_dir], key)
+            if not data or "stats" not in data:
+                continue
+
+            move_indexes = [move_index(m["move"]["name"]) for m in data["moves"][:MAX_MOVES]]
+            types = [t["type"]["name"] for t in data["types"]]
+            abilities = [a["ability"]["name"] for a in data["abilities"]]
+            if None in move_indexes or len(types) > 2 or len(abilities) > MAX_ABILITIES:
+                logger.info(f"Not compiling {key}: incomplete cache or oversized record")
+                skipped += 1
+                continue
+
+            stats_data = {s["stat"]["name"]: s["base_stat"] for s in data["stats"]}
+            type_fields = [type_id(t) for t in types] + [NO_TYPE] * (2 - len(types))
+            ability_fields = [strings.intern(a) for a in abilities] + [0] * (MAX_ABILITIES - len(abilities))
+            move_fields = move_indexes + [0] * (MAX_MOVES - len(move_indexes))
+            species.append(SPECIES_RECORD.pack(
+                data["id"],
+                strings.intern(data["name"]),
+                stats_data.get("hp", 0),
+                stats_data.get("attack", 0),
+                stats_data.get("defense", 0),
+                stats_data.get("special-attack", 0),
+                stats_data.get("special-defense", 0),
+                stats_data.get("speed", 0),
+                *type_fields,
+                len(abilities),
+                len(move_indexes),
+                *ability_fields,
+                *move_fields,
+                data.get("height", 0),
+                data.get("weight", 0)
+            ))
+
+    type_sids = [strings.intern(name) for name in type_ids]
+
+    encoded = [s.encode("utf-8") for s in strings.strings]
+    string_index = bytearray()
+    string_data = bytearray()
+    for value in encoded:
+        string_index += STRING_ENTRY.pack(len(string_data), len(value))
+        string_data += value
+
+    strings_index_off = HEADER.size
+    strings_data_off = strings_index_off + len(string_index)
+    types_off = strings_data_off + len(string_data)
+    moves_off = types_off + len(type_sids) * TYPE_ENTRY.size
+    species_off = moves_off + len(moves) * MOVE_RECORD.size
+
+    header = HEADER.pack(
+        STORE_MAGIC, STORE_VERSION, 0,
+        len(encoded), len(type_sids), len(moves), len(species),
+        strings_index_off, strings_data_off, types_off, moves_off, species_off
+    )
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(string_index)
+        f.write(string_data)
+        for sid in type_sids:
+            f.write(TYPE_ENTRY.pack(sid))
+        f.writelines(moves)
+        f.writelines(species)
+    # Replace atomically so processes that already mapped the old file keep a consistent view
+    os.replace(tmp_path, output_path)
+
+    summary = {
+        "species": len(species),
+        "moves": len(moves),
+        "strings": len(encoded),
+        "skipped": skipped,
+        "bytes": os.path.getsize(output_path)
+    }
+    logger.info(f"Compiled store {output_path}: {summary}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the JSON cache into a memory-mapped store")
+    parser.add_argument("--cache-dir", action="append", dest="cache_dirs",
+                        help="Cache directory to compile (repeatable, earlier wins). Default: data/cache")
+    parser.add_argument("--output", default=DEFAULT_STORE_PATH, help="Store file to write")
+    args = parser.parse_args()
+
+    summary = compile_store(args.cache_dirs or ["data/cache/"], args.output)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+from typing import Any, Dict, List
+
+import numpy as np
+
+from src.models import Pokemon
+from src.utils.battle_mechanics import (CRIT_CHANCE, PHYSICAL_TYPES, ROLL_MAX, ROLL_MIN, STAB_MULTIPLIER,
+                                        TypeEffectiveness, type_id)
+
+LEVEL = 50
+# Same cap as BattleSimulator.simulate_battle
+MAX_TURNS = 100
+# Abramowitz & Stegun 7.1.26 coefficients (|error| < 1.5e-7); NumPy has no erf
+_ERF_P = 0.3275911
+_ERF_A = (0.254829592, -0.284496736, 1.421413741, -1.453152027, 1.061405429)
+
+
+def _normal_cdf(z: np.ndarray) -> np.ndarray:
+    x = np.abs(z) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + _ERF_P * x)
+    poly = t * (_ERF_A[0] + t * (_ERF_A[1] + t * (_ERF_A[2] + t * (_ERF_A[3] + t * _ERF_A[4]))))
+    erf = 1.0 - poly * np.exp(-x * x)
+    return 0.5 * (1.0 + np.sign(z) * erf)
+
+
+def _floor_integral(x: np.ndarray) -> np.ndarray:
+    # Integral of floor(t) from 0 to x
+    k = np.floor(x)
+    return k * x - k * (k + 1) / 2
+
+
+def _roll_moments(scaled: np.ndarray):
+    """First and second moment of max(1, int(scaled * U)), U uniform on [ROLL_MIN, ROLL_MAX)
+
+    The mean is exact; the second moment treats the damage as continuous.
+    """
+    low, high = scaled * ROLL_MIN, scaled * ROLL_MAX
+    width = high - low
+    safe = np.where(width > 0, width, 1.0)
+    # int() truncates to 0 below 1 and the engine raises that to 1
+    below_one = np.clip((1.0 - low) / safe, 0.0, 1.0)
+    mean = np.where(width > 0, (_floor_integral(high) - _floor_integral(low)) / safe + below_one, 1.0)
+    second = np.where(width > 0, np.maximum((high ** 3 - low ** 3) / (3 * safe), 1.0), 1.0)
+    return mean, second
+
+
+class RosterMatrix:
+    """Stats, type ids and moves of many Pokemon as NumPy arrays, one row per species.
+
+    Moves are padded to the longest move list; `has_move` masks the padding.
+    """
+
+    def __init__(self, roster: List[Pokemon]):
+        self.names = [pokemon.name for pokemon in roster]
+        self.pokemon = roster
+        n = len(roster)
+        width = max([len(pokemon.moves) for pokemon in roster] + [1])
+
+        stats = np.array([[p.stats.hp, p.stats.attack, p.stats.defense, p.stats.special_attack,
+                           p.stats.special_defense, p.stats.speed] for p in roster], dtype=np.float64).reshape(n, 6)
+        self.hp, self.attack, self.defense, self.special_attack, self.special_defense, self.speed = stats.T
+        types = np.array([TypeEffectiveness.defender_ids(p.types) for p in roster], dtype=np.intp).reshape(n, 2)
+        self.type1, self.type2 = types.T
+
+        self.power = np.zeros((n, width))
+        self.move_type = np.zeros((n, width), dtype=np.intp)
+        self.physical = np.zeros((n, width), dtype=bool)
+        self.stab = np.zeros((n, width), dtype=bool)
+        self.has_move = np.zeros((n, width), dtype=bool)
+        for row, pokemon in enumerate(roster):
+            own_types = {t.lower() for t in pokemon.types}
+            for col, move in enumerate(pokemon.moves):
+                move_type = move.type.lower()
+                self.power[row, col] = move.power
+                self.move_type[row, col] = type_id(move_type)
+                self.physical[row, col] = move_type in PHYSICAL_TYPES
+                self.stab[row, col] = move_type in own_types
+                self.has_move[row, col] = True
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+def base_damage(attacker: RosterMatrix, defender: RosterMatrix, type_chart: TypeEffectiveness) -> np.ndarray:
+    """DamageCalculator.base_damage of every attacker move against the defender, shape (rows, moves)
+
+    One side must have a single row; it is broadcast against every row of the other.
+    """
+    attack = np.where(attacker.physical, attacker.attack[:, None], attacker.special_attack[:, None])
+    defense = np.where(attacker.physical, defender.defense[:, None], defender.special_defense[:, None])
+    effectiveness = type_chart.dual_matrix[attacker.move_type, defender.type1[:, None], defender.type2[:, None]]
+    damage = ((2 * LEVEL / 5 + 2) * attacker.power * attack / defense / 50 + 2) * effectiveness
+    damage = np.where(attacker.stab, damage * STAB_MULTIPLIER, damage)
+    return np.where(attacker.has_move, damage, 0.0)
+
+
+def hit_moments(base: np.ndarray, has_move: np.ndarray):
+    """Mean and variance of one hit with a uniformly chosen move, critical hits and the random roll"""
+    normal_mean, normal_second = _roll_moments(base)
+    crit_mean, crit_second = _roll_moments(base * 2.0)
+    move_mean = (1 - CRIT_CHANCE) * normal_mean + CRIT_CHANCE * crit_mean
+    move_second = (1 - CRIT_CHANCE) * normal_second + CRIT_CHANCE * crit_second
+
+    moves = has_move.sum(axis=-1)
+    count = np.maximum(moves, 1)
+    mean = np.where(has_move, move_mean, 0.0).sum(axis=-1) / count
+    second = np.where(has_move, move_second, 0.0).sum(axis=-1) / count
+    # A Pokemon without moves never deals damage
+    mean = np.where(moves > 0, mean, 0.0)
+    variance = np.where(moves > 0, np.maximum(second - mean ** 2, 0.0), 0.0)
+    return mean, variance, move_mean
+
+
+def ko_cdf(hp: np.ndarray, mean: np.ndarray, variance: np.ndarray, max_turns: int = MAX_TURNS) -> np.ndarray:
+    """P(the target is down after k hits) for k = 0..max_turns, shape (rows, max_turns + 1)
+
+    The damage of k hits is taken as normal with k times the per-hit mean and variance.
+    """
+    k = np.arange(max_turns + 1, dtype=np.float64)[None, :]
+    mean, variance, hp = mean[:, None], variance[:, None], hp[:, None]
+    spread = np.sqrt(variance * k)
+    # Continuity correction: damage comes in whole points
+    shortfall = k * mean - hp + 0.5
+    cdf = np.where(spread > 0, _normal_cdf(shortfall / np.where(spread > 0, spread, 1.0)),
+                   (shortfall >= 0).astype(np.float64))
+    cdf[:, 0] = 0.0
+    # Normal tails can dip; hits to KO only ever become more likely
+    return np.maximum.accumulate(cdf, axis=1)
+
+
+def score_counters(roster: RosterMatrix, opponent: RosterMatrix, type_chart: TypeEffectiveness,
+                   max_turns: int = MAX_TURNS) -> Dict[str, np.ndarray]:
+    """Estimated chance of every roster species beating `opponent` one-on-one, in one batched pass
+
+    Mirrors the scalar engine's damage formula, STAB, critical hits, random roll,
+    speed order (ties 50/50) and turn cap; status effects are left out, so use
+    battle_odds for the exact figure on a shortlist.
+    """
+    dealt = base_damage(roster, opponent, type_chart)
+    taken = base_damage(opponent, roster, type_chart)
+    dealt_mean, dealt_var, move_means = hit_moments(dealt, roster.has_move)
+    taken_mean, taken_var, _ = hit_moments(taken, np.broadcast_to(opponent.has_move, taken.shape))
+
+    opponent_hp = np.broadcast_to(opponent.hp, roster.hp.shape)
+    ko_opponent = ko_cdf(opponent_hp, dealt_mean, dealt_var, max_turns)
+    ko_candidate = ko_cdf(roster.hp, taken_mean, taken_var, max_turns)
+
+    # P(the candidate lands its KO on hit k), k = 1..max_turns
+    ko_on = np.diff(ko_opponent, axis=1)
+    # Moving first, the candidate has taken k - 1 hits when it strikes for the k-th time; moving second, k
+    survives_before = 1.0 - ko_candidate[:, :-1]
+    survives_through = 1.0 - ko_candidate[:, 1:]
+    win_first = (ko_on * survives_before).sum(axis=1)
+    win_second = (ko_on * survives_through).sum(axis=1)
+
+    # Both standing at the cap: the scalar engine hands it to the higher HP
+    neither = (1.0 - ko_opponent[:, -1]) * (1.0 - ko_candidate[:, -1])
+    ahead = (roster.hp - max_turns * taken_mean) > (opponent_hp - max_turns * dealt_mean)
+
+    faster = roster.speed > opponent.speed
+    tie = roster.speed == opponent.speed
+    win = np.where(faster, win_first, np.where(tie, (win_first + win_second) / 2, win_second)) + neither * ahead
+
+    return {
+        "win_probability": np.clip(win, 0.0, 1.0),
+        "damage_dealt": dealt_mean,
+        "damage_taken": taken_mean,
+        "hits_to_ko": np.where(dealt_mean > 0, np.ceil(opponent_hp / np.where(dealt_mean > 0, dealt_mean, 1.0)), np.inf),
+        "hits_to_be_ko": np.where(taken_mean > 0, np.ceil(roster.hp / np.where(taken_mean > 0, taken_mean, 1.0)), np.inf),
+        "best_move": np.where(roster.has_move, move_means, -1.0).argmax(axis=1),
+        "speed": np.where(faster, 1, np.where(tie, 0, -1))
+    }
+
+
+def rank_counters(roster: RosterMatrix, opponent: RosterMatrix, type_chart: TypeEffectiveness,
+                  top_k: int = 10, max_turns: int = MAX_TURNS) -> List[Dict[str, Any]]:
+    """The top_k roster species by estimated win probability against `opponent` (itself excluded)"""
+    scores = score_counters(roster, opponent, type_chart, max_turns)
+    margin = np.where(np.isfinite(scores["hits_to_be_ko"]), scores["hits_to_be_ko"], max_turns + 1.0) - \
+        np.where(np.isfinite(scores["hits_to_ko"]), scores["hits_to_ko"], max_turns + 1.0)
+    eligible = np.array([name != opponent.names[0] for name in roster.names], dtype=bool)
+    # Win probability first, then how many turns the candidate has to spare
+    order = np.lexsort((-margin, -np.round(scores["win_probability"], 4)))
+    order = order[eligible[order]][:top_k]
+
+    ranked = []
+    for i in order:
+        pokemon = roster.pokemon[i]
+        best = pokemon.moves[scores["best_move"][i]].name if pokemon.moves else None
+        ranked.append({
+            "name": pokemon.name,
+            "types": pokemon.types,
+            "win_probability": round(float(scores["win_probability"][i]), 4),
+            "expected_damage_dealt": round(float(scores["damage_dealt"][i]), 2),
+            "expected_damage_taken": round(float(scores["damage_taken"][i]), 2),
+            "hits_to_ko": int(scores["hits_to_ko"][i]) if np.isfinite(scores["hits_to_ko"][i]) else None,
+            "hits_to_be_ko": int(scores["hits_to_be_ko"][i]) if np.isfinite(scores["hits_to_be_ko"][i]) else None,
+            "speed": {1: "faster", 0: "tie", -1: "slower"}[int(scores["speed"][i])],
+            "best_move": best
+        })
+    return ranked
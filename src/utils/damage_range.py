@@ -0,0 +1,70 @@
+import math
+from typing import Dict, List
+from src.utils.battle_mechanics import CRIT_CHANCE, ROLL_MAX, ROLL_MIN
+
+# ko_probability_by_hits stops here (or once a KO is certain)
+MAX_HITS = 20
+
+
+def _roll_distribution(scaled: float, weight: float, dist: Dict[int, float]):
+    """Add weight * P(int(scaled * roll) == k) for roll ~ U[ROLL_MIN, ROLL_MAX) to dist"""
+    low, high = scaled * ROLL_MIN, scaled * ROLL_MAX
+    width = high - low
+    if width <= 0:
+        damage = max(1, int(low))
+        dist[damage] = dist.get(damage, 0.0) + weight
+        return
+    for k in range(int(low), int(math.ceil(high))):
+        overlap = min(k + 1, high) - max(k, low)
+        if overlap > 0:
+            damage = max(1, k)
+            dist[damage] = dist.get(damage, 0.0) + weight * overlap / width
+
+
+def damage_distribution(base_damage: float) -> Dict[int, float]:
+    """Exact distribution of DamageCalculator.roll_damage(base_damage): damage -> probability.
+
+    Covers both the critical hit and the continuous random roll, so it matches
+    the simulator without sampling.
+    """
+    dist: Dict[int, float] = {}
+    _roll_distribution(base_damage, 1.0 - CRIT_CHANCE, dist)
+    _roll_distribution(base_damage * 2.0, CRIT_CHANCE, dist)
+    return dict(sorted(dist.items()))
+
+
+def expected_damage(dist: Dict[int, float]) -> float:
+    return sum(damage * p for damage, p in dist.items())
+
+
+def ko_probability_by_hits(dist: Dict[int, float], hp: int, max_hits: int = MAX_HITS) -> List[float]:
+    """Probability that n hits deal at least hp damage, for n = 1..max_hits.
+
+    Accumulated damage is capped at hp, so each step convolves at most hp states.
+    Stops early once a KO is certain.
+    """
+    if hp <= 0:
+        return [1.0]
+    states = {0: 1.0}
+    cumulative = []
+    for _ in range(max_hits):
+        after: Dict[int, float] = {}
+        for dealt, p in states.items():
+            if dealt >= hp:
+                after[hp] = after.get(hp, 0.0) + p
+                continue
+            for damage, q in dist.items():
+                total = min(hp, dealt + damage)
+                after[total] = after.get(total, 0.0) + p * q
+        states = after
+        ko = min(1.0, states.get(hp, 0.0))
+        cumulative.append(ko)
+        if ko >= 1.0 - 1e-12:
+            cumulative[-1] = 1.0
+            break
+    return cumulative
+
+
+def hits_to_guaranteed_ko(dist: Dict[int, float], hp: int) -> int:
+    """Fewest hits that KO even on the lowest roll"""
+    return max(1, math.ceil(hp / min(dist)))
@@ -1,51 +1,188 @@
-import requests
 import httpx
-import pandas as pd
-import json
+import asyncio
+import hashlib
 import os
-from typing import Dict, List
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from typing import Callable, Dict, List, Optional
 from src.models import Pokemon, PokemonStats, Move
+from src.utils.cache_records import (FULL_PAYLOAD_ENV, LEGACY_SUFFIX, RECORD_SUFFIX,
+                                      cache_key_of, read_entry, write_entry)
+from src.utils.compiled_store import CompiledStore, DEFAULT_STORE_PATH
+from src.utils.memory_cache import LRUCache, pokemon_cache
+from src.utils.metrics import metrics
 from src.logger_file import logger
 
+
+def species_fingerprint(pokemon: Pokemon) -> str:
+    """Hash of everything about a species that can change a battle outcome"""
+    return hashlib.sha1(repr(asdict(pokemon)).encode("utf-8")).hexdigest()
+
+
 class PokemonDataLoader:
-    def __init__(self):
+    def __init__(self, store_path: str = DEFAULT_STORE_PATH, memory_cache: LRUCache = None,
+                 cache_dir: str = "data/cache/", max_concurrency: int = 8, io_workers: int = 2,
+                 client: httpx.AsyncClient = None, keep_full_payload: bool = None):
         self.base_url = "https://pokeapi.co/api/v2/"
-        self.cache_dir = "data/cache/"
+        self.cache_dir = cache_dir
         os.makedirs(self.cache_dir, exist_ok=True)
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # New entries are projected records unless full PokeAPI payloads are asked for
+        if keep_full_payload is None:
+            keep_full_payload = os.environ.get(FULL_PAYLOAD_ENV) == "1"
+        self.keep_full_payload = keep_full_payload
+        # Callers that manage their own connection pool (e.g. the prewarm CLI) pass it in;
+        # otherwise it is created on the first network fetch (TLS setup is slow, and warm
+        # starts never need it)
+        self._client = client
+        # Bounds concurrent HTTP requests; in-flight fetches are shared per cache key
+        self.max_concurrency = max_concurrency
+        self._fetch_limit = None
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Cache file reads/writes and JSON (de)serialization run here, off the event loop
+        self._io_pool = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="pokemon-cache-io")
+        # Compiled store (see src/utils/compiled_store.py), used before the JSON cache
+        self.store = CompiledStore.open(store_path)
+        # Compiled species with newer cache records, found on first store use; see read_store()
+        self._stale_species: Optional[set] = None
+        self._store_move_users: Dict[str, set] = {}
+        # Built Pokemon objects, shared process-wide unless a dedicated cache is passed in
+        self.memory_cache = pokemon_cache if memory_cache is None else memory_cache
+        # Called with each Pokemon built from the store, disk or network (e.g. the search index)
+        self._species_listeners: List[Callable[[Pokemon], None]] = []
+
+    def add_species_listener(self, listener: Callable[[Pokemon], None]):
+        self._species_listeners.append(listener)
+
+    def _species_loaded(self, pokemon: Pokemon):
+        for listener in self._species_listeners:
+            try:
+                listener(pokemon)
+            except Exception as e:
+                logger.warning(f"Species listener failed for {pokemon.name}: {e}")
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=30.0)
+        return self._client
+
+    @client.setter
+    def client(self, client: httpx.AsyncClient):
+        self._client = client
 
     def _cache_path(self, key: str) -> str:
-        return os.path.join(self.cache_dir, f"{key}.json")
+        return os.path.join(self.cache_dir, f"{key}{RECORD_SUFFIX}")
+
+    def _legacy_cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}{LEGACY_SUFFIX}")
+
+    def _limit(self) -> asyncio.Semaphore:
+        # Semaphores bind to the loop they are first used on, so keep one per loop
+        loop = asyncio.get_running_loop()
+        if self._fetch_limit is None or self._fetch_limit[0] is not loop:
+            self._fetch_limit = (loop, asyncio.Semaphore(self.max_concurrency))
+        return self._fetch_limit[1]
+
+    def _read_cache(self, cachefile: str) -> Optional[dict]:
+        """Read a cache entry; corrupt or stale-schema entries are removed so the next fetch rewrites them"""
+        if not os.path.exists(cachefile):
+            return None
+        try:
+            return read_entry(cachefile)
+        except (ValueError, UnicodeDecodeError) as e:
+            logger.warning(f"Discarding corrupt cache entry {cachefile}: {e}")
+            try:
+                os.remove(cachefile)
+            except OSError:
+                pass
+        except OSError as e:
+            logger.error(f"Error reading {cachefile}: {e}")
+        return None
+
+    def _write_cache(self, cachefile: str, data: dict) -> dict:
+        """Write a cache entry atomically (see cache_records.write_entry); returns what was stored"""
+        return write_entry(cachefile, data, keep_full=self.keep_full_payload)
+
+    def _read_cached(self, cache_key: str) -> Optional[dict]:
+        # Records first; entries written before records existed are still honoured
+        with metrics.timer("disk.read"):
+            data = self._read_cache(self._cache_path(cache_key))
+            if data is None:
+                data = self._read_cache(self._legacy_cache_path(cache_key))
+        metrics.incr("cache.disk.miss" if data is None else "cache.disk.hit")
+        return data
+
+    async def _run_io(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._io_pool, func, *args)
 
     async def _get(self, endpoint: str, cache_key: str) -> dict:
+        data = await self._run_io(self._read_cached, cache_key)
+        if data is not None:
+            return data
         cachefile = self._cache_path(cache_key)
-        if os.path.exists(cachefile):
-            try:
-                with open(cachefile, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"Error reading {cachefile}: {e}")
 
+        # Single-flight: concurrent misses on the same key await one request
+        task = self._inflight.get(cache_key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._fetch(endpoint, cachefile))
+            self._inflight[cache_key] = task
+
+            def _forget(done: asyncio.Task):
+                if self._inflight.get(cache_key) is done:
+                    del self._inflight[cache_key]
+            task.add_done_callback(_forget)
+        # Shielded so one cancelled caller does not cancel the fetch for the others
+        return await asyncio.shield(task)
+
+    async def _fetch(self, endpoint: str, cachefile: str) -> dict:
         url = self.base_url + endpoint
         try:
-            response = await self.client.get(url)
+            async with self._limit():
+                with metrics.timer("http.fetch"):
+                    response = await self.client.get(url)
             response.raise_for_status()
-            if response.status_code == 200:
-                data = response.json()
-                with open(cachefile, "w", encoding="utf-8") as f:
-                    json.dump(data, f, indent=2)
-            return data
+            # Parse, project and write in one job: the full payload is built and freed off the loop
+            return await self._run_io(self._store_response, response, cachefile)
         except Exception as e:
-            print(f"Error fetching {url}: {e}")
+            metrics.incr("http.error")
+            logger.error(f"Error fetching {url}: {e}")
             return {}
 
+    def _store_response(self, response: httpx.Response, cachefile: str) -> dict:
+        with metrics.timer("http.parse"):
+            data = response.json()
+        try:
+            with metrics.timer("disk.write"):
+                stored = self._write_cache(cachefile, data)
+            self._mark_refreshed(cache_key_of(cachefile))
+            return stored
+        except Exception as e:
+            logger.error(f"Error writing {cachefile}: {e}")
+            return data
+
     async def fetch_pokemon_data(self, pokemon_identifier: str) -> Pokemon:
         # Implement API calls with caching
         pokemon_identifier = pokemon_identifier.lower().strip()
+        pokemon = self.memory_cache.get(pokemon_identifier)
+        if pokemon is not None:
+            metrics.incr("cache.memory.hit")
+            return pokemon
+        metrics.incr("cache.memory.miss")
+
+        if self.store is not None:
+            with metrics.timer("store.read"):
+                pokemon = await self.read_store(pokemon_identifier)
+            if pokemon is not None:
+                metrics.incr("cache.store.hit")
+                self.add_pokemon(pokemon_identifier, pokemon)
+                return pokemon
+
         data = await self._get(f"pokemon/{pokemon_identifier}", f"pokemon_{pokemon_identifier}")
         if not data:
             raise ValueError(f"Pokemon '{pokemon_identifier}' not found")
 
+        build_started = time.perf_counter()
         stats_data = {s["stat"]["name"]: s["base_stat"] for s in data["stats"]}
         stats = PokemonStats(
             hp=stats_data.get("hp", 0),
@@ -55,11 +192,14 @@ class PokemonDataLoader:
             special_defense=stats_data.get("special-defense", 0),
             speed=stats_data.get("speed", 0)
         )
+        move_names = [move_data["move"]["name"] for move_data in data["moves"][:4]]
+        build_seconds = time.perf_counter() - build_started
+        all_move_details = await asyncio.gather(
+            *(self._get(f"move/{move_name}", f"move_{move_name}") for move_name in move_names)
+        )
+        build_started = time.perf_counter()
         moves = []
-        for move_data in data["moves"][:4]:
-            move_name = move_data["move"]["name"]
-            move_details = await self._get(f"move/{move_name}", f"move_{move_name}")
-            
+        for move_details in all_move_details:
             if move_details:
                 moves.append(Move(
                     name=move_details["name"],
@@ -78,17 +218,80 @@ class PokemonDataLoader:
             height=data.get("height", 0),
             weight=data.get("weight", 0)
         )
-        
+        # Dataclass construction only, not the move fetches in between
+        metrics.observe("build.pokemon", build_seconds + time.perf_counter() - build_started)
+
+        self.add_pokemon(pokemon_identifier, pokemon)
+        return pokemon
+
+    def _scan_store_freshness(self):
+        """Find compiled species whose species or move records were written after the store (runs on the I/O pool)"""
+        newer = set()
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                try:
+                    if entry.stat().st_mtime > self.store.mtime:
+                        newer.add(cache_key_of(entry.name))
+                except OSError:
+                    continue
+        stale, move_users = set(), {}
+        for name in self.store.species_names():
+            pokemon = self.store.get_pokemon(name)
+            for move in pokemon.moves:
+                move_users.setdefault(move.name, set()).add(name)
+            if f"pokemon_{name}" in newer or any(f"move_{move.name}" in newer for move in pokemon.moves):
+                stale.add(name)
+        if stale:
+            logger.info(f"Compiled store is older than the cache records of {len(stale)} species; reading those from the cache")
+        self._store_move_users = move_users
+        self._stale_species = stale
+
+    def _mark_refreshed(self, cache_key: str):
+        """A record written by this loader makes the compiled species using it stale"""
+        if self._stale_species is None:
+            return
+        if cache_key.startswith("pokemon_"):
+            self._stale_species.add(cache_key[len("pokemon_"):])
+        elif cache_key.startswith("move_"):
+            self._stale_species.update(self._store_move_users.get(cache_key[len("move_"):], ()))
+
+    async def read_store(self, pokemon_identifier: str) -> Optional[Pokemon]:
+        """A Pokemon from the compiled store, or None if it was not compiled or its cache records are newer"""
+        if self._stale_species is None:
+            # Checked once per store, off the event loop
+            await self._run_io(self._scan_store_freshness)
+        pokemon = self.store.get_pokemon(pokemon_identifier)
+        if pokemon is None:
+            return None
+        if pokemon.name in self._stale_species:
+            metrics.incr("cache.store.stale")
+            return None
         return pokemon
 
+    def add_pokemon(self, pokemon_identifier: str, pokemon: Pokemon):
+        """Cache an already built Pokemon and notify the species listeners, as a fetch would"""
+        self.memory_cache.put(pokemon_identifier, pokemon)
+        self._species_loaded(pokemon)
+
+    async def read_cached_record(self, cache_key: str) -> Optional[dict]:
+        """A cache entry as stored on disk, or None; never goes to the network"""
+        return await self._run_io(self._read_cached, cache_key)
+
+    def invalidate(self, pokemon_identifier: str = None) -> int:
+        """Drop a species (or every species) from the in-memory Pokemon cache"""
+        if pokemon_identifier is None:
+            return self.memory_cache.invalidate()
+        return self.memory_cache.invalidate(pokemon_identifier.lower().strip())
+
     async def load_type_effectiveness(self)-> Dict[str, Dict[str, float]]:
         # Load type chart data
         type_effectiveness = {}
         types_data = await self._get("type", "all_types")
-        for t in types_data["results"]:
-            type_name = t["name"]
-            type_data = await self._get(f"type/{type_name}", f"type_{type_name}")
-
+        type_names = [t["name"] for t in types_data["results"]]
+        all_type_data = await asyncio.gather(
+            *(self._get(f"type/{type_name}", f"type_{type_name}") for type_name in type_names)
+        )
+        for type_name, type_data in zip(type_names, all_type_data):
             damage_relations = type_data["damage_relations"]
             type_effectiveness[type_name] = {
                 "no_damage_to": [x["name"] for x in damage_relations["no_damage_to"]],
@@ -103,5 +306,11 @@ class PokemonDataLoader:
     
     async def close(self):
     # """Clean up HTTP client"""
-        if hasattr(self, 'client'):
-            await self.client.aclose()
\ No newline at end of file
+        if getattr(self, '_client', None) is not None:
+            await self._client.aclose()
+            self._client = None
+        if hasattr(self, '_io_pool'):
+            self._io_pool.shutdown(wait=True)
+        if getattr(self, 'store', None) is not None:
+            self.store.close()
+            self.store = None
\ No newline at end of file
@@ -0,0 +1,158 @@
+import asyncio
+import os
+from typing import Callable, Dict, List, Optional
+from src.models import Pokemon
+from src.utils.battle_mechanics import TypeEffectiveness
+from src.utils.data_loader import PokemonDataLoader, species_fingerprint
+from src.utils.response_cache import response_cache
+from src.utils.search_index import SpeciesIndex, build_species_index
+from src.utils.snapshot import load_snapshot, newest_source_mtime, snapshot_path_from_env
+from src.logger_file import logger
+
+# Comma-separated species loaded by startup() before the server accepts requests
+PREWARM_ENV = "POKEMON_PREWARM"
+
+
+def prewarm_species_from_env() -> List[str]:
+    return [name.strip().lower() for name in os.environ.get(PREWARM_ENV, "").split(",") if name.strip()]
+
+
+class PokemonDataService:
+    """Process-wide owner of the data loader (HTTP pool, memory cache) and the type chart.
+
+    Server, resources and tools all go through the module-level `data_service`
+    so they share one connection pool and one set of warm caches.
+    """
+
+    def __init__(self, loader: PokemonDataLoader = None, prewarm: Optional[List[str]] = None,
+                 snapshot_path: Optional[str] = None):
+        self._loader = None
+        if loader is not None:
+            self._attach(loader)
+        self.prewarm = prewarm
+        self.snapshot_path = snapshot_path
+        self._type_chart: Optional[Dict[str, Dict[str, List[str]]]] = None
+        self._type_effectiveness: Optional[TypeEffectiveness] = None
+        self._search_index: Optional[SpeciesIndex] = None
+        self._search_index_task: Optional[asyncio.Task] = None
+        self._pending_species: List[Pokemon] = []
+        self._species_listeners: List[Callable[[Pokemon], None]] = []
+        # species_fingerprint of the last build of each species, to tell rebuilds from reloads
+        self._species_fingerprints: Dict[str, str] = {}
+
+    @property
+    def loader(self) -> PokemonDataLoader:
+        # Created on first use, and again after shutdown() if the service is reused
+        if self._loader is None:
+            self._attach(PokemonDataLoader())
+        return self._loader
+
+    def _attach(self, loader: PokemonDataLoader):
+        self._loader = loader
+        loader.add_species_listener(self._species_loaded)
+
+    def _species_loaded(self, pokemon: Pokemon):
+        # A reload that built the same species again (TTL expiry, eviction) changes nothing downstream
+        name = pokemon.name.lower()
+        fingerprint = species_fingerprint(pokemon)
+        if self._species_fingerprints.get(name) == fingerprint:
+            return
+        self._species_fingerprints[name] = fingerprint
+        # Species cached after the index was built are added as they arrive
+        if self._search_index is not None:
+            self._search_index.add_pokemon(pokemon)
+            response_cache.invalidate("species-index")
+        elif self._search_index_task is not None:
+            self._pending_species.append(pokemon)
+        # Responses encoding an earlier build of this species
+        response_cache.invalidate(f"pokemon:{name}")
+        for listener in self._species_listeners:
+            listener(pokemon)
+
+    def add_species_listener(self, listener: Callable[[Pokemon], None]):
+        """Call `listener` with every new or changed species the loader builds, whichever loader is current"""
+        self._species_listeners.append(listener)
+
+    async def search_index(self) -> SpeciesIndex:
+        """Search index over every cached species, built once per process"""
+        if self._search_index is None:
+            # Concurrent first searches share one build
+            if self._search_index_task is None or self._search_index_task.get_loop() is not asyncio.get_running_loop():
+                self._search_index_task = asyncio.ensure_future(build_species_index(self.loader))
+            index = await asyncio.shield(self._search_index_task)
+            if self._search_index is None:
+                # Species built while the index was being built
+                for pokemon in self._pending_species:
+                    index.add_pokemon(pokemon)
+                self._pending_species = []
+                self._search_index = index
+        return self._search_index
+
+    async def fetch_pokemon(self, pokemon_identifier: str) -> Pokemon:
+        return await self.loader.fetch_pokemon_data(pokemon_identifier)
+
+    async def type_chart(self) -> Dict[str, Dict[str, List[str]]]:
+        """The PokeAPI damage relations, loaded once per process"""
+        if self._type_chart is None:
+            self._type_chart = await self.loader.load_type_effectiveness()
+        return self._type_chart
+
+    async def type_effectiveness(self) -> TypeEffectiveness:
+        """Matchup matrices built from type_chart(), shared by every simulator"""
+        if self._type_effectiveness is None:
+            self._type_effectiveness = TypeEffectiveness(await self.type_chart())
+        return self._type_effectiveness
+
+    def load_snapshot(self) -> bool:
+        """Adopt the type matrix, search index and hot Pokemon from the startup snapshot"""
+        path = self.snapshot_path or snapshot_path_from_env()
+        image = load_snapshot(path)
+        if image is None:
+            return False
+        if newest_source_mtime(self.loader) > image["source_mtime"]:
+            # Prewarm revalidation, a migration or a recompiled store since the build
+            logger.warning(f"Ignoring snapshot {path}: the cache changed after it was built; rebuild it")
+            return False
+        self._type_chart = image["type_chart"]
+        self._type_effectiveness = TypeEffectiveness(matrix_rows=image["type_matrix"])
+        response_cache.invalidate("type-chart")
+        # Seeded here so search_index() never walks the cache directory
+        index = SpeciesIndex()
+        for entry in image["species_index"]:
+            index.add(entry)
+        self._search_index = index
+        response_cache.invalidate("species-index")
+        for name, pokemon in image["hot_species"].items():
+            # Through the loader, so the listeners see them like any other load
+            self.loader.add_pokemon(name, pokemon)
+        logger.info(f"Loaded snapshot: {len(image['hot_species'])} hot species, {len(index)} indexed")
+        return True
+
+    async def startup(self, prewarm: Optional[List[str]] = None) -> Dict[str, List[str]]:
+        """Load the snapshot, type chart and prewarm species; failures are logged, not raised"""
+        species = prewarm if prewarm is not None else (self.prewarm if self.prewarm is not None
+                                                       else prewarm_species_from_env())
+        self.load_snapshot()
+        await self.type_effectiveness()
+        await self.search_index()
+        results = await asyncio.gather(*(self.fetch_pokemon(name) for name in species), return_exceptions=True)
+
+        loaded, failed = [], []
+        for name, result in zip(species, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Prewarm of {name} failed: {result}")
+                failed.append(name)
+            else:
+                loaded.append(name)
+        logger.info(f"Data service started: {len(loaded)} species prewarmed, {len(failed)} failed")
+        return {"loaded": loaded, "failed": failed}
+
+    async def shutdown(self):
+        """Close the HTTP pool and I/O threads; cached Pokemon and the type chart are kept"""
+        if self._loader is not None:
+            loader, self._loader = self._loader, None
+            await loader.close()
+            logger.info("Data service stopped")
+
+
+data_service = PokemonDataService()
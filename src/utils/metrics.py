@@ -0,0 +1,153 @@
+import asyncio
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Optional
+from src.logger_file import LOG_DIR, logger
+
+# Set to "0" to turn instrumentation off; timers then cost one attribute check
+METRICS_ENV = "POKEMON_METRICS"
+# Seconds between snapshots appended to METRICS_DUMP_PATH (unset: no dump)
+METRICS_DUMP_ENV = "POKEMON_METRICS_DUMP"
+METRICS_DUMP_PATH = os.path.join(LOG_DIR, "metrics.jsonl")
+
+# Upper bounds of the latency buckets in milliseconds, roughly 2.5x apart
+BUCKETS_MS = [0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+_NULL_TIMER = nullcontext()
+
+
+class Histogram:
+    """Fixed-bucket latency histogram; percentiles are read off the bucket bounds"""
+
+    __slots__ = ("counts", "count", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float):
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, q: float) -> float:
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max_ms
+        return 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 4) if self.count else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max_ms, 4),
+            "total_ms": round(self.total_ms, 3),
+            "buckets": {(f"le_{bound}" if i < len(BUCKETS_MS) else "inf"): n
+                        for i, (bound, n) in enumerate(zip(BUCKETS_MS + [None], self.counts)) if n}
+        }
+
+
+class Metrics:
+    """In-process counters and latency histograms for the data and battle hot paths.
+
+    Names are dotted stages, e.g. "cache.memory.hit", "disk.read", "http.fetch",
+    "simulate.battle", "serialize.resource". Updates take a lock because cache
+    reads and writes run on the loader's I/O threads.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None):
+        if enabled is None:
+            enabled = os.environ.get(METRICS_ENV, "1") != "0"
+        self.enabled = enabled
+        self.started_at = time.time()
+        self._counters: Dict[str, int] = {}
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def incr(self, name: str, n: int = 1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def observe(self, name: str, seconds: float):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(seconds * 1000)
+
+    def timer(self, name: str):
+        """Context manager recording the duration of its block under `name`"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(sorted(self._counters.items()))
+            histograms = {name: h.summary() for name, h in sorted(self._histograms.items())}
+        return {
+            "enabled": self.enabled,
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "counters": counters,
+            "latency": histograms
+        }
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self.started_at = time.time()
+
+    def dump(self, path: str = METRICS_DUMP_PATH, extra: Optional[Dict[str, Any]] = None):
+        """Append one snapshot as a JSON line"""
+        record = {"time": time.strftime("%Y-%m-%dT%H:%M:%S%z"), **self.snapshot(), **(extra or {})}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+    async def dump_periodically(self, interval: float, path: str = METRICS_DUMP_PATH):
+        """Dump a snapshot every `interval` seconds until cancelled"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.dump, path)
+            except OSError as e:
+                logger.warning(f"Could not dump metrics to {path}: {e}")
+
+
+def dump_interval_from_env() -> Optional[float]:
+    value = os.environ.get(METRICS_DUMP_ENV)
+    try:
+        return float(value) if value else None
+    except ValueError:
+        logger.warning(f"Ignoring {METRICS_DUMP_ENV}={value!r}: not a number of seconds")
+        return None
+
+
+metrics = Metrics()
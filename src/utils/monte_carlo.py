@@ -0,0 +1,149 @@
+import threading
+import numpy as np
+from typing import Any, Dict, Optional
+from src.models import Pokemon
+from src.utils.battle_mechanics import (BURN, CRIT_CHANCE, FULL_PARALYSIS_CHANCE, PARALYSIS, POISON, ROLL_MAX, ROLL_MIN,
+                                        STATUS_CHANCE, STATUS_FLAGS, BattleCancelled, BattleState, DamageCalculator,
+                                        TypeEffectiveness, type_id)
+
+# Status bits (BattleState flags), one int8 per combatant per battle
+STATUS_BITS = np.array(STATUS_FLAGS, dtype=np.int8)
+
+
+class MonteCarloBattleSimulator:
+    """Plays N independent battles of one pairing in lockstep on NumPy arrays.
+
+    Follows the same rules as BattleSimulator.simulate_battle: speed order with
+    random ties, uniform move choice, DamageCalculator's formula with a 1/16 crit
+    and a 0.85-1.0 roll, 10% status infliction, BattleState's stat modifiers
+    (burn halves attack, paralysis quarters speed), the 25% full-paralysis check
+    for paralyzed Pokemon and end-of-turn burn/poison damage, capped at `max_turns`.
+    """
+
+    def __init__(self, type_chart: TypeEffectiveness = None, max_turns: int = 100):
+        self.type_chart = type_chart or TypeEffectiveness()
+        self.max_turns = max_turns
+
+    def _move_table(self, attacker: BattleState, defender: BattleState) -> np.ndarray:
+        """Pre-roll damage of each of the attacker's moves against this defender"""
+        defender_ids = self.type_chart.defender_ids(defender.types)
+        return np.array([
+            DamageCalculator.base_damage(
+                attacker, defender, move, self.type_chart.effectiveness_by_id(type_id(move.type), defender_ids)
+            )
+            for move in attacker.pokemon.moves
+        ], dtype=np.float64)
+
+    def simulate(self, pokemon1: Pokemon, pokemon2: Pokemon, n_battles: int,
+                 seed: Optional[int] = None, cancel: Optional[threading.Event] = None) -> Dict[str, Any]:
+        """Outcome statistics of n_battles; raises BattleCancelled once `cancel` is set"""
+        rng = np.random.default_rng(seed)
+        max_hp = np.array([pokemon1.stats.hp, pokemon2.stats.hp], dtype=np.int64)
+        burn_damage = np.maximum(1, max_hp // 16)
+        poison_damage = np.maximum(1, max_hp // 8)
+
+        # Per side and burn state: padded (2, 2, 4) damage table, plus move counts
+        states = [BattleState(pokemon1), BattleState(pokemon2)]
+        burned = [BattleState(pokemon1), BattleState(pokemon2)]
+        for state in burned:
+            state.inflict(BURN)
+        n_moves = np.array([len(pokemon1.moves), len(pokemon2.moves)], dtype=np.int64)
+        width = max(1, int(n_moves.max()))
+        move_damage = np.zeros((2, 2, width), dtype=np.float64)
+        for side in (0, 1):
+            move_damage[side, 0, :n_moves[side]] = self._move_table(states[side], states[1 - side])
+            move_damage[side, 1, :n_moves[side]] = self._move_table(burned[side], states[1 - side])
+
+        # Effective speed per side, without and with paralysis
+        speed = np.array([pokemon1.stats.speed, pokemon2.stats.speed], dtype=np.int64)
+        paralyzed_speed = np.maximum(1, speed // 4)
+
+        hp = np.repeat(max_hp[:, None], n_battles, axis=1)
+        status = np.zeros((2, n_battles), dtype=np.int8)
+        turns = np.zeros(n_battles, dtype=np.int64)
+        active = np.arange(n_battles)
+
+        def attack(att: np.ndarray, dfd: np.ndarray, idx: np.ndarray, acting: np.ndarray):
+            n = len(idx)
+            att_status = status[att, idx]
+            acting &= ~((att_status & PARALYSIS).astype(bool) & (rng.random(n) < FULL_PARALYSIS_CHANCE))
+            acting &= n_moves[att] > 0
+            move = np.minimum((rng.random(n) * n_moves[att]).astype(np.int64), width - 1)
+            critical = np.where(rng.random(n) < CRIT_CHANCE, 2.0, 1.0)
+            roll = rng.uniform(ROLL_MIN, ROLL_MAX, n)
+            base = move_damage[att, (att_status & BURN).astype(bool).astype(np.int64), move]
+            damage = np.maximum(1, np.floor(base * critical * roll).astype(np.int64))
+            hp[dfd, idx] = np.where(acting, np.maximum(0, hp[dfd, idx] - damage), hp[dfd, idx])
+
+            inflict = acting & (rng.random(n) < STATUS_CHANCE)
+            new_status = STATUS_BITS[rng.integers(0, 3, n)]
+            status[dfd, idx] = np.where(inflict, status[dfd, idx] | new_status, status[dfd, idx])
+
+        for turn in range(1, self.max_turns + 1):
+            if len(active) == 0:
+                break
+            if cancel is not None and cancel.is_set():
+                raise BattleCancelled(f"{pokemon1.name} vs {pokemon2.name} cancelled at turn {turn}")
+            n = len(active)
+            speed1 = np.where(status[0, active] & PARALYSIS, paralyzed_speed[0], speed[0])
+            speed2 = np.where(status[1, active] & PARALYSIS, paralyzed_speed[1], speed[1])
+            p1_first = (speed1 > speed2) | ((speed1 == speed2) & (rng.random(n) < 0.5))
+            first = np.where(p1_first, 0, 1)
+            second = 1 - first
+
+            attack(first, second, active, np.ones(n, dtype=bool))
+            attack(second, first, active, hp[second, active] > 0)
+
+            # End-of-turn burn then poison damage
+            for side in (0, 1):
+                side_status = status[side, active]
+                side_hp = hp[side, active]
+                side_hp = np.where(side_status & BURN, np.maximum(0, side_hp - burn_damage[side]), side_hp)
+                side_hp = np.where(side_status & POISON, np.maximum(0, side_hp - poison_damage[side]), side_hp)
+                hp[side, active] = side_hp
+
+            turns[active] = turn
+            finished = (hp[0, active] <= 0) | (hp[1, active] <= 0)
+            active = active[~finished]
+
+        # Same outcome rules as the scalar engine, including the turn-limit tiebreak (draws count for pokemon2)
+        p1_wins = (hp[1] <= 0) & (hp[0] > 0)
+        timed_out = (hp[0] > 0) & (hp[1] > 0)
+        p1_wins |= timed_out & (hp[0] > hp[1])
+        p1_win_count = int(p1_wins.sum())
+
+        return {
+            "pokemon1": pokemon1.name,
+            "pokemon2": pokemon2.name,
+            "n_battles": n_battles,
+            "seed": seed,
+            "win_probability": {
+                "pokemon1": p1_win_count / n_battles,
+                "pokemon2": (n_battles - p1_win_count) / n_battles
+            },
+            "wins": {"pokemon1": p1_win_count, "pokemon2": n_battles - p1_win_count},
+            "turn_limit_reached": int(timed_out.sum()),
+            "draws": int((timed_out & (hp[0] == hp[1])).sum()),
+            "average_turns": float(turns.mean()),
+            "turn_histogram": _histogram(turns),
+            "final_hp": {
+                "pokemon1": _hp_distribution(hp[0], int(max_hp[0])),
+                "pokemon2": _hp_distribution(hp[1], int(max_hp[1]))
+            }
+        }
+
+
+def _histogram(values: np.ndarray) -> Dict[str, int]:
+    counts = np.bincount(values)
+    return {str(v): int(c) for v, c in enumerate(counts) if c}
+
+
+def _hp_distribution(final_hp: np.ndarray, max_hp: int) -> Dict[str, Any]:
+    percentiles = np.percentile(final_hp, [5, 25, 50, 75, 95])
+    return {
+        "max_hp": max_hp,
+        "mean": float(final_hp.mean()),
+        "fainted_rate": float((final_hp <= 0).mean()),
+        "percentiles": {f"p{p}": float(v) for p, v in zip([5, 25, 50, 75, 95], percentiles)},
+        "histogram": _histogram(final_hp)
+    }
@@ -0,0 +1,186 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from email.utils import formatdate
+from typing import Dict, List, Optional
+
+import httpx
+
+from src.utils.cache_mirror import CacheMirrorServer
+from src.utils.cache_records import entry_path
+from src.utils.data_loader import PokemonDataLoader
+from src.utils.memory_cache import LRUCache
+from src.logger_file import logger
+
+VALIDATORS_FILE = "_validators.json"
+
+
+class CachePrewarmer:
+    """Fills a loader's JSON cache for a list of species ahead of time.
+
+    All requests share one keep-alive connection pool and are bounded by
+    `concurrency`. Entries already on disk are revalidated with
+    If-None-Match / If-Modified-Since and only rewritten when the upstream
+    copy changed.
+    """
+
+    def __init__(self, loader: PokemonDataLoader, concurrency: int = 16, revalidate: bool = True):
+        self.loader = loader
+        self.concurrency = concurrency
+        self.revalidate = revalidate
+        self.validators_path = os.path.join(loader.cache_dir, VALIDATORS_FILE)
+        self.validators: Dict[str, Dict[str, str]] = self._load_validators()
+        self.stats = {"downloaded": 0, "not_modified": 0, "updated": 0, "skipped": 0, "failed": 0}
+        self._limit = asyncio.Semaphore(concurrency)
+        self._seen: Dict[str, asyncio.Task] = {}
+
+    def _load_validators(self) -> Dict[str, Dict[str, str]]:
+        data = self.loader._read_cache(self.validators_path)
+        return data if isinstance(data, dict) else {}
+
+    def _conditional_headers(self, cache_key: str, cachefile: str) -> Dict[str, str]:
+        headers = {}
+        stored = self.validators.get(cache_key, {})
+        if stored.get("etag"):
+            headers["If-None-Match"] = stored["etag"]
+        # Files fetched before validators were tracked fall back to their mtime
+        headers["If-Modified-Since"] = stored.get("last_modified") or formatdate(os.path.getmtime(cachefile), usegmt=True)
+        return headers
+
+    async def ensure(self, endpoint: str, cache_key: str) -> Optional[dict]:
+        """Make sure one cache entry is on disk and current; returns its payload"""
+        task = self._seen.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(self._ensure(endpoint, cache_key))
+            self._seen[cache_key] = task
+        return await task
+
+    async def _ensure(self, endpoint: str, cache_key: str) -> Optional[dict]:
+        existing = entry_path(self.loader.cache_dir, cache_key)
+        exists = existing is not None
+        if exists and not self.revalidate:
+            self.stats["skipped"] += 1
+            return await self.loader._run_io(self.loader._read_cache, existing)
+
+        url = self.loader.base_url + endpoint
+        headers = self._conditional_headers(cache_key, existing) if exists else {}
+        try:
+            async with self._limit:
+                response = await self.loader.client.get(url, headers=headers)
+            if response.status_code == 304:
+                self.stats["not_modified"] += 1
+                return await self.loader._run_io(self.loader._read_cache, existing)
+            response.raise_for_status()
+            data = await self.loader._run_io(response.json)
+            cachefile = self.loader._cache_path(cache_key)
+            data = await self.loader._run_io(self.loader._write_cache, cachefile, data)
+            if exists and existing != cachefile:
+                # The legacy .json is superseded by the record just written
+                os.remove(existing)
+        except Exception as e:
+            logger.error(f"Prewarm failed for {url}: {e}")
+            self.stats["failed"] += 1
+            return None
+
+        self.stats["updated" if exists else "downloaded"] += 1
+        validators = {k: response.headers[h] for k, h in (("etag", "ETag"), ("last_modified", "Last-Modified"))
+                      if h in response.headers}
+        if validators:
+            self.validators[cache_key] = validators
+        return data
+
+    async def list_species(self, limit: int) -> List[str]:
+        """First `limit` species names from the PokeAPI species index"""
+        data = await self.ensure(f"pokemon?limit={limit}", "pokemon_list")
+        return [entry["name"] for entry in (data or {}).get("results", [])[:limit]]
+
+    async def warm_species(self, name: str):
+        name = name.lower().strip()
+        data = await self.ensure(f"pokemon/{name}", f"pokemon_{name}")
+        if not data:
+            return
+        # Same four moves PokemonDataLoader.fetch_pokemon_data reads
+        move_names = [move_data["move"]["name"] for move_data in data.get("moves", [])[:4]]
+        await asyncio.gather(*(self.ensure(f"move/{move}", f"move_{move}") for move in move_names))
+
+    async def warm_types(self):
+        data = await self.ensure("type", "all_types")
+        type_names = [t["name"] for t in (data or {}).get("results", [])]
+        await asyncio.gather(*(self.ensure(f"type/{name}", f"type_{name}") for name in type_names))
+
+    async def run(self, species: List[str], types: bool = True) -> Dict:
+        start = time.perf_counter()
+        jobs = [self.warm_species(name) for name in species]
+        if types:
+            jobs.append(self.warm_types())
+        await asyncio.gather(*jobs)
+        await self.loader._run_io(self.loader._write_cache, self.validators_path, self.validators)
+
+        summary = dict(self.stats, species=len(species), elapsed_seconds=round(time.perf_counter() - start, 3))
+        logger.info(f"Prewarmed {self.loader.cache_dir}: {summary}")
+        return summary
+
+
+def _read_species_file(path: str) -> List[str]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+async def warm(args) -> Dict:
+    # One pooled keep-alive client for the whole run, sized to the concurrency bound
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    client = httpx.AsyncClient(timeout=30.0, limits=limits)
+    loader = PokemonDataLoader(memory_cache=LRUCache(), cache_dir=args.cache_dir,
+                               max_concurrency=args.concurrency, client=client)
+    if args.base_url:
+        loader.base_url = args.base_url.rstrip("/") + "/"
+    try:
+        prewarmer = CachePrewarmer(loader, concurrency=args.concurrency, revalidate=not args.no_revalidate)
+        species = list(args.species)
+        if args.species_file:
+            species += _read_species_file(args.species_file)
+        if args.dex:
+            species += await prewarmer.list_species(args.dex)
+        species = list(dict.fromkeys(name.lower().strip() for name in species))
+        return await prewarmer.run(species, types=not args.no_types)
+    finally:
+        await loader.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prewarm the PokeAPI cache, or serve it as a local mirror")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    warm_parser = commands.add_parser("warm", help="Download or revalidate cache entries")
+    warm_parser.add_argument("species", nargs="*", help="Species to prewarm")
+    warm_parser.add_argument("--species-file", help="File with one species name per line")
+    warm_parser.add_argument("--dex", type=int, default=0, help="Also prewarm the first N species of the national dex")
+    warm_parser.add_argument("--cache-dir", default="data/cache/", help="Cache directory to fill")
+    warm_parser.add_argument("--base-url", help="Upstream API root, e.g. a peer's mirror (default: pokeapi.co)")
+    warm_parser.add_argument("--concurrency", type=int, default=16, help="Maximum concurrent requests")
+    warm_parser.add_argument("--no-revalidate", action="store_true", help="Skip entries already on disk")
+    warm_parser.add_argument("--no-types", action="store_true", help="Do not prewarm the type chart")
+
+    mirror_parser = commands.add_parser("mirror", help="Serve cache directories as a PokeAPI-compatible endpoint")
+    mirror_parser.add_argument("--cache-dir", action="append", dest="cache_dirs",
+                               help="Cache directory to serve (repeatable, earlier wins). Default: data/cache")
+    mirror_parser.add_argument("--host", default="0.0.0.0", help="Interface to bind")
+    mirror_parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    args = parser.parse_args()
+
+    if args.command == "warm":
+        print(json.dumps(asyncio.run(warm(args)), indent=2))
+        return
+
+    mirror = CacheMirrorServer(args.cache_dirs or ["data/cache/"], host=args.host, port=args.port)
+    print(f"Serving {', '.join(mirror.cache_dirs)} at {mirror.base_url}")
+    try:
+        mirror.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import json
+import os
+import threading
+from typing import Any, Dict, Hashable, Iterable, Optional, Set
+from src.utils.memory_cache import LRUCache
+from src.utils.metrics import metrics
+
+# Indent for JSON responses; unset means compact separators (set to "2" for readable output)
+JSON_INDENT_ENV = "POKEMON_JSON_INDENT"
+_COMPACT = (",", ":")
+
+
+def _indent_from_env() -> Optional[int]:
+    value = os.environ.get(JSON_INDENT_ENV, "")
+    return int(value) if value.isdigit() else None
+
+
+JSON_INDENT = _indent_from_env()
+
+
+def encode(payload: Any) -> str:
+    """The one JSON encoding used for tool and resource responses"""
+    if JSON_INDENT is None:
+        return json.dumps(payload, separators=_COMPACT)
+    return json.dumps(payload, indent=JSON_INDENT)
+
+
+class ResponseCache:
+    """Encoded responses keyed by resource URI or tool arguments.
+
+    Each entry names the data it was built from ("pokemon:pikachu", "type-chart",
+    "species-index"); invalidate() drops every entry depending on one of them.
+    The data service invalidates species as the loader rebuilds them, so a hit
+    is always what a fresh build would encode. Put an entry right after reading
+    the data it encodes, or pass the generation read before that data was
+    fetched: the put is skipped if anything was invalidated since.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 3600.0):
+        self._entries = LRUCache(maxsize=maxsize, ttl=ttl)
+        self._dependents: Dict[str, Set[Hashable]] = {}
+        self._lock = threading.Lock()
+        self.invalidations = 0
+        # Bumped by every invalidate() call
+        self.generation = 0
+
+    def get(self, key: Hashable) -> Any:
+        value = self._entries.get(key)
+        metrics.incr("cache.response.miss" if value is None else "cache.response.hit")
+        return value
+
+    def put(self, key: Hashable, value: Any, depends_on: Iterable[str], generation: Optional[int] = None):
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries.put(key, value)
+            for dependency in depends_on:
+                keys = self._dependents.setdefault(dependency, set())
+                keys.add(key)
+                if len(keys) > self._entries.maxsize:
+                    # Forget keys the LRU has already evicted
+                    keys.intersection_update([k for k in keys if k in self._entries])
+
+    def invalidate(self, dependency: Optional[str] = None) -> int:
+        """Drop the entries built from `dependency` (every entry if None); returns how many were cached"""
+        with self._lock:
+            self.generation += 1
+            if dependency is None:
+                self._dependents.clear()
+                removed = self._entries.invalidate()
+            else:
+                removed = sum(self._entries.invalidate(key) for key in self._dependents.pop(dependency, ()))
+            self.invalidations += removed
+        return removed
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._entries.stats(), "invalidations": self.invalidations}
+
+
+# Process-wide; shared by read_resource and call_tool
+response_cache = ResponseCache()
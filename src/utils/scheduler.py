@@ -0,0 +1,263 @@
+import asyncio
+import concurrent.futures
+import contextvars
+import functools
+import json
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from src.logger_file import logger
+
+
+class ToolLimits:
+    """Admission policy of one tool (or resource family)
+
+    concurrency: calls executing at once; queue_size: calls allowed to wait for a
+    slot before new ones are rejected; timeout: seconds from admission to result,
+    queueing included; coalesce: identical in-flight calls share one execution.
+
+    What a timeout stops: the caller gets DeadlineExceeded at the deadline, and
+    the call is cancelled at its next await. Work it handed to offload() is told
+    to stop through cancel_event(): the Monte Carlo and odds engines check it
+    every turn, and batch chunks not yet started are dropped. The concurrency
+    slot stays taken until that work has actually returned.
+
+    What it cannot stop: a batch chunk already running in a worker process, the
+    scalar battle engine (it runs on the event loop and never awaits, so the
+    caller only sees DeadlineExceeded once it is done) and data fetches, which
+    are shielded so other callers of the same species still get them.
+    """
+
+    def __init__(self, concurrency: int = 8, queue_size: int = 64, timeout: float = 30.0, coalesce: bool = True):
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.coalesce = coalesce
+
+
+DEFAULT_LIMITS = ToolLimits()
+
+# Cheap lookups get wide limits; CPU-heavy tools few slots and longer deadlines
+TOOL_LIMITS: Dict[str, ToolLimits] = {
+    "pokemon_details": ToolLimits(concurrency=16, queue_size=256, timeout=15.0),
+    "resource": ToolLimits(concurrency=16, queue_size=256, timeout=15.0),
+    "damage_calc": ToolLimits(concurrency=8, queue_size=64, timeout=15.0),
+    "battle_simulate": ToolLimits(concurrency=8, queue_size=64, timeout=30.0),
+    "battle_odds": ToolLimits(concurrency=2, queue_size=16, timeout=30.0),
+    "best_counters": ToolLimits(concurrency=4, queue_size=32, timeout=30.0),
+    "battle_monte_carlo": ToolLimits(concurrency=2, queue_size=16, timeout=60.0),
+    "battle_simulate_batch": ToolLimits(concurrency=1, queue_size=4, timeout=300.0),
+}
+
+
+class SchedulerRejected(Exception):
+    """The tool's queue is full; the caller should retry later"""
+
+
+class DeadlineExceeded(Exception):
+    """The call did not finish within its tool's timeout and was cancelled"""
+
+
+# The scheduled call the current task is running, if any
+_current_execution: contextvars.ContextVar[Optional["_Execution"]] = contextvars.ContextVar(
+    "scheduled_execution", default=None)
+
+
+class _Execution:
+    """Work one admitted call runs off the event loop, and the flag telling it to stop"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, release: Callable[[], None]):
+        self.loop = loop
+        self.cancel = threading.Event()
+        self._pending = 0
+        self._returned = False
+        self._release: Optional[Callable[[], None]] = release
+
+    def hold(self, work: concurrent.futures.Future):
+        self._pending += 1
+        work.add_done_callback(lambda _: self._threadsafe(self._done))
+
+    def _threadsafe(self, callback: Callable[[], None]):
+        try:
+            self.loop.call_soon_threadsafe(callback)
+        except RuntimeError:
+            # The loop is gone, and its scheduler state with it
+            pass
+
+    def _done(self):
+        self._pending -= 1
+        self._maybe_release()
+
+    def returned(self):
+        """The call has returned, been cancelled or timed out: work still running has nobody to report to"""
+        self._returned = True
+        self.cancel.set()
+        self._maybe_release()
+
+    def _maybe_release(self):
+        if self._returned and self._pending == 0 and self._release is not None:
+            release, self._release = self._release, None
+            release()
+
+
+def cancel_event() -> Optional[threading.Event]:
+    """Set once the scheduled call running in this task has been given up on; None outside the scheduler"""
+    execution = _current_execution.get()
+    return execution.cancel if execution is not None else None
+
+
+async def offload(func: Callable[..., Any], *args: Any, executor: Optional[concurrent.futures.Executor] = None,
+                  **kwargs: Any) -> Any:
+    """Run func off the event loop, on a thread (like asyncio.to_thread) or on `executor`.
+
+    Inside a scheduled call, the call's concurrency slot is held until func has
+    actually returned, even if the caller timed out or went away meanwhile.
+    """
+    loop = asyncio.get_running_loop()
+    if executor is None:
+        work: concurrent.futures.Future = concurrent.futures.Future()
+        context = contextvars.copy_context()
+
+        def run():
+            if not work.set_running_or_notify_cancel():
+                return
+            try:
+                work.set_result(context.run(func, *args, **kwargs))
+            except BaseException as e:
+                work.set_exception(e)
+        loop.run_in_executor(None, run)
+    else:
+        work = executor.submit(functools.partial(func, *args, **kwargs))
+    execution = _current_execution.get()
+    if execution is not None:
+        execution.hold(work)
+    return await asyncio.wrap_future(work)
+
+
+class _InFlight:
+    __slots__ = ("task", "waiters", "queued")
+
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        self.waiters = 0
+        # Counted in the tool's queue until it holds a concurrency slot
+        self.queued = True
+
+
+class RequestScheduler:
+    """Admission control in front of call_tool and read_resource.
+
+    Each tool has a concurrency limit and a bounded queue: a call that would
+    exceed the queue is rejected immediately instead of adding latency for
+    everyone. Identical calls already in flight are joined rather than run again,
+    and every execution is cancelled once its deadline passes (or once every
+    caller waiting on it has gone away); see ToolLimits for what that can stop.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, ToolLimits]] = None, default: ToolLimits = DEFAULT_LIMITS):
+        self.limits = dict(TOOL_LIMITS if limits is None else limits)
+        self.default = default
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._waiting: Dict[str, int] = {}
+        self._running: Dict[str, int] = {}
+        self._in_flight: Dict[Tuple[str, str], _InFlight] = {}
+        self._loop = None
+        self.stats = {"admitted": 0, "coalesced": 0, "rejected": 0, "timed_out": 0}
+
+    def limits_for(self, name: str) -> ToolLimits:
+        return self.limits.get(name, self.default)
+
+    @staticmethod
+    def request_key(name: str, arguments: Any) -> Tuple[str, str]:
+        return name, json.dumps(arguments, sort_keys=True, default=str)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current queue depth and running calls per tool, plus lifetime counters"""
+        return {
+            "waiting": {name: n for name, n in self._waiting.items() if n},
+            "running": {name: n for name, n in self._running.items() if n},
+            "in_flight": len(self._in_flight),
+            **self.stats
+        }
+
+    async def run(self, name: str, arguments: Any, call: Callable[[], Awaitable[Any]],
+                  coalesce: bool = True) -> Any:
+        """Run call() under the limits of `name`; identical (name, arguments) calls share it if coalesce"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Semaphores and tasks belong to one event loop (tests run several in turn)
+            self._loop = loop
+            self._slots, self._waiting, self._running, self._in_flight = {}, {}, {}, {}
+        limits = self.limits_for(name)
+        key = self.request_key(name, arguments) if coalesce and limits.coalesce else None
+
+        entry = self._in_flight.get(key) if key is not None else None
+        if entry is not None:
+            self.stats["coalesced"] += 1
+            return await self._join(entry)
+
+        slots = self._slots.get(name)
+        if slots is None:
+            slots = self._slots[name] = asyncio.Semaphore(limits.concurrency)
+        waiting, running = self._waiting.get(name, 0), self._running.get(name, 0)
+        if running + waiting >= limits.concurrency + limits.queue_size:
+            self.stats["rejected"] += 1
+            logger.warning(f"Rejected {name}: {limits.queue_size} calls already queued")
+            raise SchedulerRejected(f"{name} is overloaded ({limits.queue_size} calls queued), retry later")
+
+        # Counted before the task first runs, so a burst in one loop tick cannot overfill the queue
+        self.stats["admitted"] += 1
+        self._waiting[name] = waiting + 1
+        entry = _InFlight()
+        entry.task = asyncio.ensure_future(self._execute(name, limits, slots, call, entry))
+        entry.task.add_done_callback(lambda _: self._finished(name, key, entry))
+        if key is not None:
+            self._in_flight[key] = entry
+        return await self._join(entry)
+
+    def _finished(self, name: str, key: Optional[Tuple[str, str]], entry: _InFlight):
+        if entry.queued:
+            # Cancelled or timed out before it got a slot
+            entry.queued = False
+            self._waiting[name] -= 1
+        if key is not None and self._in_flight.get(key) is entry:
+            del self._in_flight[key]
+
+    async def _join(self, entry: _InFlight) -> Any:
+        entry.waiters += 1
+        try:
+            return await asyncio.shield(entry.task)
+        except asyncio.CancelledError:
+            # The last caller gave up: stop the work instead of finishing it for nobody
+            entry.waiters -= 1
+            if entry.waiters == 0:
+                entry.task.cancel()
+            raise
+
+    async def _execute(self, name: str, limits: ToolLimits, slots: asyncio.Semaphore,
+                       call: Callable[[], Awaitable[Any]], entry: _InFlight) -> Any:
+        def release():
+            self._running[name] -= 1
+            slots.release()
+
+        async def admitted():
+            await slots.acquire()
+            entry.queued = False
+            self._waiting[name] -= 1
+            self._running[name] = self._running.get(name, 0) + 1
+            execution = _Execution(asyncio.get_running_loop(), release)
+            _current_execution.set(execution)
+            try:
+                return await call()
+            finally:
+                # The slot is released once offloaded work is done too, not just this coroutine
+                execution.returned()
+
+        try:
+            return await asyncio.wait_for(admitted(), timeout=limits.timeout)
+        except asyncio.TimeoutError:
+            self.stats["timed_out"] += 1
+            logger.warning(f"{name} cancelled after its {limits.timeout}s deadline")
+            raise DeadlineExceeded(f"{name} did not finish within {limits.timeout}s")
+
+
+scheduler = RequestScheduler()
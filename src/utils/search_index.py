@@ -0,0 +1,243 @@
+import bisect
+import difflib
+import heapq
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from src.models import Pokemon
+from src.utils.cache_records import cached_keys
+from src.utils.metrics import metrics
+from src.logger_file import logger
+
+STATS = ("hp", "attack", "defense", "special_attack", "special_defense", "speed", "total")
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 1000
+# difflib ratio a name must reach to count as a fuzzy match
+FUZZY_CUTOFF = 0.6
+
+
+def cached_species(loader) -> List[str]:
+    """Names of every species available offline: the JSON cache plus the compiled store"""
+    names = {key[len("pokemon_"):] for key in cached_keys(loader.cache_dir, "pokemon_")}
+    if loader.store is not None:
+        names.update(loader.store.species_names())
+    names.discard("list")
+    return sorted(names)
+
+
+class IndexedSpecies:
+    """What search needs to know about a species: id, name, types and base stats"""
+
+    __slots__ = ("id", "name", "types", "stats")
+
+    def __init__(self, species_id: int, name: str, types: Tuple[str, ...], stats: Tuple[int, ...]):
+        self.id = species_id
+        self.name = name
+        self.types = types
+        # In STATS order, base stat total last
+        self.stats = stats
+
+    @classmethod
+    def from_pokemon(cls, pokemon: Pokemon) -> "IndexedSpecies":
+        s = pokemon.stats
+        values = (s.hp, s.attack, s.defense, s.special_attack, s.special_defense, s.speed)
+        return cls(pokemon.id, pokemon.name.lower(), tuple(t.lower() for t in pokemon.types), values + (sum(values),))
+
+    @classmethod
+    def from_record(cls, data: Dict[str, Any]) -> "IndexedSpecies":
+        """From a cached PokeAPI pokemon entry, without loading its moves"""
+        base = {s["stat"]["name"].replace("-", "_"): s["base_stat"] for s in data["stats"]}
+        values = tuple(base.get(stat, 0) for stat in STATS[:-1])
+        return cls(data["id"], data["name"].lower(), tuple(t["type"]["name"] for t in data["types"]),
+                   values + (sum(values),))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "id": self.id, "types": list(self.types),
+                "stats": dict(zip(STATS, self.stats))}
+
+
+class SearchQuery:
+    """Parsed pokemon://search parameters
+
+    name: prefix match, falling back to fuzzy matching when no name starts with it;
+    type: every listed type must match (comma-separated or repeated);
+    min_<stat> / max_<stat>: inclusive bounds for any of STATS;
+    sort: "name", "id" or a stat, "-" prefix for descending; limit: at most MAX_LIMIT.
+    """
+
+    def __init__(self, name: Optional[str] = None, types: Optional[List[str]] = None,
+                 ranges: Optional[Dict[int, Tuple[int, int]]] = None, sort: str = "name",
+                 limit: int = DEFAULT_LIMIT):
+        self.name = name
+        self.types = types or []
+        self.ranges = ranges or {}
+        self.sort = sort
+        self.limit = limit
+
+    @classmethod
+    def from_params(cls, params: Dict[str, List[str]]) -> "SearchQuery":
+        query = cls()
+        for key, values in params.items():
+            value = values[-1].strip().lower()
+            if key == "name":
+                query.name = value or None
+            elif key == "type":
+                query.types = sorted({t.strip() for v in values for t in v.lower().split(",") if t.strip()})
+            elif key == "sort":
+                field = value.lstrip("-")
+                if field not in STATS and field not in ("name", "id"):
+                    raise ValueError(f"Cannot sort by {field!r}; use name, id or one of {', '.join(STATS)}")
+                query.sort = value
+            elif key == "limit":
+                query.limit = int(value)
+                if not 1 <= query.limit <= MAX_LIMIT:
+                    raise ValueError(f"limit must be between 1 and {MAX_LIMIT}")
+            elif key[:4] in ("min_", "max_") and key[4:] in STATS:
+                column = STATS.index(key[4:])
+                low, high = query.ranges.get(column, (0, 1 << 31))
+                bound = int(value)
+                query.ranges[column] = (bound, high) if key.startswith("min_") else (low, bound)
+            else:
+                raise ValueError(f"Unknown search parameter {key!r}")
+        return query
+
+    def describe(self) -> Dict[str, Any]:
+        described: Dict[str, Any] = {"sort": self.sort, "limit": self.limit}
+        if self.name:
+            described["name"] = self.name
+        if self.types:
+            described["type"] = self.types
+        for column, (low, high) in sorted(self.ranges.items()):
+            if low > 0:
+                described[f"min_{STATS[column]}"] = low
+            if high < 1 << 31:
+                described[f"max_{STATS[column]}"] = high
+        return described
+
+
+class SpeciesIndex:
+    """In-memory search index over the cached roster.
+
+    Names are kept sorted for prefix lookups, each type maps to its species and
+    each stat has a sorted (value, name) column, so a query starts from its most
+    selective filter and checks the rest on that candidate set only. add() is an
+    upsert, called as the loader builds new species.
+    """
+
+    def __init__(self):
+        self.species: Dict[str, IndexedSpecies] = {}
+        self._names: List[str] = []
+        self._by_type: Dict[str, set] = {}
+        self._columns: List[List[Tuple[int, str]]] = [[] for _ in STATS]
+
+    def __len__(self) -> int:
+        return len(self.species)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.species
+
+    def names(self) -> List[str]:
+        return list(self._names)
+
+    def add(self, entry: IndexedSpecies):
+        old = self.species.get(entry.name)
+        if old is not None:
+            self._remove(old)
+        self.species[entry.name] = entry
+        bisect.insort(self._names, entry.name)
+        for t in entry.types:
+            self._by_type.setdefault(t, set()).add(entry.name)
+        for column, value in zip(self._columns, entry.stats):
+            bisect.insort(column, (value, entry.name))
+
+    def add_pokemon(self, pokemon: Pokemon):
+        self.add(IndexedSpecies.from_pokemon(pokemon))
+
+    def _remove(self, entry: IndexedSpecies):
+        del self._names[bisect.bisect_left(self._names, entry.name)]
+        for t in entry.types:
+            self._by_type[t].discard(entry.name)
+        for column, value in zip(self._columns, entry.stats):
+            del column[bisect.bisect_left(column, (value, entry.name))]
+
+    def _prefixed(self, prefix: str) -> List[str]:
+        start = bisect.bisect_left(self._names, prefix)
+        end = bisect.bisect_left(self._names, prefix + "\uffff", start)
+        return self._names[start:end]
+
+    def search(self, query: SearchQuery) -> Dict[str, Any]:
+        """Matches of `query`, sorted and limited; `total` counts every match"""
+        started = time.perf_counter()
+        match = named = None
+        candidates: List[Tuple[int, Any]] = []
+        if query.name:
+            names = self._prefixed(query.name)
+            match = "prefix"
+            if not names:
+                names = difflib.get_close_matches(query.name, self._names, n=MAX_LIMIT, cutoff=FUZZY_CUTOFF)
+                match = "fuzzy"
+            named = set(names)
+            candidates.append((len(names), names))
+        for t in query.types:
+            names = self._by_type.get(t, ())
+            candidates.append((len(names), names))
+        for column, (low, high) in query.ranges.items():
+            values = self._columns[column]
+            start = bisect.bisect_left(values, (low, ""))
+            end = bisect.bisect_right(values, (high, "\uffff"), start)
+            candidates.append((end - start, (name for _, name in values[start:end])))
+        # Start from the smallest candidate set; only it is materialized
+        pool = min(candidates, key=lambda c: c[0])[1] if candidates else self._names
+
+        types = set(query.types)
+        matches = []
+        for name in pool:
+            entry = self.species[name]
+            if types and not types.issubset(entry.types):
+                continue
+            if named is not None and name not in named:
+                continue
+            if any(not low <= entry.stats[column] <= high for column, (low, high) in query.ranges.items()):
+                continue
+            matches.append(entry)
+
+        field = query.sort.lstrip("-")
+        descending = query.sort.startswith("-")
+        if field == "name":
+            key = lambda e: e.name
+        elif field == "id":
+            key = lambda e: e.id
+        else:
+            column = STATS.index(field)
+            key = lambda e: (e.stats[column], e.name)
+        pick = heapq.nlargest if descending else heapq.nsmallest
+        results = pick(query.limit, matches, key=key)
+
+        metrics.observe("search.query", time.perf_counter() - started)
+        found = {"query": query.describe(), "total": len(matches), "count": len(results),
+                 "results": [entry.to_dict() for entry in results]}
+        if match is not None:
+            found["match"] = match
+        return found
+
+
+async def build_species_index(loader) -> SpeciesIndex:
+    """Index every cached species: from memory or the compiled store when possible, else the species record alone"""
+    started = time.perf_counter()
+    index = SpeciesIndex()
+    for name in cached_species(loader):
+        try:
+            pokemon = loader.memory_cache.get(name)
+            if pokemon is None and loader.store is not None:
+                pokemon = await loader.read_store(name)
+            if pokemon is not None:
+                index.add_pokemon(pokemon)
+                continue
+            data = await loader.read_cached_record(f"pokemon_{name}")
+            if data:
+                index.add(IndexedSpecies.from_record(data))
+        except Exception as e:
+            logger.warning(f"Leaving {name} out of the search index: {e}")
+    elapsed = time.perf_counter() - started
+    metrics.observe("search.index.build", elapsed)
+    logger.info(f"Search index built: {len(index)} species in {elapsed:.3f}s")
+    return index
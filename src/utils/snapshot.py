@@ -0,0 +1,121 @@
+import argparse
+import asyncio
+import json
+import os
+import pickle
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+from src.utils.battle_mechanics import TypeEffectiveness
+from src.utils.data_loader import PokemonDataLoader
+from src.utils.search_index import build_species_index
+from src.logger_file import logger
+
+# Startup image read by PokemonDataService.startup(); override with POKEMON_SNAPSHOT
+DEFAULT_SNAPSHOT_PATH = "data/snapshot.pkl"
+SNAPSHOT_ENV = "POKEMON_SNAPSHOT"
+SNAPSHOT_VERSION = 3
+# Hot species built into the snapshot by default (lowest ids first), well under the memory cache's size
+HOT_SPECIES_LIMIT = 128
+
+
+def snapshot_path_from_env() -> str:
+    return os.environ.get(SNAPSHOT_ENV) or DEFAULT_SNAPSHOT_PATH
+
+
+def newest_source_mtime(loader: PokemonDataLoader) -> float:
+    """Latest write to what a snapshot is built from: the cache records and the compiled store"""
+    newest = loader.store.mtime if loader.store is not None else 0.0
+    with os.scandir(loader.cache_dir) as entries:
+        for entry in entries:
+            # Skip in-progress atomic writes
+            if entry.name.startswith("."):
+                continue
+            try:
+                newest = max(newest, entry.stat().st_mtime)
+            except OSError:
+                continue
+    return newest
+
+
+async def build_snapshot(loader: PokemonDataLoader, path: str = DEFAULT_SNAPSHOT_PATH,
+                         hot_species: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Write the type chart, its matrix, the search index entries and hot Pokemon to one pickle.
+
+    hot_species defaults to the HOT_SPECIES_LIMIT cached species with the lowest
+    ids. Only load snapshots built locally by this function: they are unpickled
+    at startup.
+    """
+    type_chart = await loader.load_type_effectiveness()
+    species_index = list((await build_species_index(loader)).species.values())
+    if hot_species is None:
+        names = [entry.name for entry in sorted(species_index, key=lambda e: e.id)[:HOT_SPECIES_LIMIT]]
+    else:
+        names = sorted({n.lower().strip() for n in hot_species})
+    if len(names) > loader.memory_cache.maxsize:
+        logger.warning(f"{len(names)} hot species exceed the memory cache ({loader.memory_cache.maxsize}); "
+                       f"loading the snapshot will evict most of them")
+    hot = {}
+    for name in names:
+        try:
+            hot[name] = await loader.fetch_pokemon_data(name)
+        except Exception as e:
+            logger.warning(f"Leaving {name} out of the snapshot: {e}")
+
+    image = {
+        "version": SNAPSHOT_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "type_chart": type_chart,
+        "type_matrix": TypeEffectiveness(type_chart).matrix_rows,
+        "species_index": species_index,
+        "hot_species": hot,
+        # Measured last: fetching the hot species may have written cache records
+        "source_mtime": newest_source_mtime(loader)
+    }
+    blob = pickle.dumps(image, protocol=pickle.HIGHEST_PROTOCOL)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".", suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(blob)
+    os.replace(tmp_path, path)
+
+    summary = {"path": path, "species_index": len(species_index), "hot_species": len(hot), "bytes": len(blob)}
+    logger.info(f"Built snapshot {summary}")
+    return summary
+
+
+def load_snapshot(path: str = DEFAULT_SNAPSHOT_PATH) -> Optional[Dict[str, Any]]:
+    """Read a snapshot in a single read, or return None if it is missing, unreadable or outdated"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            image = pickle.loads(f.read())
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable snapshot {path}: {e}")
+        return None
+    if not isinstance(image, dict) or image.get("version") != SNAPSHOT_VERSION:
+        logger.warning(f"Ignoring snapshot {path}: unsupported version")
+        return None
+    return image
+
+
+async def _build(args) -> Dict[str, Any]:
+    loader = PokemonDataLoader()
+    try:
+        return await build_snapshot(loader, args.output, args.species or None)
+    finally:
+        await loader.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the cold-start snapshot loaded by the MCP server")
+    parser.add_argument("species", nargs="*", help=f"Hot species to include (default: the {HOT_SPECIES_LIMIT} lowest-id cached species)")
+    parser.add_argument("--output", default=snapshot_path_from_env(), help="Snapshot file to write")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(_build(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
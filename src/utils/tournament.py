@@ -0,0 +1,140 @@
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from src.models import Pokemon
+from src.utils.battle_mechanics import TypeEffectiveness
+from src.utils.data_loader import PokemonDataLoader, species_fingerprint
+from src.utils.monte_carlo import MonteCarloBattleSimulator
+from src.utils.search_index import cached_species
+from src.logger_file import logger
+
+DEFAULT_TOURNAMENT_PATH = "data/tournament.json"
+TOURNAMENT_VERSION = 1
+
+
+def type_chart_fingerprint(type_chart: Dict) -> str:
+    """Hash of the type matrix rows every pairing was played with"""
+    return hashlib.sha1(repr(TypeEffectiveness(type_chart).matrix_rows).encode("utf-8")).hexdigest()
+
+
+def _pair_seed(name1: str, name2: str) -> int:
+    return int(hashlib.sha1(f"{name1}|{name2}".encode("utf-8")).hexdigest()[:8], 16)
+
+
+def _play_shard(pairs: List[Tuple[Pokemon, Pokemon]], type_chart: Dict, n_battles: int) -> List[Tuple[str, str, float]]:
+    """Worker entry point: win rate of the first Pokemon of each pair"""
+    simulator = MonteCarloBattleSimulator(TypeEffectiveness(type_chart))
+    results = []
+    for pokemon1, pokemon2 in pairs:
+        outcome = simulator.simulate(pokemon1, pokemon2, n_battles, seed=_pair_seed(pokemon1.name, pokemon2.name))
+        results.append((pokemon1.name, pokemon2.name, outcome["win_probability"]["pokemon1"]))
+    return results
+
+
+def load_tournament(path: str = DEFAULT_TOURNAMENT_PATH) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable tournament file {path}: {e}")
+        return None
+    return data if data.get("version") == TOURNAMENT_VERSION else None
+
+
+class TournamentRunner:
+    """Round-robin win-rate matrix over the cached roster, computed on a process pool.
+
+    Each unordered pairing is played once with the alphabetically first species as
+    pokemon1; the mirrored cell is its complement. Re-runs only recompute rows and
+    columns of species that are new or whose data changed since the last run, and
+    everything if the type chart changed.
+    """
+
+    def __init__(self, loader: PokemonDataLoader, path: str = DEFAULT_TOURNAMENT_PATH,
+                 n_battles: int = 2000, workers: Optional[int] = None):
+        self.loader = loader
+        self.path = path
+        self.n_battles = n_battles
+        self.workers = workers or os.cpu_count() or 1
+
+    async def run(self, species: Optional[List[str]] = None, force: bool = False) -> Dict[str, Any]:
+        started = time.perf_counter()
+        names = sorted({s.lower().strip() for s in (species or cached_species(self.loader))})
+        roster: Dict[str, Pokemon] = {}
+        for name in names:
+            try:
+                pokemon = await self.loader.fetch_pokemon_data(name)
+            except Exception as e:
+                logger.warning(f"Leaving {name} out of the tournament: {e}")
+                continue
+            roster[pokemon.name] = pokemon
+        names = sorted(roster)
+        fingerprints = {name: species_fingerprint(pokemon) for name, pokemon in roster.items()}
+        type_chart = await self.loader.load_type_effectiveness()
+        chart_fingerprint = type_chart_fingerprint(type_chart)
+
+        previous = None if force else load_tournament(self.path)
+        if previous is not None and (previous.get("n_battles") != self.n_battles
+                                     or previous.get("type_chart") != chart_fingerprint):
+            previous = None
+        old_fingerprints = previous["fingerprints"] if previous else {}
+        old_matrix = previous["matrix"] if previous else {}
+        changed = {name for name in names if old_fingerprints.get(name) != fingerprints[name]}
+
+        pairs = [
+            (roster[a], roster[b])
+            for i, a in enumerate(names) for b in names[i + 1:]
+            if a in changed or b in changed
+        ]
+
+        matrix: Dict[str, Dict[str, Optional[float]]] = {
+            a: {b: (None if a == b else old_matrix.get(a, {}).get(b)) for b in names} for a in names
+        }
+        if pairs:
+            shard_count = min(len(pairs), self.workers * 4)
+            shards = [pairs[i::shard_count] for i in range(shard_count)]
+            loop = asyncio.get_running_loop()
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                shard_results = await asyncio.gather(*(
+                    loop.run_in_executor(pool, _play_shard, shard, type_chart, self.n_battles)
+                    for shard in shards
+                ))
+            for results in shard_results:
+                for name1, name2, rate in results:
+                    matrix[name1][name2] = rate
+                    matrix[name2][name1] = 1.0 - rate
+
+        tournament = {
+            "version": TOURNAMENT_VERSION,
+            "n_battles": self.n_battles,
+            "type_chart": chart_fingerprint,
+            "species": names,
+            "fingerprints": fingerprints,
+            "matrix": matrix,
+            "average_win_rate": {
+                a: sum(r for r in row.values() if r is not None) / max(1, len(names) - 1)
+                for a, row in matrix.items()
+            },
+            "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "recomputed_species": sorted(changed),
+            "computed_pairs": len(pairs),
+            "elapsed_seconds": round(time.perf_counter() - started, 3)
+        }
+        self._save(tournament)
+        logger.info(f"Tournament: {len(names)} species, {len(pairs)} pairings recomputed")
+        return tournament
+
+    def _save(self, tournament: Dict[str, Any]):
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(tournament, f)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,58 @@
+import asyncio
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.tools.battle_batch_tool import shutdown_pool, simulate_battle_batch
+from src.tools.battle_simulator import simulate_battle
+
+
+def test_batch_matches_single_battles_and_streams():
+    pairings = [{"pokemon1": "pikachu", "pokemon2": "charizard", "seed": seed} for seed in range(6)]
+    pairings += [{"pokemon1": "gengar", "pokemon2": "kadabra"}, {"pokemon1": "ditto", "pokemon2": "missingno"}]
+
+    async def run():
+        updates = []
+
+        async def on_result(completed, lines):
+            updates.append((completed, lines))
+
+        try:
+            return await simulate_battle_batch(pairings, on_result=on_result, workers=2), updates
+        finally:
+            shutdown_pool()
+
+    result, updates = asyncio.run(run())
+    assert result["completed"] == 7 and result["failed"] == 1
+    assert "error" in result["battles"][7]
+    assert [battle["index"] for battle in result["battles"]] == list(range(8))
+    assert updates[-1][0] == 8 and sum(len(lines) for _, lines in updates) == 7
+
+    # Same seed, same battle as battle_simulate: no state leaks between battles in a worker
+    for seed in range(6):
+        single = asyncio.run(simulate_battle("pikachu", "charizard", log_level="none", seed=seed))
+        assert result["battles"][seed]["battle_result"] == single["battle_result"]
+
+
+def test_pool_is_replaced_when_the_type_chart_changes():
+    from src.tools.battle_batch_tool import get_pool
+    from src.utils.battle_mechanics import TypeEffectiveness
+    from src.utils.data_service import data_service
+
+    async def run():
+        try:
+            first, _ = await get_pool(1)
+            assert (await get_pool(1))[0] is first
+            old_chart = await data_service.type_effectiveness()
+            data_service._type_effectiveness = TypeEffectiveness(matrix_rows=old_chart.matrix_rows)
+            try:
+                return first, (await get_pool(1))[0]
+            finally:
+                data_service._type_effectiveness = old_chart
+        finally:
+            shutdown_pool()
+
+    first, second = asyncio.run(run())
+    assert second is not first
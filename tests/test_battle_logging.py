@@ -0,0 +1,91 @@
+import asyncio
+import json
+import os
+import random
+import sys
+from dataclasses import replace
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from src.server import app
+from src.tools.battle_simulator import simulate_battle
+
+
+def test_log_levels_share_outcome():
+    results = {}
+    for level in ["none", "summary", "full"]:
+        random.seed(11)
+        results[level] = asyncio.run(simulate_battle("pikachu", "charizard", log_level=level))
+
+    assert "battle_log" not in results["none"]
+    assert results["summary"]["battle_log"][0] == "🔥 POKEMON BATTLE BEGINS! 🔥"
+    assert not any(line.startswith("--- TURN") for line in results["summary"]["battle_log"])
+    assert any(line.startswith("--- TURN") for line in results["full"]["battle_log"])
+    assert results["none"]["battle_result"] == results["full"]["battle_result"]
+
+
+def test_turns_stream_as_progress_notifications():
+    async def run():
+        turns = []
+
+        async def on_progress(progress, total, message):
+            turns.append((progress, message))
+
+        async with create_connected_server_and_client_session(app) as client:
+            result = await client.call_tool(
+                "battle_simulate",
+                {"pokemon1": "pikachu", "pokemon2": "charizard", "log_level": "none", "stream": True},
+                progress_callback=on_progress
+            )
+        return turns, json.loads(result.content[0].text)
+
+    turns, result = asyncio.run(run())
+    assert len(turns) == result["battle_result"]["total_turns"]
+    assert turns[0][1].startswith("--- TURN 1 ---")
+
+
+def test_seeded_results_are_served_from_cache():
+    from src.tools.battle_simulator import battle_results
+
+    first = asyncio.run(simulate_battle("gengar", "kadabra", log_level="summary"))
+    seed = first["battle_result"]["seed"]
+    hits = battle_results.hits
+
+    again = asyncio.run(simulate_battle("Gengar", "kadabra", log_level="summary", seed=seed))
+    assert again == first
+    assert battle_results.hits == hits + 1
+
+
+def test_cached_battles_are_dropped_when_their_data_changes():
+    from src.tools import battle_simulator
+    from src.utils.battle_mechanics import TypeEffectiveness
+    from src.utils.data_service import data_service
+
+    kadabra = asyncio.run(data_service.fetch_pokemon("kadabra"))
+    data_service._species_loaded(kadabra)
+    first = asyncio.run(simulate_battle("gengar", "kadabra", log_level="none", seed=5))
+    key = ("gengar", "kadabra", 5, "none")
+    assert key in battle_simulator.battle_results
+
+    # An identical reload keeps the battle; a rebuilt species drops every battle it took part in
+    data_service._species_loaded(replace(kadabra))
+    assert key in battle_simulator.battle_results
+    data_service._species_loaded(replace(kadabra, stats=replace(kadabra.stats, hp=kadabra.stats.hp + 1)))
+    assert key not in battle_simulator.battle_results
+    data_service._species_loaded(kadabra)
+
+    asyncio.run(simulate_battle("gengar", "kadabra", log_level="none", seed=5))
+    old_chart = data_service._type_effectiveness
+    data_service._type_effectiveness = TypeEffectiveness(matrix_rows=old_chart.matrix_rows)
+    hits = battle_simulator.battle_results.hits
+    try:
+        again = asyncio.run(simulate_battle("gengar", "kadabra", log_level="none", seed=5))
+        # Replayed on the new chart rather than served from before the swap
+        assert battle_simulator.battle_sim.type_chart is data_service._type_effectiveness
+        assert battle_simulator.battle_results.hits == hits
+        assert again == first
+    finally:
+        data_service._type_effectiveness = old_chart
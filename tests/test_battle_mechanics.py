@@ -1,11 +1,118 @@
+import asyncio
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.utils.battle_mechanics import TypeEffectiveness, TYPE_NAMES, NO_TYPE, type_id
+from src.utils.data_loader import PokemonDataLoader
+
+
+def load(*names):
+    """Fetch Pokemon (or, with no names, the type chart) through a loader closed afterwards"""
+    async def run():
+        loader = PokemonDataLoader()
+        try:
+            if not names:
+                return await loader.load_type_effectiveness()
+            return [await loader.fetch_pokemon_data(name) for name in names]
+        finally:
+            await loader.close()
+    return asyncio.run(run())
+
+
 def test_type_effectiveness():
     # Test all type matchups
-    pass
+    chart = TypeEffectiveness()
+    for attacking in TYPE_NAMES:
+        for defending in TYPE_NAMES:
+            expected = chart.effectiveness_chart[attacking].get(defending, 1.0)
+            assert chart.get_effectiveness(attacking, [defending]) == expected
+
+    assert chart.get_effectiveness("electric", ["water", "flying"]) == 4.0
+    assert chart.get_effectiveness("Ground", ["Flying", "rock"]) == 0.0
+    assert chart.get_effectiveness("shadow", ["fire"]) == 1.0
+    assert chart.defender_ids(["ghost"]) == (type_id("ghost"), NO_TYPE)
+
+    # The matrix built from the PokeAPI chart agrees with the built-in table
+    loaded = TypeEffectiveness(load())
+    assert (loaded.dual_matrix == chart.dual_matrix).all()
+
+class FixedRNG:
+    """Deterministic stand-in for random.Random"""
+    def __init__(self, value: float, roll: float = 1.0):
+        self.value = value
+        self.roll = roll
+
+    def random(self):
+        return self.value
+
+    def uniform(self, a, b):
+        return self.roll
+
 
 def test_damage_calculation():
     # Test damage formulas with known inputs/outputs
-    pass
+    from src.utils.battle_mechanics import DamageCalculator
+    pikachu, charizard = load("pikachu", "charizard")
+    thunder_punch = next(m for m in pikachu.moves if m.name == "thunder-punch")
+
+    # Special move: 50 Sp.Atk vs 85 Sp.Def, power 75, 2x vs fire/flying, 1.5x STAB
+    base = DamageCalculator.base_damage(pikachu, charizard, thunder_punch, 2.0)
+    assert abs(base - ((22 * 75 * 50 / 85) / 50 + 2) * 2.0 * 1.5) < 1e-9
+
+    assert DamageCalculator.calculate_damage(pikachu, charizard, thunder_punch, 2.0, FixedRNG(0.5)) == 64
+    assert DamageCalculator.calculate_damage(pikachu, charizard, thunder_punch, 2.0, FixedRNG(0.5, 0.85)) == 54
+    # Critical hit (roll below 1/16) doubles damage
+    assert DamageCalculator.calculate_damage(pikachu, charizard, thunder_punch, 2.0, FixedRNG(0.01)) == 128
+    # Damage never drops below 1, even against an immune target
+    assert DamageCalculator.calculate_damage(pikachu, charizard, thunder_punch, 0.0, FixedRNG(0.5)) == 1
 
 def test_status_effects():
     # Verify status effect implementations
-    pass
\ No newline at end of file
+    from src.utils.battle_mechanics import (BattleSimulator, BattleState, StatusEffectManager,
+                                            BURN, PARALYSIS, POISON)
+    onix, pikachu = load("onix", "pikachu")
+    state = BattleState(onix)
+
+    # Stat modifiers land once, at infliction, on the effective stats only
+    assert state.inflict(BURN) and not state.inflict(BURN)
+    assert state.stats.attack == onix.stats.attack // 2
+    assert onix.stats.attack == 45
+
+    manager = StatusEffectManager(FixedRNG(0.1))
+    assert manager.apply_burn(state) == "onix is hurt by its burn! (-2 HP)"
+    assert manager.apply_burn(state) == "onix is hurt by its burn! (-2 HP)"
+    assert state.current_hp == 31
+    assert state.stats.attack == 22  # halved once, not per turn
+
+    state.inflict(POISON)
+    assert manager.apply_poison(state) == "onix is hurt by poison! (-4 HP)"
+    assert state.current_hp == 27
+    assert state.status == BURN | POISON
+
+    # Only paralyzed Pokemon roll for full paralysis; paralysis quarters speed for turn order
+    assert not manager.is_fully_paralyzed(state)
+    state.inflict(PARALYSIS)
+    assert manager.is_fully_paralyzed(state)
+    assert not StatusEffectManager(FixedRNG(0.9)).is_fully_paralyzed(state)
+    assert state.stats.speed == 17
+
+    healthy_onix = BattleState(onix)
+    pikachu = BattleState(pikachu)
+    assert BattleSimulator().determine_turn_order(healthy_onix, pikachu)[0] is pikachu
+    pikachu.inflict(PARALYSIS)  # 90 -> 22 speed, now slower than onix's 70
+    assert BattleSimulator().determine_turn_order(healthy_onix, pikachu)[0] is healthy_onix
+
+def test_seeded_battles_replay():
+    from src.utils.battle_mechanics import BattleSimulator
+    lugia, raichu = load("lugia", "raichu")
+
+    sim = BattleSimulator()
+    first = asyncio.run(sim.simulate_battle(lugia, raichu, seed=1234))
+    # Battles in between must not leak state into the replay
+    asyncio.run(sim.simulate_battle(lugia, raichu))
+    replay = asyncio.run(BattleSimulator().simulate_battle(lugia, raichu, seed=1234))
+    assert replay == first
+    assert first.seed == 1234
@@ -0,0 +1,48 @@
+import asyncio
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import pytest
+from src.utils.battle_odds import BattleOddsSolver, StateSpaceTooLarge
+from src.utils.data_loader import PokemonDataLoader
+from src.utils.monte_carlo import MonteCarloBattleSimulator
+from src.tools import battle_odds_tool
+
+
+def _load(*names):
+    loader = PokemonDataLoader()
+
+    async def run():
+        try:
+            return [await loader.fetch_pokemon_data(name) for name in names]
+        finally:
+            await loader.close()
+    return asyncio.run(run())
+
+
+def test_exact_odds_match_sampling():
+    solver = BattleOddsSolver()
+    for name1, name2 in (("ditto", "onix"), ("pikachu", "charizard")):
+        pokemon1, pokemon2 = _load(name1, name2)
+        exact = solver.solve(pokemon1, pokemon2)
+        sampled = MonteCarloBattleSimulator().simulate(pokemon1, pokemon2, 100000, seed=3)
+
+        total = sum(exact["win_probability"].values()) + exact["draw_probability"] + exact["pruned_probability"]
+        assert abs(total - 1.0) < 1e-9
+        assert abs(exact["win_probability"]["pokemon1"] - sampled["win_probability"]["pokemon1"]) < 0.005
+        assert abs(exact["expected_turns"] - sampled["average_turns"]) < 0.02
+
+
+def test_state_guard_falls_back_to_sampling(monkeypatch):
+    pokemon1, pokemon2 = _load("pikachu", "onix")
+    with pytest.raises(StateSpaceTooLarge):
+        BattleOddsSolver(max_states=1000).solve(pokemon1, pokemon2)
+
+    monkeypatch.setattr(battle_odds_tool, "odds_solver", BattleOddsSolver(max_states=1000))
+    monkeypatch.setattr(battle_odds_tool, "FALLBACK_BATTLES", 2000)
+    result = asyncio.run(battle_odds_tool.battle_odds("pikachu", "onix", seed=1))
+    assert result["method"] == "monte_carlo" and result["n_battles"] == 2000
+    assert abs(sum(result["win_probability"].values()) + result["draw_probability"] - 1.0) < 1e-9
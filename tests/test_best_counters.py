@@ -0,0 +1,33 @@
+import asyncio
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import numpy as np
+from src.utils.counters import hit_moments
+from src.utils.damage_range import damage_distribution, expected_damage
+from src.tools import battle_odds_tool, best_counters_tool
+
+
+def test_hit_mean_matches_exact_damage_distribution():
+    bases = np.array([[0.0, 0.7, 3.3, 17.25, 48.9, 131.0]])
+    mean, variance, move_means = hit_moments(bases, np.ones_like(bases, dtype=bool))
+    for base, move_mean in zip(bases[0], move_means[0]):
+        assert abs(move_mean - expected_damage(damage_distribution(base))) < 1e-9
+    assert abs(mean[0] - move_means[0].mean()) < 1e-9 and variance[0] > 0
+
+
+def test_best_counters_ranks_roster_against_exact_odds():
+    result = asyncio.run(best_counters_tool.best_counters("mewtwo", top_k=5))
+    counters = result["counters"]
+    assert len(counters) == 5 and result["roster_size"] >= 5
+    assert "mewtwo" not in [c["name"] for c in counters]
+    chances = [c["win_probability"] for c in counters]
+    assert chances == sorted(chances, reverse=True)
+
+    exact = asyncio.run(battle_odds_tool.battle_odds(counters[0]["name"], "mewtwo"))
+    assert abs(exact["win_probability"]["pokemon1"] - chances[0]) < 0.1
+
+    assert "error" in asyncio.run(best_counters_tool.best_counters("mewtwo", top_k=0))
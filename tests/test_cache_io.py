@@ -0,0 +1,78 @@
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.utils.cache_records import read_entry
+from src.utils.data_loader import PokemonDataLoader
+from src.utils.memory_cache import LRUCache
+
+
+def _loader(tmp_path, handler) -> PokemonDataLoader:
+    loader = PokemonDataLoader(store_path=str(tmp_path / "missing.bin"), memory_cache=LRUCache(),
+                               cache_dir=str(tmp_path))
+    loader.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return loader
+
+
+def test_corrupt_cache_entry_is_refetched(tmp_path):
+    (tmp_path / "move_pound.json").write_text('{"name": "pou')
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(200, json={"name": "pound", "power": 40})
+
+    async def run():
+        loader = _loader(tmp_path, handler)
+        data = await loader._get("move/pound", "move_pound")
+        await loader.close()
+        return data
+
+    assert asyncio.run(run())["name"] == "pound"
+    assert len(calls) == 1
+    assert read_entry(str(tmp_path / "move_pound.json.gz"))["power"] == 40
+    assert not (tmp_path / "move_pound.json").exists()
+    assert not [p for p in os.listdir(tmp_path) if p.endswith(".tmp")]
+
+
+def test_event_loop_stays_responsive_during_cold_fill(tmp_path):
+    # The largest cached payload (~34k lines), served for every key
+    with open("data/cache/pokemon_mew.json", "rb") as f:
+        payload = f.read()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=payload, headers={"content-type": "application/json"})
+
+    async def run():
+        loader = _loader(tmp_path, handler)
+        lags = []
+        done = False
+
+        async def ticker():
+            while not done:
+                start = time.perf_counter()
+                await asyncio.sleep(0.001)
+                lags.append(time.perf_counter() - start)
+
+        tick = asyncio.create_task(ticker())
+        await asyncio.sleep(0)
+        fill_start = time.perf_counter()
+        await asyncio.gather(*(loader._get(f"pokemon/mew-{i}", f"pokemon_mew-{i}") for i in range(16)))
+        fill_time = time.perf_counter() - fill_start
+        done = True
+        await tick
+        await loader.close()
+        return lags, fill_time
+
+    lags, fill_time = asyncio.run(run())
+    assert len(list(tmp_path.glob("pokemon_mew-*.json.gz"))) == 16
+    # With blocking I/O the loop is frozen for the whole fill and ticks only
+    # once or twice; off-loop parsing and writing keep it ticking throughout
+    assert len(lags) > 10
+    assert max(lags) < fill_time / 2
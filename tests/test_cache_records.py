@@ -0,0 +1,49 @@
+import asyncio
+import os
+import shutil
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.utils.cache_records import cached_keys, migrate, read_entry
+from src.utils.compiled_store import CompiledStore, compile_store
+from src.utils.data_loader import PokemonDataLoader
+from src.utils.memory_cache import LRUCache
+
+
+def _load(cache_dir, name):
+    loader = PokemonDataLoader(store_path=os.path.join(cache_dir, "missing.bin"), memory_cache=LRUCache(),
+                               cache_dir=cache_dir)
+    loader.base_url = "http://127.0.0.1:9/"  # never reached: everything is cached
+
+    async def run():
+        try:
+            return await loader.fetch_pokemon_data(name)
+        finally:
+            await loader.close()
+    return asyncio.run(run())
+
+
+def test_migration_preserves_what_the_loader_reads(tmp_path):
+    cache_dir = str(tmp_path)
+    for name in os.listdir("data/cache"):
+        shutil.copy(os.path.join("data/cache", name), cache_dir)
+    before = _load(cache_dir, "charizard")
+
+    summary = migrate(cache_dir)
+    assert summary["failed"] == 0
+    assert summary["converted"] == len(os.listdir("data/cache"))
+    assert summary["bytes_after"] * 10 < summary["bytes_before"]
+    assert not list(tmp_path.glob("*.json"))
+
+    assert _load(cache_dir, "charizard") == before
+    assert len(read_entry(str(tmp_path / "pokemon_mew.json.gz"))["moves"]) == 4
+    assert "pokemon_charizard" in cached_keys(cache_dir, "pokemon_")
+
+    # The compiled store reads records through the same reader
+    store_path = str(tmp_path / "pokedex.bin")
+    assert compile_store([cache_dir], store_path)["species"] == len(cached_keys(cache_dir, "pokemon_"))
+    store = CompiledStore.open(store_path)
+    assert store.get_pokemon("charizard") == before
+    store.close()
@@ -0,0 +1,68 @@
+import asyncio
+import os
+import shutil
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.utils.compiled_store import CompiledStore, compile_store
+from src.utils.cache_records import entry_path, load_entry, write_entry
+from src.utils.data_loader import PokemonDataLoader
+from src.utils.memory_cache import LRUCache
+
+
+def test_compiled_store_matches_json_cache(tmp_path):
+    store_path = str(tmp_path / "pokedex.bin")
+    summary = compile_store(["data/cache/"], store_path)
+    assert summary["species"] > 0
+
+    # Loader without a store, and its own memory cache, reads the JSON cache
+    json_loader = PokemonDataLoader(store_path=str(tmp_path / "missing.bin"), memory_cache=LRUCache())
+    store = CompiledStore.open(store_path)
+    try:
+        for name in ["pikachu", "charizard", "mew", "ho-oh"]:
+            expected = asyncio.run(json_loader.fetch_pokemon_data(name))
+            assert store.get_pokemon(name) == expected
+        assert store.get_pokemon("25").name == "pikachu"
+        assert store.get_pokemon("missingno") is None
+    finally:
+        store.close()
+        asyncio.run(json_loader.close())
+
+
+def test_loader_reads_from_store(tmp_path):
+    store_path = str(tmp_path / "pokedex.bin")
+    compile_store(["data/cache/"], store_path)
+
+    loader = PokemonDataLoader(store_path=store_path)
+    assert loader.store is not None
+    pikachu = asyncio.run(loader.fetch_pokemon_data("Pikachu"))
+    assert pikachu.types == ["electric"]
+    assert len(pikachu.moves) == 4
+    asyncio.run(loader.close())
+
+
+def test_refreshed_cache_record_wins_over_store(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    os.makedirs(cache_dir)
+    for key in ["pokemon_pikachu"] + [f"move_{m['move']['name']}" for m in
+                                      load_entry(["data/cache/"], "pokemon_pikachu")["moves"][:4]]:
+        shutil.copy(entry_path("data/cache/", key), cache_dir)
+    store_path = str(tmp_path / "pokedex.bin")
+    compile_store([cache_dir], store_path)
+
+    # A refresh after the store was compiled, e.g. by the prewarm CLI
+    data = load_entry([cache_dir], "pokemon_pikachu")
+    next(s for s in data["stats"] if s["stat"]["name"] == "speed")["base_stat"] = 120
+    path = entry_path(cache_dir, "pokemon_pikachu")
+    write_entry(path, data)
+    later = os.path.getmtime(store_path) + 10
+    os.utime(path, (later, later))
+
+    loader = PokemonDataLoader(store_path=store_path, cache_dir=cache_dir, memory_cache=LRUCache())
+    try:
+        assert loader.store.get_pokemon("pikachu").stats.speed != 120
+        assert asyncio.run(loader.fetch_pokemon_data("pikachu")).stats.speed == 120
+    finally:
+        asyncio.run(loader.close())
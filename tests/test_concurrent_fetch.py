@@ -0,0 +1,71 @@
+import asyncio
+import json
+import os
+import sys
+
+import httpx
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.utils.data_loader import PokemonDataLoader
+from src.utils.memory_cache import LRUCache
+
+
+def _cached_payload(path: str) -> dict:
+    with open(os.path.join("data/cache", path), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _loader(tmp_path, handler, max_concurrency: int = 8) -> PokemonDataLoader:
+    loader = PokemonDataLoader(store_path=str(tmp_path / "missing.bin"), memory_cache=LRUCache(),
+                               cache_dir=str(tmp_path), max_concurrency=max_concurrency)
+    loader.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return loader
+
+
+def test_concurrent_misses_share_one_request(tmp_path):
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=_cached_payload("move_pound.json"))
+
+    async def run():
+        loader = _loader(tmp_path, handler)
+        results = await asyncio.gather(*(loader._get("move/pound", "move_pound") for _ in range(5)))
+        await loader.close()
+        return results
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(r["name"] == "pound" for r in results)
+
+
+def test_move_fanout_is_concurrent_and_bounded(tmp_path):
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        kind, name = request.url.path.strip("/").split("/")[-2:]
+        return httpx.Response(200, json=_cached_payload(f"{kind}_{name}.json"))
+
+    async def run(max_concurrency):
+        loader = _loader(tmp_path / str(max_concurrency), handler, max_concurrency)
+        pokemon = await loader.fetch_pokemon_data("pikachu")
+        await loader.close()
+        return pokemon
+
+    pikachu = asyncio.run(run(8))
+    assert [m.name for m in pikachu.moves] == ["mega-punch", "pay-day", "thunder-punch", "slam"]
+    assert peak == 4
+
+    peak = 0
+    asyncio.run(run(2))
+    assert peak == 2
@@ -0,0 +1,53 @@
+import asyncio
+import os
+import random
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.utils.battle_mechanics import DamageCalculator
+from src.utils.damage_range import MAX_HITS, damage_distribution, ko_probability_by_hits
+from src.tools.damage_calc_tool import damage_calc
+
+
+def test_distribution_matches_sampled_rolls():
+    for base in (0.4, 7.3, 41.0, 123.77):
+        dist = damage_distribution(base)
+        assert abs(sum(dist.values()) - 1.0) < 1e-9
+
+        rng = random.Random(3)
+        n = 40000
+        counts = {}
+        for _ in range(n):
+            damage = DamageCalculator.roll_damage(base, rng)
+            counts[damage] = counts.get(damage, 0) + 1
+        assert set(counts) <= set(dist)
+        for damage, p in dist.items():
+            assert abs(counts.get(damage, 0) / n - p) < 0.01
+
+
+def test_ko_probability_by_hits():
+    # Always 10 damage against 25 HP: KO on exactly the third hit
+    assert ko_probability_by_hits({10: 1.0}, 25) == [0.0, 0.0, 1.0]
+    # 50/50 between 10 and 20 damage against 30 HP
+    assert ko_probability_by_hits({10: 0.5, 20: 0.5}, 30) == [0.0, 0.75, 1.0]
+
+
+def test_damage_calc_tool():
+    result = asyncio.run(damage_calc("pikachu", "onix"))
+    assert result["defender_hp"] > 0 and len(result["moves"]) == 4
+    for move in result["moves"]:
+        assert move["min_damage"] <= move["expected_damage"] <= move["max_damage"]
+        ko = move["ko_probability_by_hits"]
+        assert ko == sorted(ko) and len(ko) <= MAX_HITS
+        if move["hits_to_guaranteed_ko"] <= MAX_HITS:
+            assert ko[-1] == 1.0 and len(ko) <= move["hits_to_guaranteed_ko"]
+    # Immune targets still take the 1 damage floor: Thunder Punch needs a hit per HP
+    immune = [m for m in result["moves"] if m["effectiveness"] == 0.0]
+    assert immune and immune[0]["distribution"] == {"1": 1.0}
+    assert immune[0]["hits_to_guaranteed_ko"] == result["defender_hp"]
+
+    single = asyncio.run(damage_calc("pikachu", "onix", result["moves"][0]["name"].upper()))
+    assert single["moves"] == result["moves"][:1]
+    assert "error" in asyncio.run(damage_calc("pikachu", "onix", "hyper-beam"))
@@ -1,17 +1,52 @@
+import asyncio
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.utils.cache_mirror import CacheMirrorServer
 from src.utils.data_loader import PokemonDataLoader
+from src.utils.memory_cache import LRUCache
 
 def test_pokemon_loading():
     loader = PokemonDataLoader()
-    
+
+    async def run():
+        try:
+            return await loader.fetch_pokemon_data("pikachu"), await loader.load_type_effectiveness()
+        finally:
+            await loader.close()
+
     # Test with a popular Pokemon
-    pikachu = loader.fetch_pokemon_data("pikachu")
+    pikachu, type_chart = asyncio.run(run())
     print(f"Loaded: {pikachu.name}")
     print(f"Types: {pikachu.types}")
     print(f"HP: {pikachu.stats.hp}")
+    assert pikachu.types == ["electric"]
+    assert pikachu.stats.hp == 35
     
     # Test type effectiveness
-    type_chart = loader.load_type_effectiveness()
     print(f"Fire type damage relations: {type_chart.get('fire', {})}")
+    assert "grass" in type_chart["fire"]["double_damage_to"]
+
+def test_cold_fetch_from_local_mirror(tmp_path):
+    # Offline cold path: empty cache directory, PokeAPI replaced by the cache mirror
+    with CacheMirrorServer(["data/cache/"]) as mirror:
+        loader = PokemonDataLoader(store_path=str(tmp_path / "missing.bin"), memory_cache=LRUCache(),
+                                   cache_dir=str(tmp_path))
+        loader.base_url = mirror.base_url
+
+        async def run():
+            try:
+                return await loader.fetch_pokemon_data("charizard")
+            finally:
+                await loader.close()
+
+        charizard = asyncio.run(run())
+    assert charizard.types == ["fire", "flying"]
+    assert (tmp_path / "pokemon_charizard.json.gz").exists()
+    assert len(list(tmp_path.glob("move_*.json.gz"))) == 4
 
 if __name__ == "__main__":
-    test_pokemon_loading()
\ No newline at end of file
+    test_pokemon_loading()
@@ -0,0 +1,29 @@
+import asyncio
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.utils.data_loader import PokemonDataLoader
+from src.utils.data_service import PokemonDataService, PREWARM_ENV, prewarm_species_from_env
+from src.utils.memory_cache import LRUCache
+
+
+def test_startup_prewarms_and_shutdown_closes(monkeypatch):
+    cache = LRUCache()
+    service = PokemonDataService(PokemonDataLoader(memory_cache=cache))
+    monkeypatch.setenv(PREWARM_ENV, "Pikachu, onix,,missingno")
+    assert prewarm_species_from_env() == ["pikachu", "onix", "missingno"]
+
+    async def run():
+        summary = await service.startup()
+        first = await service.type_effectiveness()
+        assert await service.type_effectiveness() is first
+        await service.shutdown()
+        return summary
+
+    summary = asyncio.run(run())
+    assert summary == {"loaded": ["pikachu", "onix"], "failed": ["missingno"]}
+    assert "pikachu" in cache and "onix" in cache
+    assert service._loader is None
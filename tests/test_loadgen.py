@@ -0,0 +1,46 @@
+import asyncio
+import json
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from benchmarks.loadgen import in_process_session, load_trace, replay, request_label
+
+
+def test_trace_accepts_both_request_forms(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    path.write_text("\n".join([
+        json.dumps({"t": 0.0, "method": "call_tool", "name": "pokemon_details", "arguments": {"pokemon_name": "pikachu"}}),
+        "",
+        json.dumps({"t": 0.1, "method": "resources/read", "params": {"uri": "pokemon://pokemon/onix"}}),
+        json.dumps({"method": "tools/call", "params": {"name": "battle_simulate",
+                                                        "arguments": {"pokemon1": "pikachu", "pokemon2": "onix"}}}),
+    ]))
+    trace = load_trace(str(path))
+    assert [request_label(r) for r in trace] == ["pokemon_details", "resource:pokemon://pokemon", "battle_simulate"]
+    assert trace[1] == {"method": "read_resource", "uri": "pokemon://pokemon/onix", "t": 0.1}
+
+
+def test_replay_reports_per_tool_latency_and_errors():
+    trace = [
+        {"t": 0.0, "method": "call_tool", "name": "pokemon_details", "arguments": {"pokemon_name": "pikachu"}},
+        {"t": 0.0, "method": "call_tool", "name": "battle_simulate",
+         "arguments": {"pokemon1": "pikachu", "pokemon2": "onix", "log_level": "none"}},
+        {"t": 0.0, "method": "call_tool", "name": "battle_simulate",
+         "arguments": {"pokemon1": "pikachu", "pokemon2": "notapokemon", "log_level": "none"}},
+        {"t": 0.0, "method": "read_resource", "uri": "pokemon://type-chart"},
+    ]
+
+    async def run():
+        async with in_process_session() as session:
+            return await replay(session, trace, concurrency=2, repeat=3)
+
+    report = asyncio.run(run())
+    assert report["requests"] == 12 and report["overall"]["requests"] == 12
+    assert report["per_tool"]["battle_simulate"]["requests"] == 6
+    assert report["per_tool"]["battle_simulate"]["errors"] == 3
+    assert report["per_tool"]["pokemon_details"]["errors"] == 0
+    assert report["per_tool"]["resource:pokemon://type-chart"]["p99_ms"] >= 0
+    assert report["overall"]["error_rate"] == 0.25
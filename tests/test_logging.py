@@ -0,0 +1,72 @@
+import json
+import logging
+import os
+import queue
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import pytest
+from src import logger_file
+from src.logger_file import (JsonFormatter, SamplingFilter, _DroppingQueueHandler, _RequestContextFilter,
+                             dropped_records, logger, request_id_var, worker_log_file)
+
+
+def _record(level=logging.INFO, msg="Tool %s finished", args=("battle_simulate",), extra=None):
+    record = logging.LogRecord("pokemon_app", level, "server.py", 10, msg, args, None)
+    for key, value in (extra or {}).items():
+        setattr(record, key, value)
+    return record
+
+
+def test_json_formatter_carries_request_id_and_extra_fields():
+    token = request_id_var.set("42")
+    try:
+        record = _record(extra={"tool": "battle_simulate", "duration_ms": 1.5})
+        _RequestContextFilter().filter(record)
+    finally:
+        request_id_var.reset(token)
+
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "Tool battle_simulate finished"
+    assert entry["level"] == "INFO" and entry["logger"] == "pokemon_app"
+    assert entry["request_id"] == "42"
+    assert entry["tool"] == "battle_simulate" and entry["duration_ms"] == 1.5
+    assert "args" not in entry and "exception" not in entry
+
+
+def test_sampling_keeps_warnings():
+    never = SamplingFilter(0.0)
+    assert not never.filter(_record(logging.INFO))
+    assert never.filter(_record(logging.WARNING))
+    assert SamplingFilter(1.0).filter(_record(logging.DEBUG))
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = _DroppingQueueHandler(queue.Queue(2))
+    before = dropped_records()
+    for _ in range(5):
+        handler.handle(_record())
+    assert handler.queue.qsize() == 2
+    assert dropped_records() - before == 3
+    queued = handler.queue.get_nowait()
+    assert queued.msg == "Tool battle_simulate finished" and queued.args is None
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_forked_worker_writes_its_own_log_file():
+    pid = os.fork()
+    if pid == 0:
+        logger.warning("worker record")
+        logger_file.log_listener.stop()
+        os._exit(0)
+    os.waitpid(pid, 0)
+
+    path = worker_log_file(pid)
+    try:
+        with open(path) as f:
+            entries = [json.loads(line) for line in f]
+    finally:
+        os.remove(path)
+    assert [entry["message"] for entry in entries] == ["worker record"]
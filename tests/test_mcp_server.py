@@ -11,7 +11,7 @@ from src.utils.data_loader import PokemonDataLoader
 from src.tools.battle_simulator import simulate_battle
 
 
-async def test_basic_functionality():
+async def basic_functionality():
     """Test basic server functionality"""
     print("Testing Pokemon data loading...")
     
@@ -29,16 +29,22 @@ async def test_basic_functionality():
         result = await simulate_battle("pikachu", "charizard")
         
         if "error" in result:
-            print(f"✗ Battle failed: {result['']}")
+            print(f"✗ Battle failed: {result['error']}")
         else:
             print(f"✓ Battle completed: {result['battle_result']['winner']} wins!")
             print(f"  Battle lasted {result['battle_result']['total_turns']} turns")
             print(f"  Final HPs - {pikachu.name}: {result['battle_result']['pokemon1_final_hp']}, {charizard.name}: {result['battle_result']['pokemon2_final_hp']}")
         
+        return result
+
     except Exception as e:
         print(f"✗ Test failed: {e}")
     finally:
         await loader.close()
 
+def test_basic_functionality():
+    result = asyncio.run(basic_functionality())
+    assert result is not None and "error" not in result
+
 if __name__ == "__main__":
-    asyncio.run(test_basic_functionality())
+    asyncio.run(basic_functionality())
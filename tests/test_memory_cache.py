@@ -0,0 +1,48 @@
+import asyncio
+import os
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.utils.memory_cache import LRUCache
+from src.utils.data_loader import PokemonDataLoader
+
+
+def test_lru_eviction_and_counters():
+    cache = LRUCache(maxsize=2, ttl=None)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 1, 1)
+
+
+def test_ttl_expiry_and_invalidate():
+    cache = LRUCache(maxsize=4, ttl=0.01)
+    cache.put("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+    cache.put("b", 2)
+    assert cache.invalidate("b") == 1
+    assert "b" not in cache
+
+
+def test_loader_serves_repeat_lookups_from_memory(tmp_path):
+    cache = LRUCache(maxsize=8)
+    loader = PokemonDataLoader(store_path=str(tmp_path / "missing.bin"), memory_cache=cache)
+
+    first = asyncio.run(loader.fetch_pokemon_data("pikachu"))
+    second = asyncio.run(loader.fetch_pokemon_data(" Pikachu "))
+    assert first is second
+    assert cache.stats()["hits"] == 1
+
+    loader.invalidate("pikachu")
+    assert asyncio.run(loader.fetch_pokemon_data("pikachu")) is not first
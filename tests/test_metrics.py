@@ -0,0 +1,51 @@
+import asyncio
+import json
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from src.server import app
+from src.utils.metrics import Histogram, Metrics
+
+
+def test_histogram_and_disabled_metrics(tmp_path):
+    histogram = Histogram()
+    for ms in [0.2] * 90 + [40.0] * 9 + [900.0]:
+        histogram.observe(ms)
+    summary = histogram.summary()
+    assert summary["count"] == 100 and summary["p50_ms"] == 0.25 and summary["p95_ms"] == 50
+    assert summary["max_ms"] == 900.0
+
+    disabled = Metrics(enabled=False)
+    with disabled.timer("disk.read"):
+        disabled.incr("cache.memory.hit")
+    assert disabled.snapshot()["counters"] == {} and disabled.snapshot()["latency"] == {}
+
+    enabled = Metrics(enabled=True)
+    with enabled.timer("disk.read"):
+        enabled.incr("cache.memory.hit", 2)
+    path = str(tmp_path / "metrics.jsonl")
+    enabled.dump(path)
+    with open(path, "r", encoding="utf-8") as f:
+        record = json.loads(f.readline())
+    assert record["counters"] == {"cache.memory.hit": 2} and record["latency"]["disk.read"]["count"] == 1
+
+
+def test_metrics_resource_reports_stages():
+    async def run():
+        async with create_connected_server_and_client_session(app) as client:
+            await client.call_tool("pokemon_details", {"pokemon_name": "pikachu"})
+            await client.call_tool("battle_simulate", {"pokemon1": "pikachu", "pokemon2": "onix", "log_level": "none"})
+            result = await client.read_resource("pokemon://metrics")
+        return json.loads(result.contents[0].text)
+
+    snapshot = asyncio.run(run())
+    assert snapshot["enabled"]
+    for stage in ("tool.pokemon_details", "tool.battle_simulate", "simulate.battle", "serialize.tool"):
+        assert snapshot["latency"][stage]["count"] >= 1
+    assert snapshot["counters"].get("cache.memory.hit", 0) >= 1
+    assert "scheduler" in snapshot and "memory_cache" in snapshot
@@ -0,0 +1,61 @@
+import asyncio
+import os
+import random
+import sys
+import threading
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import pytest
+from src.utils.battle_mechanics import BattleCancelled, BattleSimulator
+from src.utils.data_loader import PokemonDataLoader
+from src.utils.monte_carlo import MonteCarloBattleSimulator
+from src.tools.monte_carlo_tool import battle_monte_carlo
+
+
+def _load(*names):
+    loader = PokemonDataLoader()
+
+    async def run():
+        try:
+            return [await loader.fetch_pokemon_data(name) for name in names]
+        finally:
+            await loader.close()
+    return asyncio.run(run())
+
+
+def test_matches_scalar_engine():
+    ditto, onix = _load("ditto", "onix")
+    batch = MonteCarloBattleSimulator().simulate(ditto, onix, 50000, seed=7)
+
+    random.seed(7)
+    n = 2000
+    results = [asyncio.run(BattleSimulator().simulate_battle(ditto, onix)) for _ in range(n)]
+    scalar_win_rate = sum(r.winner == "ditto" for r in results) / n
+    scalar_turns = sum(r.total_turns for r in results) / n
+
+    assert abs(batch["win_probability"]["pokemon1"] - scalar_win_rate) < 0.02
+    assert abs(batch["average_turns"] - scalar_turns) < 0.1
+
+
+def test_seeded_runs_are_reproducible():
+    pikachu, charizard = _load("pikachu", "charizard")
+    sim = MonteCarloBattleSimulator()
+    first = sim.simulate(pikachu, charizard, 1000, seed=42)
+    assert first == sim.simulate(pikachu, charizard, 1000, seed=42)
+    assert sum(first["turn_histogram"].values()) == 1000
+    assert sum(first["final_hp"]["pokemon1"]["histogram"].values()) == 1000
+
+
+def test_tool_rejects_out_of_range_battle_count():
+    result = asyncio.run(battle_monte_carlo("pikachu", "charizard", n_battles=0))
+    assert "error" in result
+
+
+def test_cancel_flag_stops_the_simulation():
+    pikachu, charizard = _load("pikachu", "charizard")
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(BattleCancelled):
+        MonteCarloBattleSimulator().simulate(pikachu, charizard, 1000, seed=1, cancel=cancel)
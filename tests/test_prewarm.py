@@ -0,0 +1,48 @@
+import asyncio
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.utils.cache_mirror import CacheMirrorServer
+from src.utils.data_loader import PokemonDataLoader
+from src.utils.memory_cache import LRUCache
+from src.utils.prewarm import CachePrewarmer
+
+
+def test_prewarm_from_mirror_then_revalidate(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+
+    def prewarm(base_url):
+        async def run():
+            loader = PokemonDataLoader(store_path=str(tmp_path / "missing.bin"), memory_cache=LRUCache(),
+                                       cache_dir=cache_dir)
+            loader.base_url = base_url
+            try:
+                return await CachePrewarmer(loader, concurrency=4).run(["pikachu", "charizard"], types=False)
+            finally:
+                await loader.close()
+        return asyncio.run(run())
+
+    with CacheMirrorServer(["data/cache/"]) as mirror:
+        cold = prewarm(mirror.base_url)
+        # Two species plus their four moves each, two of which they share
+        assert cold["downloaded"] == 8 and cold["failed"] == 0
+
+        warm = prewarm(mirror.base_url)
+        assert warm["not_modified"] == 8 and warm["downloaded"] == 0
+
+        # A stale validator makes the mirror send the body again
+        validators_path = os.path.join(cache_dir, "_validators.json")
+        with open(validators_path, "r", encoding="utf-8") as f:
+            stale = f.read().replace('"etag": "\\"', '"etag": "\\"stale-', 1)
+        with open(validators_path, "w", encoding="utf-8") as f:
+            f.write(stale)
+        changed = prewarm(mirror.base_url)
+        assert changed["updated"] == 1 and changed["not_modified"] == 7
+
+    loader = PokemonDataLoader(store_path=str(tmp_path / "missing.bin"), memory_cache=LRUCache(), cache_dir=cache_dir)
+    loader.base_url = "http://127.0.0.1:9/"  # nothing listens here: must be served from the warmed cache
+    pikachu = asyncio.run(loader.fetch_pokemon_data("pikachu"))
+    assert len(pikachu.moves) == 4
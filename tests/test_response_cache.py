@@ -0,0 +1,63 @@
+import asyncio
+import json
+import os
+import sys
+from dataclasses import replace
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src import server
+from src.utils.data_service import data_service
+from src.utils.response_cache import ResponseCache, response_cache
+
+
+def test_invalidation_by_dependency_and_generation():
+    cache = ResponseCache(maxsize=8)
+    cache.put("a", "A", ["pokemon:pikachu"])
+    cache.put("b", "B", ["pokemon:pikachu", "type-chart"])
+    cache.put("c", "C", ["type-chart"])
+    assert cache.invalidate("pokemon:pikachu") == 2
+    assert cache.get("a") is None and cache.get("b") is None and cache.get("c") == "C"
+
+    # A response built before an invalidation is not cached
+    generation = cache.generation
+    cache.invalidate("pokemon:onix")
+    cache.put("d", "D", ["pokemon:onix"], generation)
+    assert cache.get("d") is None
+    cache.put("d", "D", ["pokemon:onix"], cache.generation)
+    assert cache.get("d") == "D"
+
+    stats = cache.stats()
+    assert stats["hits"] == 2 and stats["invalidations"] == 2
+
+
+def test_resource_and_tool_responses_are_cached_until_species_changes():
+    async def run():
+        pikachu = await data_service.fetch_pokemon("pikachu")
+        data_service._species_loaded(pikachu)
+        response_cache.invalidate()
+        first = await server.read_resource("pokemon://pokemon/pikachu")
+        second = await server.read_resource("pokemon://pokemon/pikachu")
+        hits = response_cache.stats()["hits"]
+
+        # Reloading an identical build (e.g. after a TTL expiry) keeps every response
+        data_service._species_loaded(replace(pikachu))
+        reloaded = await server.read_resource("pokemon://pokemon/pikachu")
+
+        # The loader rebuilding pikachu with different data drops every response built from it
+        data_service._species_loaded(replace(pikachu, stats=replace(pikachu.stats, speed=pikachu.stats.speed + 1)))
+        third = await server.read_resource("pokemon://pokemon/pikachu")
+        data_service._species_loaded(pikachu)
+
+        tool = [await server.call_tool("pokemon_details", {"pokemon_name": "pikachu"}) for _ in range(3)]
+        return first, second, reloaded, third, hits, tool
+
+    first, second, reloaded, third, hits, tool = asyncio.run(run())
+    assert first is second is reloaded
+    assert third is not second and third == second
+    assert hits >= 1
+    assert tool[-1] is tool[-2]
+    text, structured = tool[-1][0][0].text, tool[-1][1]
+    assert json.loads(text) == structured == json.loads(first)
+    assert ": " not in text  # compact encoding
@@ -0,0 +1,145 @@
+import asyncio
+import json
+import os
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+import pytest
+from src.utils.scheduler import DeadlineExceeded, RequestScheduler, SchedulerRejected, ToolLimits
+
+
+def test_identical_calls_are_coalesced():
+    scheduler = RequestScheduler()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"name": "pikachu"}
+
+    async def run():
+        return await asyncio.gather(*(
+            scheduler.run("pokemon_details", {"pokemon_name": "pikachu"}, fetch) for _ in range(5)
+        ))
+
+    results = asyncio.run(run())
+    assert len(calls) == 1 and all(r == {"name": "pikachu"} for r in results)
+    assert scheduler.stats["coalesced"] == 4
+
+
+def test_full_queue_rejects_immediately():
+    scheduler = RequestScheduler({"battle_simulate": ToolLimits(concurrency=1, queue_size=1)})
+
+    async def battle():
+        await asyncio.sleep(0.1)
+        return "done"
+
+    async def run():
+        first = asyncio.ensure_future(scheduler.run("battle_simulate", {"seed": 1}, battle))
+        second = asyncio.ensure_future(scheduler.run("battle_simulate", {"seed": 2}, battle))
+        await asyncio.sleep(0.01)
+        with pytest.raises(SchedulerRejected):
+            await scheduler.run("battle_simulate", {"seed": 3}, battle)
+        snapshot = scheduler.snapshot()
+        assert snapshot["running"] == {"battle_simulate": 1} and snapshot["waiting"] == {"battle_simulate": 1}
+        return await asyncio.gather(first, second)
+
+    assert asyncio.run(run()) == ["done", "done"]
+    assert scheduler.stats["rejected"] == 1
+
+
+def test_deadline_and_abandoned_calls_cancel_the_work():
+    scheduler = RequestScheduler({"battle_monte_carlo": ToolLimits(timeout=0.05)})
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    async def run():
+        with pytest.raises(DeadlineExceeded):
+            await scheduler.run("battle_monte_carlo", {"n_battles": 10}, slow)
+
+        caller = asyncio.ensure_future(scheduler.run("battle_simulate", {}, slow))
+        await asyncio.sleep(0.01)
+        caller.cancel()
+        await asyncio.sleep(0.01)
+        return scheduler.snapshot()
+
+    snapshot = asyncio.run(run())
+    assert len(cancelled) == 2
+    assert snapshot["in_flight"] == 0 and not snapshot["running"] and not snapshot["waiting"]
+
+
+def test_timed_out_resource_read_returns_an_error_payload(monkeypatch):
+    from mcp.types import ReadResourceRequest, ReadResourceRequestParams
+    from src import server
+
+    async def slow(uri):
+        await asyncio.sleep(5)
+
+    monkeypatch.setattr(server, "scheduler", RequestScheduler({"resource": ToolLimits(timeout=0.05)}))
+    monkeypatch.setattr(server.pokemon_resource, "get_pokemon_resource", slow)
+
+    async def run():
+        handler = server.app.request_handlers[ReadResourceRequest]
+        request = ReadResourceRequest(method="resources/read", params=ReadResourceRequestParams(uri="pokemon://slowpoke"))
+        return await handler(request)
+
+    contents = asyncio.run(run()).root.contents
+    assert len(contents) == 1
+    assert "did not finish" in json.loads(contents[0].text)["error"]
+
+
+def test_unseeded_battles_are_not_shared(monkeypatch):
+    from src import server
+    from src.utils.data_service import data_service
+    monkeypatch.setattr(server, "scheduler", RequestScheduler())
+    arguments = {"pokemon1": "pikachu", "pokemon2": "charizard", "log_level": "none"}
+
+    async def run():
+        await data_service.startup()
+        try:
+            unseeded = await asyncio.gather(*(server.call_tool("battle_simulate", dict(arguments)) for _ in range(4)))
+            seeded = await asyncio.gather(*(server.call_tool("battle_simulate", dict(arguments, seed=7)) for _ in range(2)))
+            return unseeded, seeded
+        finally:
+            await data_service.shutdown()
+
+    unseeded, seeded = asyncio.run(run())
+    assert len({result["battle_result"]["seed"] for _, result in unseeded}) == 4
+    assert server.scheduler.stats["coalesced"] == 1
+    assert seeded[0][1] == seeded[1][1]
+
+
+def test_timed_out_call_keeps_its_slot_until_offloaded_work_stops():
+    from src.utils.scheduler import cancel_event, offload
+    scheduler = RequestScheduler({"battle_odds": ToolLimits(concurrency=1, queue_size=4, timeout=0.05)})
+    stopped = []
+
+    def solve(cancel):
+        # Stand-in for an engine checking its cancel flag between turns
+        while not cancel.wait(0.01):
+            pass
+        time.sleep(0.05)
+        stopped.append(time.perf_counter())
+        return "nobody is waiting for this"
+
+    async def next_call():
+        return time.perf_counter()
+
+    async def run():
+        with pytest.raises(DeadlineExceeded):
+            await scheduler.run("battle_odds", {"pokemon1": "mewtwo"}, lambda: offload(solve, cancel=cancel_event()))
+        # The thread is still finishing, so its slot is not free yet
+        assert scheduler.snapshot()["running"] == {"battle_odds": 1}
+        return await scheduler.run("battle_odds", {"pokemon1": "lugia"}, next_call)
+
+    started = asyncio.run(run())
+    assert stopped and started >= stopped[0]
@@ -0,0 +1,91 @@
+import asyncio
+import glob
+import json
+import os
+import shutil
+import sys
+import urllib.parse
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from src.server import app
+from src.utils.data_loader import PokemonDataLoader
+from src.utils.data_service import PokemonDataService
+from src.utils.memory_cache import LRUCache
+from src.utils.search_index import IndexedSpecies, SearchQuery, SpeciesIndex
+
+
+def _query(text: str) -> SearchQuery:
+    return SearchQuery.from_params(urllib.parse.parse_qs(text))
+
+
+def test_index_filters_sorts_and_upserts():
+    index = SpeciesIndex()
+    index.add(IndexedSpecies(6, "charizard", ("fire", "flying"), (78, 84, 78, 109, 85, 100, 534)))
+    index.add(IndexedSpecies(244, "entei", ("fire",), (115, 115, 85, 90, 75, 100, 580)))
+    index.add(IndexedSpecies(25, "pikachu", ("electric",), (35, 55, 40, 50, 50, 90, 320)))
+    index.add(IndexedSpecies(172, "pichu", ("electric",), (20, 40, 15, 35, 35, 60, 205)))
+
+    found = index.search(_query("type=fire&min_speed=100&sort=-hp"))
+    assert [r["name"] for r in found["results"]] == ["entei", "charizard"] and found["total"] == 2
+    assert found["results"][0]["stats"]["speed"] == 100
+
+    assert [r["name"] for r in index.search(_query("name=pi"))["results"]] == ["pichu", "pikachu"]
+    fuzzy = index.search(_query("name=pikachoo"))
+    assert fuzzy["match"] == "fuzzy" and "pikachu" in [r["name"] for r in fuzzy["results"]]
+    assert index.search(_query("max_hp=40&type=electric&limit=1&sort=id"))["results"][0]["name"] == "pikachu"
+
+    # Re-adding a species replaces it in every column
+    index.add(IndexedSpecies(25, "pikachu", ("electric",), (35, 55, 40, 50, 50, 120, 350)))
+    assert len(index) == 4
+    assert [r["name"] for r in index.search(_query("min_speed=110"))["results"]] == ["pikachu"]
+    assert index.search(_query("max_speed=90"))["total"] == 1
+
+    for bad in ("bogus=1", "sort=weight", "limit=0"):
+        try:
+            _query(bad)
+            assert False, bad
+        except ValueError:
+            pass
+
+
+def test_index_picks_up_species_cached_after_build(tmp_path):
+    cache_dir = str(tmp_path)
+    for path in glob.glob(os.path.join(project_root, "data", "cache", "move_*")):
+        shutil.copy(path, cache_dir)
+    shutil.copy(os.path.join(project_root, "data", "cache", "pokemon_pikachu.json"), cache_dir)
+
+    async def run():
+        loader = PokemonDataLoader(store_path=os.path.join(cache_dir, "none.bin"),
+                                   memory_cache=LRUCache(), cache_dir=cache_dir)
+        service = PokemonDataService(loader=loader, prewarm=[], snapshot_path=os.path.join(cache_dir, "none.pkl"))
+        try:
+            index = await service.search_index()
+            before = index.names()
+            # A species written to the cache later is indexed as soon as the loader builds it
+            shutil.copy(os.path.join(project_root, "data", "cache", "pokemon_onix.json"), cache_dir)
+            await service.fetch_pokemon("onix")
+            return before, index.search(_query("type=rock"))
+        finally:
+            await service.shutdown()
+
+    before, rock = asyncio.run(run())
+    assert before == ["pikachu"]
+    assert [r["name"] for r in rock["results"]] == ["onix"]
+
+
+def test_search_resource():
+    async def run():
+        async with create_connected_server_and_client_session(app) as client:
+            listing = await client.read_resource("pokemon://search")
+            fire = await client.read_resource("pokemon://search?type=fire&min_speed=100")
+            bad = await client.read_resource("pokemon://search?bogus=1")
+        return [json.loads(r.contents[0].text) for r in (listing, fire, bad)]
+
+    listing, fire, bad = asyncio.run(run())
+    assert "pikachu" in listing["available_pokemon"]
+    assert fire["results"] and all("fire" in r["types"] and r["stats"]["speed"] >= 100 for r in fire["results"])
+    assert "error" in bad
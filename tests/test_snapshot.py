@@ -0,0 +1,77 @@
+import asyncio
+import os
+import shutil
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.utils.battle_mechanics import TypeEffectiveness
+from src.utils.data_loader import PokemonDataLoader
+from src.utils.data_service import PokemonDataService
+from src.utils.memory_cache import LRUCache
+from src.utils.cache_records import entry_path
+from src.utils.snapshot import HOT_SPECIES_LIMIT, build_snapshot
+
+
+def test_service_starts_from_snapshot(tmp_path):
+    path = str(tmp_path / "snapshot.pkl")
+
+    async def build():
+        loader = PokemonDataLoader(memory_cache=LRUCache())
+        try:
+            return await build_snapshot(loader, path, ["pikachu", "onix"]), await loader.load_type_effectiveness()
+        finally:
+            await loader.close()
+
+    summary, type_chart = asyncio.run(build())
+    assert summary["hot_species"] == 2
+
+    cache = LRUCache()
+    service = PokemonDataService(PokemonDataLoader(memory_cache=cache), prewarm=[], snapshot_path=path)
+    loaded = []
+    service.add_species_listener(loaded.append)
+    asyncio.run(service.startup())
+    assert "pikachu" in cache and "onix" in cache
+    assert sorted(pokemon.name for pokemon in loaded) == ["onix", "pikachu"]
+    # The search index comes from the snapshot, not from walking the cache directory
+    assert service._search_index_task is None
+    assert "charizard" in service._search_index
+    assert service._search_index.species["onix"].types == ("rock", "ground")
+    assert service._type_effectiveness._dual == TypeEffectiveness(type_chart)._dual
+    # Nothing had to be fetched, so no HTTP client was ever created
+    assert service.loader._client is None
+
+
+def test_snapshot_older_than_the_cache_is_ignored(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    shutil.copytree("data/cache", cache_dir)
+    path = str(tmp_path / "snapshot.pkl")
+
+    def loader():
+        return PokemonDataLoader(cache_dir=cache_dir, store_path=str(tmp_path / "missing.bin"), memory_cache=LRUCache())
+
+    async def build():
+        builder = loader()
+        try:
+            return await build_snapshot(builder, path)
+        finally:
+            await builder.close()
+
+    summary = asyncio.run(build())
+    # Default hot list is bounded, whatever the size of the cache
+    assert 0 < summary["hot_species"] <= HOT_SPECIES_LIMIT
+
+    def loads():
+        service = PokemonDataService(loader(), snapshot_path=path)
+        try:
+            return service.load_snapshot()
+        finally:
+            asyncio.run(service.shutdown())
+
+    assert loads()
+    # A record refreshed after the build, e.g. by prewarm revalidation
+    record = entry_path(cache_dir, "pokemon_pikachu")
+    later = os.path.getmtime(path) + 10
+    os.utime(record, (later, later))
+    assert not loads()
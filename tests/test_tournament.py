@@ -0,0 +1,37 @@
+import asyncio
+import json
+import os
+import sys
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.utils.data_loader import PokemonDataLoader
+from src.utils.tournament import TournamentRunner, load_tournament
+
+
+def test_tournament_recomputes_only_new_species(tmp_path):
+    path = str(tmp_path / "tournament.json")
+    runner = TournamentRunner(PokemonDataLoader(), path=path, n_battles=200, workers=2)
+    try:
+        first = asyncio.run(runner.run(["pikachu", "raichu", "onix"]))
+        assert first["computed_pairs"] == 3
+        assert first["matrix"]["pikachu"]["pikachu"] is None
+        assert abs(first["matrix"]["onix"]["pikachu"] + first["matrix"]["pikachu"]["onix"] - 1.0) < 1e-9
+
+        second = asyncio.run(runner.run(["pikachu", "raichu", "onix", "ditto"]))
+        assert second["recomputed_species"] == ["ditto"]
+        assert second["computed_pairs"] == 3
+        assert second["matrix"]["pikachu"]["onix"] == first["matrix"]["pikachu"]["onix"]
+
+        assert load_tournament(path)["species"] == ["ditto", "onix", "pikachu", "raichu"]
+
+        # Cells played on another type chart are all stale
+        stale = load_tournament(path)
+        stale["type_chart"] = "0" * 40
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(stale, f)
+        third = asyncio.run(runner.run(["pikachu", "raichu", "onix", "ditto"]))
+        assert third["computed_pairs"] == 6
+    finally:
+        asyncio.run(runner.loader.close())